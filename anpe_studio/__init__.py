@@ -5,7 +5,19 @@ ANPE Studio Package
 # Import version from dedicated module
 from .version import __version__
 
-# Make core components available at package level
-from .app import main
-from .main_window import MainWindow
-from .splash_screen import SplashScreen 
\ No newline at end of file
+# Make core components available at package level.
+# They are resolved lazily so that importing the package (e.g. for the
+# headless 'batch' CLI) does not pull in PyQt widgets or the ANPE models.
+_LAZY_ATTRIBUTES = {
+    "main": ("anpe_studio.app", "main"),
+    "MainWindow": ("anpe_studio.main_window", "MainWindow"),
+    "SplashScreen": ("anpe_studio.splash_screen", "SplashScreen"),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        return getattr(importlib.import_module(module_name), attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 Entry point for the ANPE Studio application when run as a module.
+
+    python -m anpe_studio [files...] [--text TEXT]  # Launch the GUI (or hand the inputs to the running one)
+    python -m anpe_studio batch <paths...> # Headless batch processing (see anpe_studio.cli)
+    python -m anpe_studio daemon           # Local extraction daemon with warm models (see anpe_studio.daemon)
 """
 
 import sys
@@ -11,8 +15,20 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-# Now we can import from anpe_studio
-from anpe_studio.app import main
-
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        # Headless mode: never import the Qt GUI
+        from anpe_studio.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "daemon":
+        from anpe_studio.daemon import main as daemon_main
+        sys.exit(daemon_main(sys.argv[2:]))
+
+    # A running instance takes over this launch before the GUI modules are even imported
+    from anpe_studio.single_instance import hand_off_launch
+    if hand_off_launch(sys.argv[1:]):
+        sys.exit(0)
+
+    # Now we can import from anpe_studio
+    from anpe_studio.app import main
+    main()
@@ -10,10 +10,12 @@ import logging
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QTimer, pyqtSlot, QObject, Qt # Added Qt
 from PyQt6.QtGui import QFont # Original import
-from anpe_studio.main_window import MainWindow
 from anpe_studio.splash_screen import SplashScreen 
 from anpe_studio.theme import apply_theme
 from anpe_studio.resource_manager import ResourceManager
+from anpe_studio.single_instance import (InstanceServer, forward_to_running_instance, parse_launch_arguments,
+                                         single_instance_enabled)
+from anpe_studio.startup_handshake import STAGE_MAIN_WINDOW_READY, STAGE_SPLASH_SHOWN, report_startup_stage
 
 
 # Variable to hold the main window instance
@@ -30,10 +32,34 @@ def main():
     # QT_SCALE_FACTOR can be used to manually set scaling if needed 
     # os.environ["QT_SCALE_FACTOR"] = "1.5" # Only enable if needed
     
+    launch = parse_launch_arguments(sys.argv[1:])
+
     # Create application
     app = QApplication(sys.argv)
     app.setApplicationName("ANPE Studio")
     app.setOrganizationName("ANPE")
+
+    # Single instance: later launches hand their inputs to this one (see anpe_studio.single_instance)
+    instance_server = None
+    if single_instance_enabled(launch):
+        instance_server = InstanceServer(parent=app)
+        if not instance_server.listen():
+            # Another instance started since the entry point checked
+            if forward_to_running_instance(launch.files, launch.texts):
+                sys.exit(0)
+            instance_server = None
+    # Inputs that arrive before the main window exists (this launch's own, or forwarded during the splash)
+    pending_inputs = [(launch.files, launch.texts)] if launch.files or launch.texts else []
+
+    @pyqtSlot(list, list)
+    def on_inputs_received(files, texts):
+        if main_window_instance is None:
+            pending_inputs.append((files, texts))
+        else:
+            main_window_instance.open_launch_inputs(files, texts)
+
+    if instance_server is not None:
+        instance_server.inputsReceived.connect(on_inputs_received)
     
     # Force Fusion style for consistent look across platforms (especially macOS)
     app.setStyle("Fusion")
@@ -52,6 +78,7 @@ def main():
             app.setFont(default_font)
             print(f"Adjusted font size for high-DPI display: {font_size_pt}pt (DPI: {dpi})")
     
+    ResourceManager.register_bundle() # Icons and stylesheet images come from one memory-mapped bundle
     apply_theme(app)
 
     # --- SplashScreen Setup & Initialization --- 
@@ -67,12 +94,19 @@ def main():
         
         if main_window_instance is None:
             print("APP: Creating MainWindow instance...")
+            # Imported only now: the main window pulls in the workers, the job queue and
+            # the result widgets, none of which the splash needs for its first paint
+            from anpe_studio.main_window import MainWindow
             main_window_instance = MainWindow(model_status=status_dict)
             print("APP: MainWindow instance created.")
         
         if main_window_instance:
             print("APP: Fading in MainWindow...")
             main_window_instance.fade_in()
+            while pending_inputs:
+                main_window_instance.open_launch_inputs(*pending_inputs.pop(0))
+            # Reported from the event loop, once the window's show events are processed
+            QTimer.singleShot(0, lambda: report_startup_stage(STAGE_MAIN_WINDOW_READY))
         
         # Fade out splash screen AFTER main window is potentially shown
         print("APP: Fading out SplashScreen...")
@@ -84,6 +118,7 @@ def main():
 
     # --- Show the splash screen BEFORE starting initialization ---
     splash.fade_in()
+    QTimer.singleShot(0, lambda: report_startup_stage(STAGE_SPLASH_SHOWN)) # Runs once the event loop has started
 
     # --- Start Splash Initialization (this runs the background check) --- 
     splash.start_initialization()
@@ -91,6 +126,8 @@ def main():
 
     # --- Start Event Loop --- 
     exit_code = app.exec()
+    if instance_server is not None:
+        instance_server.close() # Later launches start their own instance from now on
     sys.exit(exit_code)
 
 if __name__ == "__main__":
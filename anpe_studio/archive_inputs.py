@@ -0,0 +1,251 @@
+"""
+Batch inputs read directly from .zip and .tar archives.
+
+An archive added as batch input is expanded into one input per .txt member,
+keyed as "<archive path>!<member name>" (e.g. "/data/corpus.zip!2021/a.txt").
+InputTextReader reads plain files and archive members on a background
+thread, a bounded number of texts ahead of the consumer, so decompression
+and disk reads overlap with parsing. Each archive is read in a single pass
+in its own member order, which keeps streamed formats like .tar.gz linear.
+This module must not import PyQt.
+"""
+
+import io
+import logging
+import os
+import queue
+import tarfile
+import threading
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from anpe_studio import tracing
+
+MEMBER_SEPARATOR = "!"
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_PATTERNS = " ".join(f"*{suffix}" for suffix in ARCHIVE_SUFFIXES) # For file dialog filters
+DEFAULT_PREFETCH = 16 # Texts read ahead of the consumer
+
+# (input key, text or None, error message or None)
+InputText = Tuple[str, Optional[str], Optional[str]]
+
+
+def is_archive(path: str) -> bool:
+    """True if path names a supported archive (by extension)."""
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def member_key(archive_path: str, member_name: str) -> str:
+    return f"{archive_path}{MEMBER_SEPARATOR}{member_name}"
+
+
+def split_member_key(key: str) -> Optional[Tuple[str, str]]:
+    """Split "archive!member" into (archive, member), or return None for a plain file path."""
+    start = 0
+    while True:
+        index = key.find(MEMBER_SEPARATOR, start)
+        if index == -1:
+            return None
+        if is_archive(key[:index]):
+            return key[:index], key[index + 1:]
+        start = index + 1
+
+
+def display_name(key: str) -> str:
+    """File name shown for an input: the member's base name for archive members."""
+    parts = split_member_key(key)
+    if parts is None:
+        return os.path.basename(key)
+    return parts[1].rsplit("/", 1)[-1]
+
+
+def export_stem(key: str) -> str:
+    """
+    Base name for an input's export file: the file's stem, or for archive
+    members the archive's stem and the member's path ("corpus_2021_a" for
+    "corpus.zip!2021/a.txt"), so same-named members do not share a name.
+    """
+    parts = split_member_key(key)
+    if parts is None:
+        return os.path.splitext(os.path.basename(key))[0]
+    archive_name = os.path.basename(parts[0])
+    suffix = next(suffix for suffix in ARCHIVE_SUFFIXES if archive_name.lower().endswith(suffix))
+    member_stem = os.path.splitext(parts[1].strip("/"))[0].replace("\\", "/")
+    return "_".join([archive_name[:-len(suffix)]] + [part for part in member_stem.split("/") if part not in ("", ".")])
+
+
+def _is_text_member(name: str) -> bool:
+    base = name.rsplit("/", 1)[-1]
+    # Skip macOS resource forks that Finder adds to zips
+    return base.lower().endswith(".txt") and not base.startswith("._") and not name.startswith("__MACOSX/")
+
+
+def list_text_members(archive_path: str) -> List[Tuple[str, int]]:
+    """
+    Input keys and uncompressed sizes of the .txt members of an archive, in archive order.
+    Raises OSError, zipfile.BadZipFile or tarfile.TarError if it cannot be read.
+    """
+    if archive_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            members = [(info.filename, info.file_size) for info in archive.infolist() if not info.is_dir()]
+    else:
+        with tarfile.open(archive_path, "r:*") as archive:
+            members = [(member.name, member.size) for member in archive if member.isfile()]
+    return [(member_key(archive_path, name), size) for name, size in members if _is_text_member(name)]
+
+
+def expand_inputs(paths: List[str]) -> Tuple[List[Tuple[str, int]], List[str]]:
+    """
+    Replace archives in paths by their .txt member keys.
+
+    Returns:
+        (entries, errors): (input key, size in bytes) in order, size -1 if
+        unknown, and messages for archives that could not be read.
+    """
+    entries, errors = [], []
+    for path in paths:
+        if not is_archive(path):
+            try:
+                entries.append((path, os.path.getsize(path)))
+            except OSError:
+                entries.append((path, -1)) # Reported when the batch reads it
+            continue
+        try:
+            entries.extend(list_text_members(path))
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            logging.error(f"Could not read archive {path}: {e}")
+            errors.append(f"{os.path.basename(path)}: {e}")
+    return entries, errors
+
+
+def _decode(stream) -> str:
+    # Same decoding and newline handling as open(path, 'r', encoding='utf-8')
+    with io.TextIOWrapper(io.BytesIO(stream.read()), encoding="utf-8") as text_stream:
+        return text_stream.read()
+
+
+def _iter_archive(archive_path: str, members: Dict[str, str]) -> Iterator[InputText]:
+    """Read the requested members (name -> key) of one archive in a single pass."""
+    remaining = dict(members)
+    try:
+        if archive_path.lower().endswith(".zip"):
+            with zipfile.ZipFile(archive_path) as archive:
+                for info in archive.infolist():
+                    key = remaining.pop(info.filename, None)
+                    if key is None:
+                        continue
+                    try:
+                        yield key, _decode(archive.open(info)), None
+                    except Exception as e: # Bad member data fails only that member
+                        yield key, None, str(e)
+        else:
+            with tarfile.open(archive_path, "r|*") as archive: # Stream: no seeking back through compressed data
+                for member in archive:
+                    key = remaining.pop(member.name, None)
+                    if key is None or not member.isfile():
+                        continue
+                    try:
+                        yield key, _decode(archive.extractfile(member)), None
+                    except Exception as e:
+                        yield key, None, str(e)
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        for key in remaining.values():
+            yield key, None, f"Could not read archive {archive_path}: {e}"
+        return
+    for key in remaining.values():
+        yield key, None, f"Not found in archive {archive_path}"
+
+
+def iter_input_texts(keys: List[str]) -> Iterator[InputText]:
+    """
+    Read inputs synchronously. Plain files come in list order; all requested
+    members of an archive are read together (in archive order) when its
+    first member is reached.
+    """
+    archives: Dict[str, Dict[str, str]] = {}
+    plan: List[Tuple[str, Optional[str]]] = [] # (plain path, None) or (archive, archive) at first appearance
+    for key in keys:
+        parts = split_member_key(key)
+        if parts is None:
+            plan.append((key, None))
+            continue
+        archive_path, member = parts
+        if archive_path not in archives:
+            archives[archive_path] = {}
+            plan.append((archive_path, archive_path))
+        archives[archive_path][member] = key
+    for path, archive_path in plan:
+        if archive_path is not None:
+            yield from _iter_archive(archive_path, archives[archive_path])
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                yield path, f.read(), None
+        except (OSError, ValueError) as e:
+            yield path, None, str(e)
+
+
+class InputTextReader:
+    """
+    Iterates (key, text, error) for batch inputs while a background thread
+    reads up to `prefetch` texts ahead. Use as a context manager so the
+    thread stops if the consumer ends early (e.g. on cancellation):
+
+        with InputTextReader(paths) as reader:
+            for key, text, error in reader:
+                ...
+    """
+
+    _DONE = object()
+
+    def __init__(self, keys: List[str], prefetch: int = DEFAULT_PREFETCH):
+        self._keys = list(keys)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, prefetch))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        try:
+            items = iter_input_texts(self._keys)
+            while True:
+                with tracing.span("read input", "io"):
+                    item = next(items, self._DONE)
+                if item is self._DONE:
+                    break
+                if not self._put(item):
+                    return
+        except Exception as e: # Never leave the consumer waiting
+            logging.error(f"Error reading batch inputs: {e}", exc_info=True)
+        self._put(self._DONE)
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[InputText]:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="anpe-input-reader", daemon=True)
+            self._thread.start()
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            yield item
+
+    def close(self):
+        """Stop the reader thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
+
+    def __enter__(self) -> "InputTextReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,286 @@
+"""
+Headless batch command line interface for ANPE Studio.
+
+Runs the same extraction pipeline as the GUI batch mode on machines without a
+display:
+
+    python -m anpe_studio batch <paths...> [options]
+
+Configuration mirrors the Studio input tab, and saved Studio model usage
+preferences are honoured. Progress is written to stdout as JSON lines (one
+object per event); logging goes to stderr. This module must not import PyQt
+widgets.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from anpe_studio.config_utils import (AUTO_DETECT, apply_model_preferences, build_extractor_config,
+                                      read_model_preferences, validate_model_preference)
+from anpe_studio.export_utils import (COMPRESSION_NONE, CompressedExporter, batch_export_filename,
+                                      get_available_compressions)
+from anpe_studio.np_aggregator import NORMALIZATION_MODES, NPFrequencyAggregator
+from anpe_studio.version import __version__
+
+EXPORT_FORMATS = ["txt", "csv", "json"]
+
+# Per-process state for parallel workers (set by _init_worker)
+_worker_extractor = None
+_worker_options: Dict[str, Any] = {}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the 'batch' command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m anpe_studio batch",
+        description="Extract noun phrases from .txt files without the GUI. "
+                    "Progress is reported on stdout as JSON lines.")
+    parser.add_argument("paths", nargs="+", help=".txt files or directories (searched recursively)")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for exported results")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="txt", help="Export format (default: txt)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Parallel worker processes; each loads its own models (default: 1)")
+    parser.add_argument("--prefix", default="", help="Optional prefix for exported filenames")
+    parser.add_argument("--compression", choices=get_available_compressions(), default=COMPRESSION_NONE,
+                        help="Compress exported files (default: none)")
+    parser.add_argument("--compression-level", type=int, default=None, help="Compression level")
+
+    # --- Same options as the Studio input tab ---
+    parser.add_argument("--nested", action="store_true", help="Include nested noun phrases")
+    parser.add_argument("--metadata", action="store_true", help="Include metadata (length, structures)")
+    parser.add_argument("--ignore-newlines", action="store_true",
+                        help="Do not treat newlines as sentence boundaries")
+    parser.add_argument("--min-length", type=int, default=None, help="Minimum noun phrase length in tokens")
+    parser.add_argument("--max-length", type=int, default=None, help="Maximum noun phrase length in tokens")
+    parser.add_argument("--no-pronouns", action="store_true", help="Exclude single-word pronouns")
+    parser.add_argument("--structures", nargs="+", default=None, metavar="STRUCTURE",
+                        help="Only keep noun phrases with these structures")
+
+    # --- Model preferences (default: saved Studio preference, then auto-detect) ---
+    parser.add_argument("--spacy-model", default=None, help="spaCy model to use (overrides Studio setting)")
+    parser.add_argument("--benepar-model", default=None, help="Benepar model to use (overrides Studio setting)")
+
+    parser.add_argument("--aggregate", choices=NORMALIZATION_MODES, default=None,
+                        help="Also export a corpus NP frequency table with this normalization")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug logging on stderr")
+    return parser
+
+
+def collect_text_files(paths: List[str]) -> List[str]:
+    """Expand files and directories into an ordered, de-duplicated list of .txt files."""
+    seen = set()
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.lower().endswith('.txt'):
+                        full_path = os.path.join(root, name)
+                        if full_path not in seen:
+                            seen.add(full_path)
+                            files.append(full_path)
+        elif os.path.isfile(path):
+            if path not in seen:
+                seen.add(path)
+                files.append(path)
+        else:
+            logging.warning(f"Skipping missing input path: {path}")
+    return files
+
+
+def resolve_model_preferences(args: argparse.Namespace) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve spaCy/Benepar preferences the same way MainWindow.apply_configuration does:
+    explicit flag or saved Studio preference, validated against installed models.
+    """
+    saved_spacy, saved_benepar = read_model_preferences()
+    spacy_pref = args.spacy_model or saved_spacy
+    benepar_pref = args.benepar_model or saved_benepar
+    if spacy_pref == AUTO_DETECT and benepar_pref == AUTO_DETECT:
+        return None, None
+
+    from anpe.utils.model_finder import find_installed_spacy_models, find_installed_benepar_models
+    validated_spacy = validate_model_preference(spacy_pref, find_installed_spacy_models(), "spaCy")
+    validated_benepar = validate_model_preference(benepar_pref, find_installed_benepar_models(), "Benepar")
+    return validated_spacy, validated_benepar
+
+
+def build_output_path(output_dir: str, file_path: str, prefix: str, timestamp_str: str, export_format: str,
+                      used_stems: Set[str]) -> str:
+    """
+    Build the export path using the same naming scheme as Studio's batch export
+    (same-named files from different directories get a counter; pass the same
+    used_stems for every file of the run).
+    """
+    return os.path.join(output_dir, batch_export_filename(file_path, prefix, timestamp_str, export_format, used_stems))
+
+
+def _count_nps(items: List[Dict[str, Any]]) -> int:
+    """Count noun phrases including nested children."""
+    total = 0
+    stack = list(items)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            total += 1
+            stack.extend(item.get("children") or [])
+    return total
+
+
+def _init_worker(run_config: Dict[str, Any], options: Dict[str, Any]):
+    """Create the extractor once per worker process (models stay loaded for all its files)."""
+    global _worker_extractor, _worker_options
+    from anpe import ANPEExtractor
+    _worker_options = options
+    _worker_extractor = ANPEExtractor(config=run_config)
+
+
+def _process_file(file_path: str, output_path: str) -> Dict[str, Any]:
+    """Extract and export one file in the current worker. Never raises."""
+    options = _worker_options
+    start = time.perf_counter()
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        result = _worker_extractor.extract(
+            text=text,
+            metadata=options["include_metadata"],
+            include_nested=options["include_nested"]
+        )
+        exporter = CompressedExporter(compression=options["compression"], level=options["compression_level"])
+        written_path = exporter.export(result, format=options["format"], output_filepath=output_path)
+        outcome = {
+            "status": "ok",
+            "output": written_path,
+            "noun_phrases": _count_nps(result.get("results") or []),
+        }
+        if options["aggregate"]:
+            outcome["result"] = result # Returned to the parent for aggregation
+    except Exception as e:
+        logging.error(f"Error processing file {file_path}: {e}", exc_info=logging.getLogger().isEnabledFor(logging.DEBUG))
+        outcome = {"status": "error", "error": str(e)}
+    outcome["seconds"] = round(time.perf_counter() - start, 4)
+    return outcome
+
+
+def emit_event(event: str, **fields):
+    """Write one JSON progress line to stdout."""
+    record = {"event": event, "time": round(time.time(), 3)}
+    record.update(fields)
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Run the batch described by parsed args. Returns the process exit code."""
+    files = collect_text_files(args.paths)
+    if not files:
+        emit_event("error", message="No .txt files found in the given paths.")
+        return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    config = build_extractor_config(
+        min_length=args.min_length,
+        max_length=args.max_length,
+        accept_pronouns=not args.no_pronouns,
+        newline_breaks=not args.ignore_newlines,
+        structure_filters=args.structures
+    )
+    try:
+        spacy_pref, benepar_pref = resolve_model_preferences(args)
+    except ImportError as e:
+        emit_event("error", message=f"Could not import ANPE components ({e}). Ensure 'anpe' is installed correctly.")
+        return 2
+    run_config = apply_model_preferences(config, spacy_pref, benepar_pref)
+
+    options = {
+        "include_metadata": args.metadata,
+        "include_nested": args.nested,
+        "format": args.format,
+        "compression": args.compression,
+        "compression_level": args.compression_level,
+        "aggregate": bool(args.aggregate),
+    }
+    workers = max(1, min(args.workers, len(files)))
+    timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+    aggregator = NPFrequencyAggregator(normalization=args.aggregate) if args.aggregate else None
+
+    emit_event("started", total=len(files), workers=workers, config=run_config, version=__version__)
+    start = time.perf_counter()
+    completed = succeeded = failed = 0
+
+    def report(index: int, file_path: str, outcome: Dict[str, Any]):
+        nonlocal completed, succeeded, failed
+        completed += 1
+        if outcome["status"] == "ok":
+            succeeded += 1
+        else:
+            failed += 1
+        result = outcome.pop("result", None)
+        if aggregator is not None and result is not None:
+            aggregator.add_result(result)
+        emit_event("file", index=index, path=file_path, completed=completed, total=len(files),
+                   percent=int(completed / len(files) * 100), **outcome)
+
+    try:
+        used_stems = set()
+        jobs = [(i, path, build_output_path(args.output_dir, path, args.prefix, timestamp_str, args.format, used_stems))
+                for i, path in enumerate(files)]
+        if workers == 1:
+            _init_worker(run_config, options)
+            for index, path, output_path in jobs:
+                report(index, path, _process_file(path, output_path))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(run_config, options)) as pool:
+                futures = {pool.submit(_process_file, path, output_path): (index, path)
+                           for index, path, output_path in jobs}
+                for future in as_completed(futures):
+                    index, path = futures[future]
+                    report(index, path, future.result())
+
+        if aggregator is not None and not aggregator.is_empty():
+            table_format = "json" if args.format == "json" else "csv"
+            table_name = f"anpe_np_frequencies_{timestamp_str}.{table_format}"
+            if args.prefix:
+                table_name = f"{args.prefix}_{table_name}"
+            table_path = os.path.join(args.output_dir, table_name)
+            if table_format == "json":
+                table_path = aggregator.export_json(table_path, args.compression, args.compression_level)
+            else:
+                table_path = aggregator.export_csv(table_path, args.compression, args.compression_level)
+            emit_event("frequencies", output=table_path, documents=aggregator.document_count,
+                       noun_phrases=aggregator.phrase_count)
+    except KeyboardInterrupt:
+        emit_event("cancelled", completed=completed, total=len(files))
+        return 130
+    except Exception as e:
+        logging.error(f"Unhandled error during batch processing: {e}", exc_info=True)
+        emit_event("error", message=str(e))
+        return 1
+    finally:
+        if aggregator is not None:
+            aggregator.close()
+
+    emit_event("finished", total=len(files), succeeded=succeeded, failed=failed,
+               seconds=round(time.perf_counter() - start, 3))
+    return 0 if failed == 0 else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for 'python -m anpe_studio batch ...'."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format='%(levelname)s: %(message)s'
+    )
+    return run_batch(args)
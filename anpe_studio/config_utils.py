@@ -0,0 +1,172 @@
+"""
+Extraction configuration helpers shared by the GUI and the headless CLI.
+
+This module must not import PyQt widgets so it can be used on machines
+without a display. QSettings (QtCore) is imported lazily and is optional.
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# QSettings identifiers used for persisted Studio preferences
+SETTINGS_ORGANIZATION = "rcverse"
+SETTINGS_APPLICATION = "ANPE_STUDIO"
+
+# Model usage preference keys (written by the Settings dialog)
+SPACY_MODEL_PREFERENCE_KEY = "modelUsage/spacyModel"
+BENEPAR_MODEL_PREFERENCE_KEY = "modelUsage/beneparModel"
+AUTO_DETECT = "(Auto-detect)"
+
+# Run extraction in a child process instead of a thread of the GUI process
+OUT_OF_PROCESS_KEY = "processing/outOfProcess"
+
+# Measured extraction throughput (bytes of input text per second), for time estimates
+THROUGHPUT_KEY = "processing/bytesPerSecond"
+
+# Record a performance trace (anpe_studio.tracing) while Studio runs
+TRACING_KEY = "diagnostics/tracing"
+TRACE_DIR_NAME = "traces" # Subdirectory of the app data dir the trace files go to
+
+# Environment variable overriding the per-user data directory
+DATA_DIR_ENV_VAR = "ANPE_STUDIO_DATA_DIR"
+
+
+def get_app_data_dir() -> Path:
+    """
+    Return (and create) the per-user directory for Studio runtime data and caches.
+
+    Windows: %LOCALAPPDATA%/ANPE Studio, macOS: ~/Library/Application Support/ANPE Studio/studio,
+    other platforms: $XDG_DATA_HOME/anpe_studio. Can be overridden with ANPE_STUDIO_DATA_DIR.
+    """
+    override = os.environ.get(DATA_DIR_ENV_VAR)
+    if override:
+        data_dir = Path(override)
+    elif sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        data_dir = Path(base) / "ANPE Studio"
+    elif sys.platform == "darwin":
+        data_dir = Path.home() / "Library" / "Application Support" / "ANPE Studio" / "studio"
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+        data_dir = Path(base) / "anpe_studio"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+def build_extractor_config(min_length: Optional[int] = None,
+                           max_length: Optional[int] = None,
+                           accept_pronouns: bool = True,
+                           newline_breaks: bool = True,
+                           structure_filters: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build the ANPEExtractor config dict from Studio's filtering options.
+
+    Keys are only added when they restrict the output, so that ANPE core
+    falls back to its own defaults otherwise (e.g. no structure filtering).
+    """
+    config: Dict[str, Any] = {}
+    if min_length is not None:
+        config["min_length"] = min_length
+    if max_length is not None:
+        config["max_length"] = max_length
+    config["accept_pronouns"] = accept_pronouns
+    config["newline_breaks"] = newline_breaks
+    if structure_filters:
+        config["structure_filters"] = list(structure_filters)
+    return config
+
+
+def read_model_preferences() -> Tuple[str, str]:
+    """
+    Read the saved spaCy/Benepar model usage preferences.
+
+    Returns:
+        (spacy_pref, benepar_pref), each AUTO_DETECT if unset or if QSettings
+        is unavailable.
+    """
+    try:
+        from PyQt6.QtCore import QSettings
+    except ImportError:
+        logging.debug("QSettings unavailable; using auto-detect model preferences.")
+        return AUTO_DETECT, AUTO_DETECT
+    settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+    spacy_pref = settings.value(SPACY_MODEL_PREFERENCE_KEY, AUTO_DETECT)
+    benepar_pref = settings.value(BENEPAR_MODEL_PREFERENCE_KEY, AUTO_DETECT)
+    return spacy_pref, benepar_pref
+
+
+def read_out_of_process_preference() -> bool:
+    """Read whether extraction should run in an engine process (default True; False without QSettings)."""
+    try:
+        from PyQt6.QtCore import QSettings
+    except ImportError:
+        return False
+    settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+    return settings.value(OUT_OF_PROCESS_KEY, True, type=bool)
+
+
+def read_throughput() -> Optional[float]:
+    """Read the last measured extraction throughput in bytes per second, or None if none was measured."""
+    try:
+        from PyQt6.QtCore import QSettings
+    except ImportError:
+        return None
+    settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+    value = settings.value(THROUGHPUT_KEY, 0.0, type=float)
+    return value if value > 0 else None
+
+
+def save_throughput(bytes_per_second: float):
+    """Persist the measured extraction throughput (no-op without QSettings)."""
+    try:
+        from PyQt6.QtCore import QSettings
+    except ImportError:
+        return
+    QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION).setValue(THROUGHPUT_KEY, float(bytes_per_second))
+
+
+def read_tracing_preference() -> bool:
+    """Read whether performance tracing is switched on (default False)."""
+    try:
+        from PyQt6.QtCore import QSettings
+    except ImportError:
+        return False
+    settings = QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
+    return settings.value(TRACING_KEY, False, type=bool)
+
+
+def validate_model_preference(preference: Optional[str], installed_models: List[str],
+                              model_label: str) -> Optional[str]:
+    """
+    Validate a model usage preference against the installed models.
+
+    Args:
+        preference: Saved preference (a model name or AUTO_DETECT).
+        installed_models: Names of installed models of this type.
+        model_label: 'spaCy' or 'Benepar', used in log messages.
+
+    Returns:
+        The model name if it is installed, otherwise None (auto-detect).
+    """
+    if preference and preference != AUTO_DETECT and preference in installed_models:
+        logging.debug(f"Using valid saved {model_label} preference: {preference}")
+        return preference
+    if preference and preference != AUTO_DETECT:
+        logging.warning(f"Saved {model_label} preference '{preference}' not found in installed models {installed_models}. Falling back to auto-detect.")
+    else:
+        logging.debug(f"{model_label} preference set to (Auto-detect).")
+    return None
+
+
+def apply_model_preferences(config: Dict[str, Any], spacy_pref: Optional[str],
+                            benepar_pref: Optional[str]) -> Dict[str, Any]:
+    """Return a copy of config with validated model preferences set for ANPEExtractor."""
+    run_config = config.copy()
+    if spacy_pref:
+        run_config['spacy_model'] = spacy_pref
+    if benepar_pref:
+        run_config['benepar_model'] = benepar_pref
+    return run_config
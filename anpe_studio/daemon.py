@@ -0,0 +1,462 @@
+"""
+Optional long-lived local extraction daemon that keeps ANPE models warm.
+
+Start it once:
+
+    python -m anpe_studio daemon                 # localhost HTTP, port chosen by the OS
+    python -m anpe_studio daemon --socket PATH   # Unix domain socket (POSIX only)
+    python -m anpe_studio daemon --stand-in      # Offline stand-in extractor, no models needed
+
+The daemon speaks JSON over HTTP (on TCP or a Unix socket):
+
+    GET  /status    -> daemon info
+    POST /extract   {"text", "config", "metadata", "nested"} -> extraction result
+    POST /batch     {"paths", "config", "metadata", "nested"} -> JSON lines, one per file,
+                    streamed as each file finishes, then {"event": "finished"}
+                    (paths may name archive members as "archive!member")
+    POST /shutdown  -> stops the daemon
+
+Its address and an access token are published in a discovery file in the
+per-user data directory. ExtractionWorker and BatchWorker look for it and,
+when a daemon is running, act as thin clients instead of loading models
+in-process. This module must not import PyQt.
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import re
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from anpe_studio.archive_inputs import InputTextReader
+from anpe_studio.config_utils import apply_model_preferences, get_app_data_dir
+from anpe_studio.extractor_pool import DEFAULT_MAX_EXTRACTORS, ExtractorPool, anpe_extractor_factory
+from anpe_studio.version import __version__
+
+DISCOVERY_FILENAME = "daemon.json"
+TOKEN_HEADER = "X-ANPE-Token"
+CONNECT_TIMEOUT_SECONDS = 0.5
+# Environment variable to disable daemon use by the GUI workers ("0") or point at an address
+DAEMON_ENV_VAR = "ANPE_STUDIO_DAEMON"
+
+
+class DaemonError(Exception):
+    """Raised by DaemonClient when the daemon is unreachable or reports an error."""
+
+
+# --- Extractors ---
+
+class StandInExtractor:
+    """
+    Offline stand-in for ANPEExtractor with the same extract() signature and
+    result layout. Every word is reported as a single-token noun phrase. Used
+    to exercise the daemon protocol without installed models.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+
+    def extract(self, text: str, metadata: bool = False, include_nested: bool = False) -> Dict[str, Any]:
+        words = re.findall(r"\w+", text)
+        results = []
+        for i, word in enumerate(words):
+            item: Dict[str, Any] = {"id": str(i + 1), "noun_phrase": word, "level": 1}
+            if metadata:
+                item["metadata"] = {"length": 1, "structures": ["stand_in"]}
+            if include_nested:
+                item["children"] = []
+            results.append(item)
+        return {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "configuration": dict(self.config, metadata_requested=metadata, nested_requested=include_nested),
+            "results": results,
+        }
+
+
+# --- Server ---
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """JSON request handler; responses without Content-Length are streamed until close."""
+
+    protocol_version = "HTTP/1.0"
+    server_version = f"ANPEStudioDaemon/{__version__}"
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args):
+        logging.debug(f"DAEMON: {self.address_string()} {format % args}")
+
+    def _authorized(self) -> bool:
+        if secrets.compare_digest(self.headers.get(TOKEN_HEADER, ""), self.server.token):
+            return True
+        self._send_json(403, {"error": "Invalid or missing token"})
+        return False
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length).decode("utf-8")) if length else {}
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == "/status":
+            self._send_json(200, {
+                "version": __version__,
+                "pid": os.getpid(),
+                "uptime": round(time.time() - self.server.started_at, 1),
+                "stand_in": self.server.stand_in,
+                "loaded_configs": self.server.pool.loaded_configs(),
+            })
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        try:
+            request = self._read_json()
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON request: {e}"})
+            return
+
+        if self.path == "/extract":
+            self._handle_extract(request)
+        elif self.path == "/batch":
+            self._handle_batch(request)
+        elif self.path == "/shutdown":
+            self._send_json(200, {"status": "shutting down"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def _handle_extract(self, request: Dict[str, Any]):
+        try:
+            result = self.server.pool.extract(
+                request.get("config") or {}, request.get("text", ""),
+                bool(request.get("metadata")), bool(request.get("nested")))
+        except Exception as e:
+            logging.error(f"DAEMON: Error during extraction: {e}", exc_info=True)
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"result": result})
+
+    def _handle_batch(self, request: Dict[str, Any]):
+        paths = request.get("paths") or []
+        run_config = request.get("config") or {}
+        metadata = bool(request.get("metadata"))
+        nested = bool(request.get("nested"))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        indexes = {file_path: i for i, file_path in enumerate(paths)}
+        try:
+            # Files and archive members ("archive!member") are read ahead while the current one is parsed
+            with InputTextReader(paths) as reader:
+                for file_path, text, read_error in reader:
+                    event: Dict[str, Any] = {"event": "file", "index": indexes[file_path], "path": file_path}
+                    try:
+                        if read_error is not None:
+                            raise OSError(read_error)
+                        event["result"] = self.server.pool.extract(run_config, text, metadata, nested)
+                    except Exception as e:
+                        logging.error(f"DAEMON: Error processing file {file_path}: {e}")
+                        event["error"] = str(e)
+                    self._write_line(event)
+            self._write_line({"event": "finished", "total": len(paths)})
+        except (BrokenPipeError, ConnectionResetError):
+            logging.info("DAEMON: Batch client disconnected; stopping batch.")
+
+    def _write_line(self, payload: Dict[str, Any]):
+        self.wfile.write(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class _DaemonServerMixin:
+    """State shared by the TCP and Unix socket daemon servers."""
+    daemon_threads = True
+
+    def setup_daemon(self, pool: ExtractorPool, token: str, stand_in: bool):
+        self.pool = pool
+        self.token = token
+        self.stand_in = stand_in
+        self.started_at = time.time()
+
+
+class TCPDaemonServer(_DaemonServerMixin, ThreadingHTTPServer):
+    pass
+
+
+class TCP6DaemonServer(TCPDaemonServer):
+    address_family = socket.AF_INET6
+
+
+def resolve_tcp_family(host: str, port: int = 0) -> int:
+    """Address family (AF_INET or AF_INET6) to bind host with. Raises OSError if host does not resolve."""
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)
+    families = [info[0] for info in infos if info[0] in (socket.AF_INET, socket.AF_INET6)]
+    if not families:
+        raise OSError(f"{host} has no IPv4 or IPv6 address")
+    return socket.AF_INET if socket.AF_INET in families else families[0] # "localhost": prefer IPv4, as before
+
+
+if hasattr(socket, "AF_UNIX"):
+    class UnixDaemonServer(_DaemonServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        def server_bind(self):
+            socketserver.UnixStreamServer.server_bind(self)
+            os.chmod(self.server_address, 0o600) # Only the current user may connect
+            self.server_name = "localhost"
+            self.server_port = 0
+else:
+    UnixDaemonServer = None
+
+
+def get_discovery_path():
+    """Path of the file advertising the running daemon's address and token."""
+    return get_app_data_dir() / DISCOVERY_FILENAME
+
+
+def _write_discovery_file(address: str, token: str):
+    path = get_discovery_path()
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"address": address, "token": token, "pid": os.getpid()}, f)
+
+
+def _remove_discovery_file(token: str):
+    path = get_discovery_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if json.load(f).get("token") != token:
+                return # Another daemon has taken over
+        path.unlink()
+    except (OSError, ValueError):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 0, socket_path: Optional[str] = None,
+          stand_in: bool = False, max_extractors: int = DEFAULT_MAX_EXTRACTORS,
+          ready_callback: Optional[Callable[[str], None]] = None):
+    """
+    Run the daemon until /shutdown is requested or the process is interrupted.
+
+    Args:
+        host, port: TCP address to bind (ignored if socket_path is given). Port 0 picks a free port.
+        socket_path: Unix domain socket path to listen on instead of TCP.
+        stand_in: Use StandInExtractor instead of loading ANPE models.
+        max_extractors: Number of distinct configs kept warm.
+        ready_callback: Called with the address once the daemon is listening.
+    """
+    factory = StandInExtractor if stand_in else anpe_extractor_factory
+    pool = ExtractorPool(factory=factory, max_extractors=max_extractors)
+    token = secrets.token_hex(16)
+
+    if socket_path:
+        if UnixDaemonServer is None:
+            raise RuntimeError("Unix domain sockets are not supported on this platform.")
+        if os.path.exists(socket_path):
+            os.unlink(socket_path) # Stale socket from a previous run
+        server = UnixDaemonServer(socket_path, DaemonRequestHandler)
+        address = f"unix:{socket_path}"
+    else:
+        if resolve_tcp_family(host, port) == socket.AF_INET6:
+            server = TCP6DaemonServer((host, port), DaemonRequestHandler)
+            address = f"http://[{server.server_address[0]}]:{server.server_address[1]}"
+        else:
+            server = TCPDaemonServer((host, port), DaemonRequestHandler)
+            address = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    server.setup_daemon(pool, token, stand_in)
+
+    _write_discovery_file(address, token)
+    logging.info(f"DAEMON: Listening on {address} (stand-in: {stand_in})")
+    if ready_callback:
+        ready_callback(address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("DAEMON: Interrupted.")
+    finally:
+        server.server_close()
+        _remove_discovery_file(token)
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+        logging.info("DAEMON: Stopped.")
+
+
+# --- Client ---
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class DaemonClient:
+    """Thin client for a running extraction daemon."""
+
+    def __init__(self, address: str, token: str, timeout: Optional[float] = None):
+        """
+        Args:
+            address: 'unix:/path/to.sock', 'http://127.0.0.1:PORT' or 'http://[::1]:PORT'.
+            token: Access token from the discovery file.
+            timeout: Socket timeout in seconds for requests (None waits indefinitely,
+                     since extraction of large texts can take minutes).
+        """
+        self.address = address
+        self.token = token
+        self.timeout = timeout
+
+    def _connection(self, timeout: Optional[float]) -> http.client.HTTPConnection:
+        if self.address.startswith("unix:"):
+            return _UnixHTTPConnection(self.address[len("unix:"):], timeout=timeout)
+        host_port = self.address.split("://", 1)[-1]
+        host, _, port = host_port.rpartition(":")
+        return http.client.HTTPConnection(host.strip("[]"), int(port), timeout=timeout) # IPv6: "[::1]"
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None):
+        connection = self._connection(timeout if timeout is not None else self.timeout)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {TOKEN_HEADER: self.token, "Content-Type": "application/json"}
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise DaemonError(f"Could not reach extraction daemon at {self.address}: {e}") from e
+        if response.status != 200:
+            try:
+                message = json.loads(response.read().decode("utf-8")).get("error", response.reason)
+            except ValueError:
+                message = response.reason
+            connection.close()
+            raise DaemonError(f"Daemon error ({response.status}): {message}")
+        return connection, response
+
+    def _request_json(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        connection, response = self._request(method, path, payload, timeout)
+        try:
+            return json.loads(response.read().decode("utf-8"))
+        finally:
+            connection.close()
+
+    def status(self, timeout: float = CONNECT_TIMEOUT_SECONDS) -> Dict[str, Any]:
+        """Return daemon info; raises DaemonError if it does not answer within timeout."""
+        return self._request_json("GET", "/status", timeout=timeout)
+
+    def extract(self, text: str, config: Dict[str, Any], metadata: bool, nested: bool,
+                spacy_model_preference: Optional[str] = None,
+                benepar_model_preference: Optional[str] = None) -> Dict[str, Any]:
+        """Extract noun phrases from text using the daemon's warm models."""
+        run_config = apply_model_preferences(config, spacy_model_preference, benepar_model_preference)
+        payload = {"text": text, "config": run_config, "metadata": metadata, "nested": nested}
+        return self._request_json("POST", "/extract", payload)["result"]
+
+    def iter_batch(self, paths: List[str], config: Dict[str, Any], metadata: bool, nested: bool,
+                   spacy_model_preference: Optional[str] = None,
+                   benepar_model_preference: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream batch events as the daemon finishes each file. Closing the generator
+        early (e.g. on cancellation) disconnects, which stops the batch on the daemon.
+        """
+        run_config = apply_model_preferences(config, spacy_model_preference, benepar_model_preference)
+        payload = {"paths": list(paths), "config": run_config, "metadata": metadata, "nested": nested}
+        connection, response = self._request("POST", "/batch", payload)
+        try:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line.decode("utf-8"))
+        except (OSError, http.client.HTTPException) as e:
+            raise DaemonError(f"Connection to extraction daemon lost: {e}") from e
+        finally:
+            connection.close()
+
+    def shutdown(self):
+        """Ask the daemon to stop."""
+        self._request_json("POST", "/shutdown", {}, timeout=CONNECT_TIMEOUT_SECONDS)
+
+
+def find_running_daemon() -> Optional[DaemonClient]:
+    """
+    Return a client for the running daemon, or None if there is none or it is
+    disabled with ANPE_STUDIO_DAEMON=0. Cheap when no daemon was ever started.
+    """
+    if os.environ.get(DAEMON_ENV_VAR) == "0":
+        return None
+    try:
+        with open(get_discovery_path(), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        client = DaemonClient(info["address"], info["token"])
+        client.status()
+        return client
+    except (OSError, ValueError, KeyError):
+        return None
+    except DaemonError as e:
+        logging.debug(f"Extraction daemon not reachable: {e}")
+        return None
+
+
+# --- Command line ---
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for 'python -m anpe_studio daemon ...'."""
+    parser = argparse.ArgumentParser(prog="python -m anpe_studio daemon",
+                                     description="Run a local extraction daemon that keeps ANPE models loaded.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=0, help="TCP port (default: any free port)")
+    parser.add_argument("--socket", default=None, help="Listen on this Unix domain socket instead of TCP")
+    parser.add_argument("--stand-in", action="store_true", help="Use the offline stand-in extractor (no models)")
+    parser.add_argument("--max-extractors", type=int, default=DEFAULT_MAX_EXTRACTORS,
+                        help="Distinct configurations kept loaded at once")
+    parser.add_argument("--stop", action="store_true", help="Stop the running daemon and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug logging on stderr")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(stream=sys.stderr, level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(levelname)s: %(message)s')
+    if args.stop:
+        client = find_running_daemon()
+        if client is None:
+            print("No running daemon found.", file=sys.stderr)
+            return 1
+        client.shutdown()
+        return 0
+
+    if not args.socket:
+        try:
+            resolve_tcp_family(args.host, args.port)
+        except OSError as e:
+            parser.error(f"--host {args.host}: cannot bind to this address ({e})")
+    if args.host not in ("127.0.0.1", "localhost", "::1"):
+        logging.warning(f"DAEMON: Binding to non-local host {args.host}; the daemon can read local files.")
+    serve(host=args.host, port=args.port, socket_path=args.socket, stand_in=args.stand_in,
+          max_extractors=args.max_extractors, ready_callback=lambda address: print(address, flush=True))
+    return 0
@@ -0,0 +1,359 @@
+"""
+Out-of-process extraction engine.
+
+Parsing with spaCy and Benepar is CPU-heavy Python code that holds the GIL
+for long stretches, so running it on a thread of the GUI process stalls
+repaints and input handling. An EngineProcess runs the extractors in a child
+process (started with 'spawn', so no Qt state is inherited) and talks to it
+over a multiprocessing Pipe. The child keeps its own ExtractorPool, so
+models stay loaded between jobs, and reads batch input files itself. Log
+records and trace spans (see anpe_studio.tracing) from the child are
+forwarded to the parent.
+
+If the child dies (e.g. a native crash in a model), only the running job
+fails; the GUI process is unaffected. This module must not import PyQt.
+"""
+
+import logging
+import multiprocessing
+import itertools
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from anpe_studio import tracing
+from anpe_studio.archive_inputs import InputTextReader, display_name
+from anpe_studio.extractor_pool import DEFAULT_MAX_EXTRACTORS, ExtractorPool, anpe_extractor_factory
+
+STOP_TIMEOUT_SECONDS = 5.0
+LOG_PREFIX = "[engine] "
+
+
+class EngineError(Exception):
+    """The engine process could not be started or stopped unexpectedly."""
+
+
+class EngineExtractionError(Exception):
+    """Extraction raised an error inside the engine process (the engine itself is still usable)."""
+
+
+# --- Child Process ---
+
+class _PipeLogHandler(logging.Handler):
+    """Forwards the child's log records to the parent as ("log", levelno, message) events."""
+
+    def __init__(self, conn):
+        super().__init__()
+        self.conn = conn
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.conn.send(("log", record.levelno, self.format(record)))
+        except Exception:
+            pass # Parent is gone; nothing left to report to
+
+
+def _cancel_requested(conn, batch_id: int) -> bool:
+    """Check for a pending cancel of batch_id without blocking (stale cancels are dropped)."""
+    while conn.poll():
+        message = conn.recv()
+        if message[0] == "cancel" and message[1] == batch_id:
+            return True
+    return False
+
+
+def _send_trace(conn):
+    """Forward the spans recorded since the last call as a ("trace", events) event."""
+    if tracing.is_enabled():
+        events = tracing.take_events()
+        if events:
+            conn.send(("trace", events))
+
+
+def _engine_main(conn, factory: Callable[[Dict[str, Any]], Any], max_extractors: int, log_level: int):
+    """Child process loop: serve requests from the parent until 'stop' or EOF."""
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(_PipeLogHandler(conn))
+    root_logger.setLevel(log_level)
+    logging.debug(f"Engine process {os.getpid()} started.")
+    tracing.set_process_name(f"ANPE engine {os.getpid()}")
+
+    pool = ExtractorPool(factory=factory, max_extractors=max_extractors)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break # Parent closed the pipe
+        command = message[0]
+        if command == "stop":
+            break
+        if command == "cancel":
+            continue # Arrived after its batch had finished
+        if command == "tracing":
+            tracing.set_enabled(message[1])
+            continue
+        if command == "extract":
+            _, run_config, text, metadata, nested = message
+            try:
+                conn.send(("result", pool.extract(run_config, text, metadata, nested)))
+            except Exception as e:
+                logging.error(f"Error during extraction: {e}", exc_info=True)
+                conn.send(("error", str(e)))
+            _send_trace(conn)
+        elif command == "batch":
+            _, batch_id, run_config, paths, metadata, nested = message
+            cancelled = False
+            indexes = {path: index for index, path in enumerate(paths)}
+            # Files and archive members are read ahead while the current one is parsed
+            with InputTextReader(paths) as reader:
+                for count, (path, text, read_error) in enumerate(reader, 1):
+                    if _cancel_requested(conn, batch_id):
+                        cancelled = True
+                        break
+                    index = indexes[path]
+                    conn.send(("start", index, path))
+                    logging.info(f"Processing ({count}/{len(paths)}): {display_name(path)}")
+                    if read_error is not None:
+                        logging.error(f"Error reading file {path}: {read_error}")
+                        conn.send(("file", index, path, None, read_error))
+                        continue
+                    try:
+                        conn.send(("file", index, path, pool.extract(run_config, text, metadata, nested), None))
+                    except Exception as e:
+                        logging.error(f"Error processing file {path}: {e}", exc_info=True)
+                        conn.send(("file", index, path, None, str(e)))
+                    _send_trace(conn)
+            _send_trace(conn)
+            conn.send(("done", cancelled))
+    logging.debug(f"Engine process {os.getpid()} exiting.")
+
+
+# --- Parent Side ---
+
+class EngineProcess:
+    """
+    Handle to one engine child process. Requests are served one at a time;
+    an EngineProcess must only be used by one thread at a time (the pool
+    hands each out exclusively).
+    """
+
+    def __init__(self, factory: Callable[[Dict[str, Any]], Any] = anpe_extractor_factory,
+                 max_extractors: int = DEFAULT_MAX_EXTRACTORS):
+        """
+        Args:
+            factory: Picklable callable creating an extractor from a run config
+                (module-level function or class, imported again in the child).
+            max_extractors: Distinct configs kept loaded in the child.
+        """
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe(duplex=True)
+        self._process = context.Process(
+            target=_engine_main, name="anpe-engine",
+            args=(child_conn, factory, max_extractors, logging.getLogger().getEffectiveLevel()),
+            daemon=True # Never outlive the GUI
+        )
+        try:
+            self._process.start()
+        except Exception as e:
+            raise EngineError(f"Could not start extraction engine process: {e}") from e
+        finally:
+            child_conn.close()
+        self._broken = False
+        self._batch_ids = itertools.count(1)
+        self._current_batch_id: Optional[int] = None
+        self._max_extractors = max(1, max_extractors)
+        self._child_tracing = False # Tracing state last sent to the child
+        self.loaded_config_keys: List[str] = [] # Configs used with this engine, most recent last
+        logging.info(f"Extraction engine process started (pid {self._process.pid}).")
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid
+
+    def is_alive(self) -> bool:
+        return not self._broken and self._process.is_alive()
+
+    def _stopped_error(self) -> EngineError:
+        self._broken = True
+        self._process.join(0.5)
+        return EngineError(f"Extraction engine stopped unexpectedly (exit code {self._process.exitcode}).")
+
+    def _send(self, message: Tuple):
+        try:
+            self._conn.send(message)
+        except (OSError, ValueError) as e:
+            raise self._stopped_error() from e
+
+    def _sync_tracing(self):
+        """Switch tracing in the child on or off to match this process."""
+        enabled = tracing.is_enabled()
+        if enabled != self._child_tracing:
+            self._send(("tracing", enabled))
+            self._child_tracing = enabled
+
+    def _recv(self) -> Tuple:
+        """Receive the next non-log event, re-logging forwarded records and merging trace spans on the way."""
+        while True:
+            try:
+                event = self._conn.recv()
+            except (EOFError, OSError) as e:
+                raise self._stopped_error() from e
+            if event[0] == "log":
+                logging.log(event[1], LOG_PREFIX + event[2])
+                continue
+            if event[0] == "trace":
+                tracing.add_events(event[1])
+                continue
+            return event
+
+    def _note_config(self, run_config: Dict[str, Any]):
+        key = ExtractorPool._key(run_config)
+        if key in self.loaded_config_keys:
+            self.loaded_config_keys.remove(key)
+        self.loaded_config_keys.append(key)
+        del self.loaded_config_keys[:-self._max_extractors] # Mirrors the child pool's LRU
+
+    def extract(self, run_config: Dict[str, Any], text: str, metadata: bool, nested: bool) -> Dict[str, Any]:
+        """Extract from one text. Raises EngineExtractionError for extraction errors, EngineError if the engine died."""
+        self._note_config(run_config)
+        self._sync_tracing()
+        self._send(("extract", run_config, text, metadata, nested))
+        event = self._recv()
+        if event[0] == "error":
+            raise EngineExtractionError(event[1])
+        return event[1]
+
+    def iter_batch(self, run_config: Dict[str, Any], paths: List[str], metadata: bool, nested: bool,
+                   on_start: Optional[Callable[[int, str], None]] = None
+                   ) -> Iterator[Tuple[int, str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Extract from files or archive members ("archive!member"), yielding
+        (index, path, result, error) per input as the child finishes it;
+        index is the input's position in paths (members of an archive arrive
+        in archive order). on_start(index, path) is called when the child
+        starts an input. cancel() (from any thread) stops the batch after the
+        current input; the generator then ends early. Consume it to the end:
+        an engine whose batch was abandoned midway is out of step and is
+        retired by the pool.
+        """
+        self._note_config(run_config)
+        batch_id = next(self._batch_ids)
+        self._sync_tracing()
+        self._send(("batch", batch_id, run_config, list(paths), metadata, nested))
+        self._current_batch_id = batch_id
+        completed = False
+        try:
+            while True:
+                event = self._recv()
+                if event[0] == "done":
+                    completed = True
+                    return
+                if event[0] == "start":
+                    if on_start is not None:
+                        on_start(event[1], event[2])
+                elif event[0] == "file":
+                    yield event[1], event[2], event[3], event[4]
+        finally:
+            self._current_batch_id = None
+            if not completed:
+                self._broken = True
+
+    def cancel(self):
+        """Ask the child to stop the running batch after the current file. Safe to call from another thread."""
+        batch_id = self._current_batch_id
+        if batch_id is None:
+            return
+        try:
+            self._conn.send(("cancel", batch_id))
+        except (OSError, ValueError):
+            pass # Engine already gone; the reading thread sees the EOF
+
+    def stop(self, timeout: float = STOP_TIMEOUT_SECONDS):
+        """Ask the child to exit, terminating it if it does not do so in time."""
+        if self._process.is_alive():
+            try:
+                self._conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+            self._process.join(timeout)
+            if self._process.is_alive():
+                logging.warning(f"Extraction engine (pid {self._process.pid}) did not exit; terminating it.")
+                self._process.terminate()
+                self._process.join(1.0)
+        self._conn.close()
+        self._broken = True
+
+
+class EngineProcessPool:
+    """
+    Idle engine processes shared by the job queue. acquire() hands out an
+    engine exclusively (preferring one that already has the job's config
+    loaded) and starts a new one if none is idle; release() returns it.
+    Thread-safe: workers acquire and release from their own threads.
+    """
+
+    def __init__(self, factory: Callable[[Dict[str, Any]], Any] = anpe_extractor_factory,
+                 max_idle: int = 2, max_extractors: int = DEFAULT_MAX_EXTRACTORS):
+        self._factory = factory
+        self._max_idle = max(1, max_idle)
+        self._max_extractors = max_extractors
+        self._idle: List[EngineProcess] = []
+        self._busy: List[EngineProcess] = []
+        self._retired: List[EngineProcess] = [] # Busy when clear() was called; stopped on release
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def set_max_idle(self, count: int):
+        self._max_idle = max(1, count)
+
+    def acquire(self, run_config: Optional[Dict[str, Any]] = None) -> EngineProcess:
+        """Get an engine for exclusive use. Raises EngineError if a new engine cannot be started."""
+        key = ExtractorPool._key(run_config) if run_config is not None else None
+        with self._lock:
+            if self._closed:
+                raise EngineError("Engine pool has been shut down.")
+            self._idle = [engine for engine in self._idle if engine.is_alive()]
+            warm = [engine for engine in self._idle if key in engine.loaded_config_keys]
+            engine = (warm or self._idle or [None])[-1]
+            if engine is not None:
+                self._idle.remove(engine)
+                self._busy.append(engine)
+                return engine
+        engine = EngineProcess(self._factory, self._max_extractors) # Spawning can take a moment; not under the lock
+        with self._lock:
+            self._busy.append(engine)
+        return engine
+
+    def release(self, engine: EngineProcess):
+        """Return an engine after use. Dead engines and engines beyond max_idle are stopped."""
+        with self._lock:
+            if engine in self._busy:
+                self._busy.remove(engine)
+            retired = engine in self._retired
+            if retired:
+                self._retired.remove(engine)
+            keep = (not self._closed and not retired and engine.is_alive()
+                    and len(self._idle) < self._max_idle)
+            if keep:
+                self._idle.append(engine)
+        if not keep:
+            engine.stop()
+
+    def clear(self):
+        """Drop loaded models in idle engines and retire busy ones when they are released."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._retired = list(self._busy)
+        for engine in idle:
+            engine.stop() # A fresh process also releases native memory held by the models
+        logging.debug("Engine process pool cleared.")
+
+    def shutdown(self):
+        """Stop all engines (busy engines are stopped too; their jobs fail)."""
+        with self._lock:
+            self._closed = True
+            engines, self._idle, self._busy, self._retired = self._idle + self._busy, [], [], []
+        for engine in engines:
+            engine.stop(timeout=1.0)
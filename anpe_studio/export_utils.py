@@ -0,0 +1,250 @@
+"""
+Streaming, optionally compressed export of ANPE results.
+
+Wraps the core ``ANPEExporter`` so that txt/csv/json output can be written
+straight through a gzip or zstd stream. Output is encoded and compressed
+chunk by chunk as it is written; the full file is never built in memory.
+
+'anpe' is only imported when an exporter is created, so the constants and
+helpers here are safe to import from the GUI at startup.
+"""
+
+import contextlib
+import csv
+import gzip
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO
+
+from anpe_studio.archive_inputs import export_stem
+
+try:
+    import zstandard  # Optional dependency for zstd compression
+except ImportError:
+    zstandard = None
+
+# --- Compression Constants ---
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+
+# File suffix appended to the export filename for each compression type
+COMPRESSION_SUFFIXES = {
+    COMPRESSION_NONE: "",
+    COMPRESSION_GZIP: ".gz",
+    COMPRESSION_ZSTD: ".zst",
+}
+
+# (min, max, default) compression level for each compression type
+COMPRESSION_LEVELS = {
+    COMPRESSION_GZIP: (1, 9, 6),
+    COMPRESSION_ZSTD: (1, 22, 3),
+}
+
+
+def is_zstd_available() -> bool:
+    """Return True if the optional 'zstandard' package is installed."""
+    return zstandard is not None
+
+
+def get_available_compressions() -> List[str]:
+    """Return the compression types usable in this environment."""
+    compressions = [COMPRESSION_NONE, COMPRESSION_GZIP]
+    if is_zstd_available():
+        compressions.append(COMPRESSION_ZSTD)
+    return compressions
+
+
+def batch_export_filename(input_key: str, prefix: str, timestamp_str: str, export_format: str,
+                          used_stems: Set[str]) -> str:
+    """
+    File name for one input's results in a batch export (Studio and the CLI):
+    [prefix_]<stem>_anpe_results_<timestamp>.<format>, where <stem> comes from
+    archive_inputs.export_stem(). A stem already in used_stems (compared
+    without case, as on Windows and macOS filesystems) gets a _2, _3, ...
+    counter, so inputs with the same name (x.txt in two directories) do not
+    overwrite each other. Pass the same set for every input of one export.
+    """
+    stem = export_stem(input_key)
+    if stem.lower() in used_stems:
+        counter = 2
+        while f"{stem}_{counter}".lower() in used_stems:
+            counter += 1
+        stem = f"{stem}_{counter}"
+    used_stems.add(stem.lower())
+    if prefix:
+        return f"{prefix}_{stem}_anpe_results_{timestamp_str}.{export_format}"
+    return f"{stem}_anpe_results_{timestamp_str}.{export_format}"
+
+
+def get_compressed_path(output_filepath: str, compression: str) -> Path:
+    """Return the output path with the suffix for the given compression appended."""
+    path = Path(output_filepath)
+    suffix = COMPRESSION_SUFFIXES.get(compression, "")
+    if suffix and not path.name.endswith(suffix):
+        path = path.with_name(path.name + suffix)
+    return path
+
+
+@contextlib.contextmanager
+def open_text_stream(output_filepath: Path, compression: str = COMPRESSION_NONE,
+                     level: Optional[int] = None, newline: Optional[str] = None) -> Iterator[TextIO]:
+    """
+    Open a UTF-8 text stream that writes to disk through the requested compressor.
+
+    Args:
+        output_filepath: Path of the file to create.
+        compression: One of COMPRESSION_NONE, COMPRESSION_GZIP or COMPRESSION_ZSTD.
+        level: Compression level. Uses the default for the compression type if None.
+        newline: Passed to the text wrapper (use '' for csv output).
+
+    Yields:
+        A writable text stream. Closing it flushes and finalizes the compressed frame.
+    """
+    if compression == COMPRESSION_NONE:
+        with open(output_filepath, "w", encoding="utf-8", newline=newline) as f:
+            yield f
+        return
+
+    if compression not in COMPRESSION_LEVELS:
+        raise ValueError(f"Unknown compression: {compression}")
+
+    min_level, max_level, default_level = COMPRESSION_LEVELS[compression]
+    level = default_level if level is None else max(min_level, min(max_level, int(level)))
+
+    if compression == COMPRESSION_GZIP:
+        with gzip.open(output_filepath, "wt", compresslevel=level,
+                       encoding="utf-8", newline=newline) as f:
+            yield f
+        return
+
+    # zstd
+    if not is_zstd_available():
+        raise ValueError("zstd compression requires the 'zstandard' package to be installed.")
+    with contextlib.ExitStack() as stack:
+        raw = stack.enter_context(open(output_filepath, "wb"))
+        compressor = zstandard.ZstdCompressor(level=level)
+        writer = stack.enter_context(compressor.stream_writer(raw, closefd=False))
+        text_stream = io.TextIOWrapper(writer, encoding="utf-8", newline=newline,
+                                       write_through=False)
+        try:
+            yield text_stream
+        finally:
+            # Flush buffered text into the compressor without closing the writer;
+            # the ExitStack ends the zstd frame and closes the raw file.
+            text_stream.flush()
+            text_stream.detach()
+
+
+class CompressedExporter:
+    """
+    Exporter that streams ANPEExporter's output layouts through an optional compressor.
+
+    With compression set to 'none' the core exporter is used unchanged.
+    """
+
+    def __init__(self, compression: str = COMPRESSION_NONE, level: Optional[int] = None):
+        from anpe.utils.export import ANPEExporter # Import here to keep module import light
+        self._exporter = ANPEExporter()
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Invalid compression: {compression}. Must be one of {list(COMPRESSION_SUFFIXES)}")
+        if compression == COMPRESSION_ZSTD and not is_zstd_available():
+            raise ValueError("zstd compression requires the 'zstandard' package to be installed.")
+        self.compression = compression
+        self.level = level
+
+    def export(self, data: Dict, format: str, output_filepath: str) -> str:
+        """
+        Export noun phrases to file, compressing the output if configured.
+
+        The compression suffix (e.g. '.gz') is appended to output_filepath.
+
+        Returns:
+            The resolved path to the exported file.
+        """
+        if self.compression == COMPRESSION_NONE:
+            return self._exporter.export(data, format=format, output_filepath=output_filepath)
+
+        resolved_path = get_compressed_path(output_filepath, self.compression).resolve()
+        logging.info(f"Exporting noun phrases to {resolved_path} in {format} format ({self.compression})")
+
+        valid_formats = ["txt", "csv", "json"]
+        if format not in valid_formats:
+            raise ValueError(f"Invalid format: {format}. Must be one of {valid_formats}")
+        if not isinstance(data, dict) or "results" not in data:
+            raise ValueError("Invalid data structure. Expected dictionary with 'results' key")
+
+        try:
+            if format == "txt":
+                with open_text_stream(resolved_path, self.compression, self.level) as f:
+                    self._stream_txt(data, f)
+            elif format == "csv":
+                with open_text_stream(resolved_path, self.compression, self.level, newline="") as f:
+                    self._stream_csv(data, f)
+            elif format == "json":
+                with open_text_stream(resolved_path, self.compression, self.level) as f:
+                    self._stream_json(data, f)
+        except Exception as e:
+            logging.error(f"Error exporting to {format} at {resolved_path}: {e}")
+            raise
+        return str(resolved_path)
+
+    def _stream_txt(self, data: Dict, f: TextIO):
+        """Write the txt layout used by ANPEExporter to an open text stream."""
+        f.write("--- ANPE Noun Phrase Extraction Results ---\n")
+        f.write(f"Timestamp: {data.get('timestamp', 'N/A')}\n")
+        f.write("\n--- Configuration Used ---\n")
+
+        config = data.get('configuration', {})
+        nested_requested = config.get('nested_requested', False)
+        metadata_requested = config.get('metadata_requested', False)
+        f.write(f"Output includes Nested NPs: {nested_requested}\n")
+        f.write(f"Output includes Metadata: {metadata_requested}\n")
+        f.write("-----\n")
+
+        f.write(f"Accept Pronouns: {config.get('accept_pronouns', True)}\n")
+        structure_filters = config.get('structure_filters', None)
+        structure_filters_str = ", ".join(structure_filters) if structure_filters else "None"
+        f.write(f"Structure Filters: {structure_filters_str}\n")
+        f.write(f"Newline Breaks: {config.get('newline_breaks', True)}\n")
+        f.write(f"Spacy Model Used: {config.get('spacy_model_used', 'unknown')}\n")
+        f.write(f"Benepar Model Used: {config.get('benepar_model_used', 'unknown')}\n")
+        f.write("--------------------------\n")
+
+        f.write("\n--- Extraction Results ---\n")
+        if not data.get('results'):
+            f.write("(No noun phrases extracted with the given configuration.)\n")
+        else:
+            for item in data['results']:
+                self._exporter._write_txt_item(f, item, metadata=metadata_requested, include_nested=nested_requested)
+
+    def _stream_csv(self, data: Dict, f: TextIO):
+        """Write the flattened csv layout used by ANPEExporter, one top-level NP at a time."""
+        includes_metadata = data.get('configuration', {}).get('metadata_requested', False)
+        writer = csv.writer(f)
+        if includes_metadata:
+            writer.writerow(["ID", "Level", "Parent_ID", "Noun_Phrase", "Length", "Structures"])
+        else:
+            writer.writerow(["ID", "Level", "Parent_ID", "Noun_Phrase"])
+
+        for np_item in data['results']:
+            # Flatten per top-level NP so only one subtree is held at a time
+            for np in self._exporter._flatten_np_hierarchy(np_item, flattened_list=[]) or []:
+                if includes_metadata:
+                    structures = np.get("structures", [])
+                    structures_str = "|".join(structures) if isinstance(structures, list) else structures
+                    writer.writerow([np["id"], np["level"], np.get("parent_id", ""),
+                                     np["noun_phrase"], np.get("length", ""), structures_str])
+                else:
+                    writer.writerow([np["id"], np["level"], np.get("parent_id", ""), np["noun_phrase"]])
+
+    def _stream_json(self, data: Dict, f: TextIO):
+        """Write hierarchical json; json.dump encodes and writes incrementally."""
+        json.dump(data, f, indent=2, default=self._json_default)
+
+    @staticmethod
+    def _json_default(obj: Any) -> str:
+        """Convert non-serializable values to strings, matching ANPEExporter._clean_for_json."""
+        return str(obj)
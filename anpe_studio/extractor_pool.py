@@ -0,0 +1,110 @@
+"""
+Pool of warm ANPE extractors shared by concurrent jobs.
+
+Creating an ANPEExtractor loads the spaCy and Benepar models, which takes
+far longer than extracting from a typical text. The pool keeps extractors
+loaded between runs, keyed by their effective configuration. Used by the
+Studio job queue and by the extraction daemon. This module must not import
+PyQt.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+from anpe_studio import tracing
+
+DEFAULT_MAX_EXTRACTORS = 2 # Distinct configs kept loaded at once
+
+
+def anpe_extractor_factory(run_config: Dict[str, Any]):
+    """Create an ANPEExtractor for run_config (imports anpe lazily)."""
+    from anpe import ANPEExtractor
+    return ANPEExtractor(config=run_config)
+
+
+class ExtractorPool:
+    """
+    Keeps up to max_extractors warm extractors, keyed by their effective config
+    (least recently used is dropped). Each extractor is used by one caller at
+    a time since spaCy pipelines are not thread-safe; callers with different
+    configs run concurrently.
+    """
+
+    def __init__(self, factory: Callable[[Dict[str, Any]], Any] = anpe_extractor_factory,
+                 max_extractors: int = DEFAULT_MAX_EXTRACTORS):
+        self._factory = factory
+        self._max_extractors = max(1, max_extractors)
+        self._extractors: "OrderedDict[str, Any]" = OrderedDict()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock_users: Dict[str, int] = {} # Callers holding or waiting for each config's lock
+        self._pool_lock = threading.Lock()
+
+    @staticmethod
+    def _key(run_config: Dict[str, Any]) -> str:
+        return json.dumps(run_config, sort_keys=True, default=str)
+
+    def extract(self, run_config: Dict[str, Any], text: str, metadata: bool, nested: bool) -> Dict[str, Any]:
+        """Extract with the warm extractor for run_config, creating it on first use."""
+        key = self._key(run_config)
+        with self._pool_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+            self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            with lock:
+                with self._pool_lock:
+                    extractor = self._extractors.get(key)
+                    if extractor is not None:
+                        self._extractors.move_to_end(key)
+                if extractor is None:
+                    logging.info(f"Loading extractor for config {key}")
+                    with tracing.span("load models", "extract"):
+                        extractor = self._factory(run_config)
+                    with self._pool_lock:
+                        self._extractors[key] = extractor
+                        while len(self._extractors) > self._max_extractors:
+                            dropped_key, _ = self._extractors.popitem(last=False)
+                            logging.info(f"Dropping extractor for config {dropped_key}")
+                            self._discard_lock(dropped_key)
+                with tracing.span("parse", "extract", chars=len(text)):
+                    return extractor.extract(text=text, metadata=metadata, include_nested=nested)
+        finally:
+            with self._pool_lock:
+                self._lock_users[key] -= 1
+                self._discard_lock(key)
+
+    def _discard_lock(self, key: str):
+        """
+        Forget key's lock once its extractor is gone and no caller holds or
+        waits for it, so the locks do not grow with every config ever used.
+        A lock in use is kept: a second lock for the same key would let two
+        callers share one extractor. Call with _pool_lock held.
+        """
+        if key not in self._extractors and not self._lock_users.get(key):
+            self._locks.pop(key, None)
+            self._lock_users.pop(key, None)
+
+    def loaded_configs(self) -> List[str]:
+        with self._pool_lock:
+            return list(self._extractors.keys())
+
+    def clear(self):
+        """Drop all loaded extractors (e.g. after models were installed or removed)."""
+        with self._pool_lock:
+            self._extractors.clear()
+            for key in list(self._locks):
+                self._discard_lock(key)
+        logging.debug("Extractor pool cleared.")
+
+
+class PooledExtractor:
+    """ANPEExtractor-compatible view of the pool's extractor for one config."""
+
+    def __init__(self, pool: ExtractorPool, run_config: Dict[str, Any]):
+        self.pool = pool
+        self.config = run_config
+
+    def extract(self, text: str, metadata: bool = False, include_nested: bool = False) -> Dict[str, Any]:
+        return self.pool.extract(self.config, text, metadata, include_nested)
@@ -0,0 +1,107 @@
+"""
+Rotating on-disk segments for log lines evicted from memory.
+
+The log panel keeps a bounded number of recent lines in memory. Older lines
+are appended to segment files in a temporary directory; once a segment
+reaches its size limit a new one is started, and the oldest segment is
+deleted when there are too many. Exports read the segments back as a
+stream. This module must not import PyQt.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024 # Size at which a new segment is started
+DEFAULT_MAX_SEGMENTS = 8                # Oldest segment is deleted beyond this (about 32 MB of history)
+
+
+class LogSpill:
+    """Append-only, size-bounded store of log lines on disk, oldest segments discarded first."""
+
+    def __init__(self, segment_bytes: int = DEFAULT_SEGMENT_BYTES, max_segments: int = DEFAULT_MAX_SEGMENTS,
+                 spill_dir: Optional[str] = None):
+        """
+        Args:
+            segment_bytes: Approximate size of one segment file.
+            max_segments: Segments kept; older ones are deleted.
+            spill_dir: Parent directory for the segment directory (system temp dir if None).
+        """
+        self.segment_bytes = max(1, segment_bytes)
+        self.max_segments = max(1, max_segments)
+        self._spill_parent = spill_dir
+        self._dir: Optional[str] = None # Created on first write
+        self._segments: List[Tuple[str, int]] = [] # (path, line count), oldest first
+        self._current_bytes = 0
+        self._next_segment = 0
+        self.line_count = 0      # Lines currently on disk
+        self.discarded_lines = 0 # Lines lost with deleted segments
+
+    def write_lines(self, lines: Iterable[str]):
+        """Append lines (without newlines) to the current segment, rotating as needed."""
+        lines = list(lines)
+        if not lines:
+            return
+        try:
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix="anpe_log_", dir=self._spill_parent)
+            if not self._segments or self._current_bytes >= self.segment_bytes:
+                self._start_segment()
+            data = "".join(line + "\n" for line in lines).encode("utf-8", errors="replace")
+            path, count = self._segments[-1]
+            with open(path, "ab") as f:
+                f.write(data)
+            self._segments[-1] = (path, count + len(lines))
+            self._current_bytes += len(data)
+            self.line_count += len(lines)
+        except OSError as e:
+            # Not fatal: the lines are only lost from the export
+            self.discarded_lines += len(lines)
+            logging.warning(f"Could not write log spill segment: {e}")
+
+    def _start_segment(self):
+        path = os.path.join(self._dir, f"segment_{self._next_segment:05d}.log")
+        self._next_segment += 1
+        self._segments.append((path, 0))
+        self._current_bytes = 0
+        while len(self._segments) > self.max_segments:
+            old_path, old_count = self._segments.pop(0)
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+            self.line_count -= old_count
+            self.discarded_lines += old_count
+
+    def iter_lines(self) -> Iterator[str]:
+        """Stream the spilled lines, oldest first."""
+        for path, _ in list(self._segments):
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        yield line.rstrip("\n")
+            except OSError as e:
+                logging.warning(f"Could not read log spill segment {path}: {e}")
+
+    def clear(self):
+        """Delete all segments (the directory is reused)."""
+        for path, _ in self._segments:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._segments = []
+        self._current_bytes = 0
+        self.line_count = 0
+        self.discarded_lines = 0
+
+    def close(self):
+        """Delete the segment directory."""
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+        self._segments = []
+        self._current_bytes = 0
+        self.line_count = 0
@@ -6,7 +6,7 @@ import os
 import sys # Add this import
 import logging
 import functools # Import functools
-from typing import Optional, Dict, Any, List, Union # Added Union
+from typing import Optional, Dict, Any, List, Tuple, Union # Added Union
 from pathlib import Path
 from datetime import datetime # Added datetime
 import platform # Added platform
@@ -28,34 +28,38 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QIcon, QTextCursor, QScreen, QPixmap, QFont, QColor, QCloseEvent, QPalette, QAction, QKeySequence, QShortcut, QDesktopServices # Added QPalette, QAction, QKeySequence, QShortcut, QDesktopServices
 
 from .theme import PRIMARY_COLOR, SECONDARY_COLOR, SUCCESS_COLOR, ERROR_COLOR, WARNING_COLOR, INFO_COLOR, BORDER_COLOR, get_scroll_bar_style, LIGHT_HOVER_BLUE, TEXT_COLOR # Update the import
-from .widgets.help_dialog import HelpDialog # Import the new dialog
+# anpe is not imported here: extraction runs through anpe_studio.extractor_pool,
+# which imports it on first use, so only its metadata is read at startup
 try:
-    # Use importlib.metadata to get the version
     anpe_version_str = importlib.metadata.version('anpe')
-    # Still need to import the class itself
-    from anpe import ANPEExtractor
-except ImportError:
+except importlib.metadata.PackageNotFoundError:
     # This handles the case where 'anpe' is not installed at all
     QMessageBox.critical(
         None,
         "Import Error",
         "Could not import ANPE library. Please make sure it's installed."
     )
-    anpe_version_str = "N/A" # Use a different name to avoid conflict if ANPEExtractor fails
-    # Allow GUI to potentially start to show the error, but disable processing
-    class ANPEExtractor: # Dummy class if import fails
-        def __init__(self, *args, **kwargs): pass
-        def extract_noun_phrases(self, *args, **kwargs): return {}
-        def export_to_file(self, *args, **kwargs): pass
+    anpe_version_str = "N/A"
+    # Allow GUI to potentially start to show the error; extraction will report the missing library
 
 
 from anpe_studio.workers import ExtractionWorker, BatchWorker, QtLogHandler
 from anpe_studio.widgets import (FileListWidget, StructureFilterWidget, 
                               StatusBar, EnhancedLogPanel, ResultDisplayWidget) # Ensure StatusBar is imported from widgets
 from anpe_studio.theme import get_stylesheet # Import the function to get the stylesheet
-from anpe_studio.widgets.settings_dialog import SettingsDialog # Import the new dialog
 from anpe_studio.resource_manager import ResourceManager # Added import
 from anpe_studio.workers.status_worker import ModelStatusChecker # IMPORT NEW WORKER
+from anpe_studio.export_utils import COMPRESSION_LEVELS, batch_export_filename, get_available_compressions
+from anpe_studio.archive_inputs import display_name
+from anpe_studio.np_aggregator import NPFrequencyAggregator, NORMALIZATION_MODES, NORMALIZE_LOWER
+from anpe_studio.result_store import ResultSet
+from anpe_studio.workers.job_queue import (JobQueueManager, Job, JOB_TEXT, JOB_BATCH, PRIORITY_LABELS,
+                                           PRIORITY_NORMAL, STATE_RUNNING, STATE_CANCELLED)
+from anpe_studio.widgets.job_queue_panel import JobQueuePanel
+from anpe_studio.config_utils import (build_extractor_config, read_model_preferences, validate_model_preference,
+                                      read_out_of_process_preference, read_throughput, save_throughput,
+                                      read_tracing_preference, get_app_data_dir, TRACE_DIR_NAME)
+from anpe_studio import tracing
 
 # Helper function to get the base path
 def get_base_path():
@@ -164,9 +168,16 @@ class MainWindow(QMainWindow):
         logging.debug(f"MainWindow received initial status: {self.model_status}")
         
         self.anpe_version = anpe_version_str # Store version string
-        self.worker: Optional[ExtractionWorker] = None # For single processing
-        self.batch_worker: Optional[BatchWorker] = None # For batch processing
-        self.results: Optional[Dict[str, Any]] = None # To store last processing results for export
+        self._help_dialog = None # Built on first open and reused (help rendering is also cached on disk)
+        self._settings_dialog = None
+        # Text and batch jobs run through the queue, sharing warm extractors (in engine processes by default)
+        tracing.set_enabled(read_tracing_preference()) # Opt-in timeline of this session (Settings)
+        self.job_queue = JobQueueManager(out_of_process=read_out_of_process_preference(),
+                                         bytes_per_second=read_throughput(), parent=self)
+        self._displayed_job_id: Optional[int] = None # Job whose results are shown in the Output tab
+        self.results: Optional[Union[Dict[str, Any], ResultSet]] = None # Results of the displayed job: text result or batch ResultSet (for export)
+        self.np_aggregator: Optional[NPFrequencyAggregator] = None # Corpus NP frequencies of the displayed job
+        self.processing_error_occurred = False
 
         # Animation setup
         self._fade_animation = None
@@ -174,6 +185,17 @@ class MainWindow(QMainWindow):
 
         # Build the UI
         self.setup_ui()
+
+        # --- Job Queue Signals ---
+        self.job_queue.jobStarted.connect(self.on_job_started)
+        self.job_queue.jobStatus.connect(self.on_job_status)
+        self.job_queue.jobProgress.connect(self.on_job_progress)
+        self.job_queue.textResult.connect(self.on_job_text_result)
+        self.job_queue.fileResults.connect(self.on_job_file_results)
+        self.job_queue.jobError.connect(self.on_job_error)
+        self.job_queue.jobFinished.connect(self.on_job_finished)
+        self.job_queue.throughputMeasured.connect(self.on_throughput_measured)
+        self.file_list_widget.set_throughput(self.job_queue.bytes_per_second)
         
         # --- Set initial state based on received status --- 
         self.extractor_ready = False # Default to False
@@ -225,6 +247,13 @@ class MainWindow(QMainWindow):
             # Settings button should be enabled (default state after setup_ui)
         # ---------------------------------------------------
 
+        # A status from the model cache is re-checked in the background; the UI only changes if it differs
+        self.model_verify_thread: Optional[QThread] = None
+        self.model_verify_worker: Optional[ModelStatusChecker] = None
+        self._cached_model_status: Optional[Dict] = None # Status being verified
+        if self.model_status.get('from_cache'):
+            self._start_model_verification()
+
     # Add a helper method for the dialog
     def _show_missing_models_dialog(self, details: str):
         """Shows a dialog informing the user about missing models."""
@@ -348,6 +377,10 @@ class MainWindow(QMainWindow):
         self.output_tab = QWidget() # Create tab page widget
         self.setup_output_tab()    # Populate it
         self.main_tabs.addTab(self.output_tab, "Output")
+
+        self.queue_tab = JobQueuePanel(self.job_queue) # Queued, running and finished jobs
+        self.queue_tab.showResultsRequested.connect(self.show_job_results)
+        self.main_tabs.addTab(self.queue_tab, "Queue")
         self.main_splitter.addWidget(self.main_tabs) # Add tabs to splitter
         
         # 2b. Log Panel (Right Pane)
@@ -391,15 +424,11 @@ class MainWindow(QMainWindow):
 
         # Icon Label (Added)
         icon_label = QLabel()
-        pixmap = ResourceManager.get_pixmap("app_icon_logo_transparent.png")
         # Get device pixel ratio for high-DPI screens
         screen = QApplication.primaryScreen()
         dpr = screen.devicePixelRatio() if screen else 1.0
-        target_size = int(60 * dpr)
-        # Scale the pixmap to the correct size for the display
-        scaled_pixmap = pixmap.scaled(target_size, target_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        scaled_pixmap.setDevicePixelRatio(dpr)
-        icon_label.setPixmap(scaled_pixmap)
+        # Scaled to the correct size for the display (cached by ResourceManager)
+        icon_label.setPixmap(ResourceManager.get_pixmap("app_icon_logo_transparent.png", size=60, device_pixel_ratio=dpr))
         icon_label.setFixedSize(60, 60) # Set fixed size for alignment
         title_layout.addWidget(icon_label)
         
@@ -531,6 +560,8 @@ class MainWindow(QMainWindow):
         file_page_layout.setSpacing(5)
         self.file_list_widget = FileListWidget() # The dedicated file list widget
         self.file_list_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.file_list_widget.watchFilesReady.connect(self.handle_watch_files)
+        self.file_list_widget.scanFilesAdded.connect(self.on_launch_directory_scanned)
         file_page_layout.addWidget(self.file_list_widget)
         self.input_stack.addWidget(file_input_page) # Add page to stack
 
@@ -593,6 +624,19 @@ class MainWindow(QMainWindow):
         self.newline_breaks.setToolTip("When unchecked (default), newlines are treated as sentence boundaries.\nWhen checked, newlines are ignored (useful for irregular formatting).")
         settings_layout.addWidget(self.newline_breaks, 0, 2)
 
+        self.aggregate_frequencies = QCheckBox("Aggregate NP frequencies")
+        self.aggregate_frequencies.setChecked(False)
+        self.aggregate_frequencies.setToolTip("For file input, build a corpus-level table of unique noun phrases with their counts,\ndocument frequencies and dominant structures. It is exported alongside the results.")
+        settings_layout.addWidget(self.aggregate_frequencies, 1, 0)
+
+        self.aggregate_normalization_combo = QComboBox()
+        self.aggregate_normalization_combo.addItems(NORMALIZATION_MODES)
+        self.aggregate_normalization_combo.setCurrentText(NORMALIZE_LOWER)
+        self.aggregate_normalization_combo.setToolTip("How noun phrases are normalized before counting (lemma requires NLTK WordNet data).")
+        self.aggregate_normalization_combo.setEnabled(False)
+        self.aggregate_frequencies.toggled.connect(self.aggregate_normalization_combo.setEnabled)
+        settings_layout.addWidget(self.aggregate_normalization_combo, 1, 1)
+
         # Column stretches for alignment
         settings_layout.setColumnStretch(0, 0)
         settings_layout.setColumnStretch(1, 0)
@@ -727,7 +771,16 @@ class MainWindow(QMainWindow):
         """)
         self.process_button.clicked.connect(self.start_processing)
         # Add tooltip to explain disabled state
-        self.process_button.setToolTip("Process the input text or files.")
+        self.process_button.setToolTip("Process the input text or files. While other jobs run, the input is queued.")
+
+        # Priority of the queued job
+        self.job_priority_combo = QComboBox()
+        for priority, label in PRIORITY_LABELS.items():
+            self.job_priority_combo.addItem(label, priority)
+        self.job_priority_combo.setCurrentIndex(self.job_priority_combo.findData(PRIORITY_NORMAL))
+        self.job_priority_combo.setToolTip("Priority of this job in the queue")
+        process_reset_layout.addWidget(QLabel("Priority:"))
+        process_reset_layout.addWidget(self.job_priority_combo)
         process_reset_layout.addWidget(self.process_button)
         
         self.input_layout.addLayout(process_reset_layout)
@@ -745,6 +798,7 @@ class MainWindow(QMainWindow):
         self.file_selector_combo = QComboBox()
         self.file_selector_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.file_selector_combo.currentIndexChanged.connect(self.display_selected_file_result)
+        self._file_selector_paths = set() # Paths in the combo, for duplicate checks without scanning it
         self.file_selector_layout.addWidget(self.file_selector_label)
         self.file_selector_layout.addWidget(self.file_selector_combo, 1)  # Give combo stretch
         self.output_layout.addLayout(self.file_selector_layout)
@@ -774,6 +828,26 @@ class MainWindow(QMainWindow):
         # Use the combo box directly
         export_layout.addRow("Format:", self.export_format_combo)
 
+        # Row 0b: Compression (ComboBox + Level SpinBox)
+        self.export_compression_combo = QComboBox()
+        self.export_compression_combo.addItems(get_available_compressions())
+        self.export_compression_combo.setToolTip("Compress exported files while they are written (zstd requires the 'zstandard' package)")
+        self.export_compression_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.export_compression_level_spin = QSpinBox()
+        self.export_compression_level_spin.setToolTip("Compression level (higher is smaller but slower)")
+        self.export_compression_combo.currentTextChanged.connect(self.update_compression_level_range)
+
+        export_compression_layout = QHBoxLayout()
+        export_compression_layout.setContentsMargins(0,0,0,0)
+        export_compression_layout.setSpacing(5)
+        export_compression_layout.addWidget(self.export_compression_combo, 1)
+        export_compression_layout.addWidget(QLabel("Level:"))
+        export_compression_layout.addWidget(self.export_compression_level_spin)
+        export_compression_container = QWidget()
+        export_compression_container.setLayout(export_compression_layout)
+        export_layout.addRow("Compression:", export_compression_container)
+        self.update_compression_level_range(self.export_compression_combo.currentText())
+
         # Row 1: Filename Prefix (Optional)
         self.export_filename_prefix_edit = QLineEdit()
         self.export_filename_prefix_edit.setPlaceholderText("Optional prefix for exported files")
@@ -856,6 +930,18 @@ class MainWindow(QMainWindow):
         nav_button_layout.addWidget(self.process_new_button)
         self.output_layout.addLayout(nav_button_layout)
 
+    @pyqtSlot(str)
+    def update_compression_level_range(self, compression: str):
+        """Adjust the compression level spin box to the range of the selected compression."""
+        level_range = COMPRESSION_LEVELS.get(compression)
+        if level_range is None:
+            self.export_compression_level_spin.setEnabled(False)
+            return
+        min_level, max_level, default_level = level_range
+        self.export_compression_level_spin.setRange(min_level, max_level)
+        self.export_compression_level_spin.setValue(default_level)
+        self.export_compression_level_spin.setEnabled(True)
+
     # --- Input/Processing Logic ---
 
     @pyqtSlot(int)
@@ -874,29 +960,27 @@ class MainWindow(QMainWindow):
             return None 
 
         try:
-            # General Filtering Options -> ANPEExtractor config
-            if self.min_length_check.isChecked():
-                config["min_length"] = self.min_length_spin.value()
-            if self.max_length_check.isChecked():
-                config["max_length"] = self.max_length_spin.value()
-            config["accept_pronouns"] = not self.accept_pronouns.isChecked()
-            config["newline_breaks"] = not self.newline_breaks.isChecked()
-
             # Structure Filtering Options -> ANPEExtractor config
+            selected_structures = None
             if hasattr(self, 'structure_filter_widget') and self.structure_filter_widget:
                 if self.structure_filter_widget.is_filtering_enabled():
-                    selected_structures = self.structure_filter_widget.get_selected_structures()
                     # Pass filters only if enabled and at least one is selected
                     # Otherwise, ANPE core gets no filter key, meaning include all.
-                    if selected_structures:
-                        config["structure_filters"] = selected_structures
+                    selected_structures = self.structure_filter_widget.get_selected_structures()
             else:
                 logging.warning("Structure filter widget not found/ready during config gathering.")
 
+            # General Filtering Options -> ANPEExtractor config (shared with the headless CLI)
+            config = build_extractor_config(
+                min_length=self.min_length_spin.value() if self.min_length_check.isChecked() else None,
+                max_length=self.max_length_spin.value() if self.max_length_check.isChecked() else None,
+                accept_pronouns=not self.accept_pronouns.isChecked(),
+                newline_breaks=not self.newline_breaks.isChecked(),
+                structure_filters=selected_structures
+            )
+
             # --- Read Model Usage Preferences from QSettings ---
-            settings = QSettings("rcverse", "ANPE_STUDIO") # Use the same org/app name as in ModelsPage
-            spacy_pref = settings.value("modelUsage/spacyModel", "(Auto-detect)")
-            benepar_pref = settings.value("modelUsage/beneparModel", "(Auto-detect)")
+            spacy_pref, benepar_pref = read_model_preferences()
             logging.debug(f"Read raw model usage preferences: spaCy='{spacy_pref}', Benepar='{benepar_pref}'") # Changed log message slightly
 
             # --- Validate Preferences Against Installed Models ---
@@ -907,24 +991,8 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'model_status') and self.model_status and 'benepar_models' in self.model_status:
                 installed_benepar_models = self.model_status['benepar_models']
 
-            validated_spacy_pref = None # Default to None (auto-detect)
-            if spacy_pref != "(Auto-detect)" and spacy_pref in installed_spacy_models:
-                validated_spacy_pref = spacy_pref
-                logging.debug(f"Using valid saved spaCy preference: {spacy_pref}")
-            elif spacy_pref != "(Auto-detect)":
-                 logging.warning(f"Saved spaCy preference '{spacy_pref}' not found in installed models {installed_spacy_models}. Falling back to auto-detect.")
-            else:
-                 logging.debug("SpaCy preference set to (Auto-detect).")
-
-
-            validated_benepar_pref = None # Default to None (auto-detect)
-            if benepar_pref != "(Auto-detect)" and benepar_pref in installed_benepar_models:
-                validated_benepar_pref = benepar_pref
-                logging.debug(f"Using valid saved Benepar preference: {benepar_pref}")
-            elif benepar_pref != "(Auto-detect)":
-                 logging.warning(f"Saved Benepar preference '{benepar_pref}' not found in installed models {installed_benepar_models}. Falling back to auto-detect.")
-            else:
-                 logging.debug("Benepar preference set to (Auto-detect).")
+            validated_spacy_pref = validate_model_preference(spacy_pref, installed_spacy_models, "spaCy")
+            validated_benepar_pref = validate_model_preference(benepar_pref, installed_benepar_models, "Benepar")
 
             config["spacy_model_preference"] = validated_spacy_pref
             config["benepar_model_preference"] = validated_benepar_pref
@@ -945,9 +1013,9 @@ class MainWindow(QMainWindow):
             return None
 
     def start_processing(self):
-        """Start the ANPE processing based on current UI settings and input."""
-        # --- Check and clear previous results first ---
-        if not self._confirm_and_clear_results():
+        """Queue an ANPE processing job based on current UI settings and input."""
+        # --- Check and clear previous results first (only when nothing else is queued) ---
+        if not self.job_queue.is_busy() and not self._confirm_and_clear_results():
             return # User cancelled clearing previous results
 
         # --- Gather configuration ---
@@ -955,144 +1023,210 @@ class MainWindow(QMainWindow):
         if config is None:
             # Error message already shown by apply_configuration
             return
-            
+        # Get preferences from the config dict (apply_configuration already handled None for Auto-detect)
+        spacy_pref = config.pop('spacy_model_preference', None)
+        benepar_pref = config.pop('benepar_model_preference', None)
+        priority = self.job_priority_combo.currentData()
+
         # 2. Get Input Data based on mode
         input_mode_index = self.input_stack.currentIndex()
         if input_mode_index == 0: # File Input Mode
+            if self.file_list_widget.is_scanning():
+                QMessageBox.information(self, "Scanning Directory",
+                                        "Files are still being added from a directory. Please wait for the scan to finish or stop it.")
+                return
             files = self.file_list_widget.get_files()
             if not files:
                 QMessageBox.warning(self, "No Input", "Please select at least one file.")
                 return
-            # 3. Run Batch Processing
-            log_message = f">>>> Processing {len(files)} files..."
-            self.log(log_message)
-            status_type = 'busy'
-            status_message = f"Processing {len(files)} files..."
-            # Pass message directly to run_batch_processing which will call status_bar.update_progress
-            # Get preferences from the config dict (apply_configuration already handled None for Auto-detect)
-            spacy_pref = config.pop('spacy_model_preference', None)
-            benepar_pref = config.pop('benepar_model_preference', None)
-            
-            self.run_batch_processing(files, config, spacy_pref, benepar_pref, initial_status_message=status_message)
+            job = Job(JOB_BATCH, config, self.include_metadata.isChecked(), self.include_nested.isChecked(),
+                      file_paths=files, spacy_model_preference=spacy_pref,
+                      benepar_model_preference=benepar_pref, priority=priority,
+                      input_bytes=self.file_list_widget.total_bytes)
+            self.log(f">>>> Queued {len(files)} files (job #{job.id})...")
+            self.file_list_widget.clear_files() # The job keeps its own copy of the inputs
 
         elif input_mode_index == 1: # Text Input Mode
             text_content = self.direct_text_input.toPlainText().strip()
             if not text_content:
                 QMessageBox.warning(self, "No Input", "Please enter text to process.")
                 return
-            # 3. Run Single Processing
-            self.log(">>>> Starting single text processing...")
-            status_type = 'busy'
-            status_message = "Processing text..."
-            # Get preferences from the config dict
-            spacy_pref = config.pop('spacy_model_preference', None)
-            benepar_pref = config.pop('benepar_model_preference', None)
-            self.run_single_processing(text_content, config, spacy_pref, benepar_pref, initial_status_message=status_message)
-
-    def run_single_processing(self, text_content: str, config: Dict[str, Any], 
-                              spacy_pref: Optional[str], benepar_pref: Optional[str], # Added prefs
-                              initial_status_message: str):
-        """Starts the background worker for processing a single text input."""
-        if hasattr(self, 'single_thread') and self.single_thread is not None and self.single_thread.isRunning():
-             QMessageBox.warning(self, "Processing Busy", 
-                                 "Another process is already running. Please wait.")
-             return
-            
-        self.results = None 
-        self.results_display_widget.clear_display() 
-        self.export_button.setEnabled(False) 
-        self.process_button.setEnabled(False) 
-        # Use the activity indicator for indeterminate processing
-        self.status_bar.update_progress(0, initial_status_message)
-        self.processing_error_occurred = False # Initialize error flag
-
-        # 1. Create Worker
-        self.worker = ExtractionWorker(
-            text_content=text_content, 
-            config=config, 
-            anpe_version=self.anpe_version,
-            include_nested=self.include_nested.isChecked(),
-            include_metadata=self.include_metadata.isChecked(),
-            spacy_model_preference=spacy_pref, # Pass preference
-            benepar_model_preference=benepar_pref # Pass preference
-        ) 
-        
-        # 2. Create Thread and Move Worker
-        self.single_thread = QThread() 
-        self.worker.moveToThread(self.single_thread)
-
-        # 3. Connect Signals
-        self.single_thread.started.connect(self.worker.run)
-        # --- Worker Signals ---
-        self.worker.signals.result.connect(self.handle_single_result)
-        self.worker.signals.error.connect(self.handle_error)
-        # Use partial to pass worker type identifier
-        finish_slot_single = functools.partial(self.processing_finished, worker_type='single')
-        self.worker.signals.finished.connect(finish_slot_single)
-        self.worker.signals.finished.connect(self.worker.deleteLater)
-        self.worker.signals.finished.connect(self.single_thread.quit)
-        # --- Thread Signals ---
-        self.single_thread.finished.connect(self.clear_single_thread_reference)
-        self.single_thread.finished.connect(self.single_thread.deleteLater)
-        
-        # 4. Start the Thread
-        logging.debug("MAIN: Starting single processing thread.")
-        self.single_thread.start()
-
-    def run_batch_processing(self, file_paths: List[str], config: Dict[str, Any], 
-                             spacy_pref: Optional[str], benepar_pref: Optional[str], # Added prefs
-                             initial_status_message: str):
-        """Starts the background worker for processing multiple files."""
-        if hasattr(self, 'batch_thread') and self.batch_thread is not None and self.batch_thread.isRunning():
-             QMessageBox.warning(self, "Processing Busy", 
-                                 "Another process is already running. Please wait.")
-             return
-
-        self.results = {} 
-        self.results_display_widget.clear_display() 
-        self.file_selector_combo.clear() 
+            job = Job(JOB_TEXT, config, self.include_metadata.isChecked(), self.include_nested.isChecked(),
+                      text=text_content, spacy_model_preference=spacy_pref,
+                      benepar_model_preference=benepar_pref, priority=priority)
+            self.log(f">>>> Queued text processing (job #{job.id})...")
+            self.direct_text_input.clear()
+        else:
+            return
+
+        if self.job_queue.running_count() >= self.job_queue.max_concurrent:
+            self.status_bar.showMessage(f"Job #{job.id} queued ({len(self.job_queue.queued_jobs()) + 1} waiting)",
+                                        3000, status_type='info')
+        self.job_queue.submit(job)
+
+    # --- Job Queue Signal Handlers ---
+
+    def _displayed_job(self) -> Optional[Job]:
+        """The job whose results are bound to the Output tab, if any."""
+        return self.job_queue.get(self._displayed_job_id) if self._displayed_job_id is not None else None
+
+    def _is_displayed(self, job: Job) -> bool:
+        """True if job's results are shown in the Output tab (watch jobs may append to the shown results)."""
+        return job.id == self._displayed_job_id or (job.results is not None and job.results is self.results)
+
+    @pyqtSlot(int)
+    def on_job_started(self, job_id: int):
+        """Set up a job's result containers and bind it to the Output tab if that is free."""
+        job = self.job_queue.get(job_id)
+        if job is None:
+            return
+        displayed = self._displayed_job()
+        aggregate = self.aggregate_frequencies.isChecked()
+        if job.kind == JOB_BATCH and job.from_watch and displayed is not None and displayed.kind == JOB_BATCH:
+            # Watch mode: append to the batch results currently shown
+            if displayed.results is None:
+                displayed.results = ResultSet(self.job_queue.result_store)
+            if displayed.aggregator is None and aggregate:
+                displayed.aggregator = NPFrequencyAggregator(normalization=self.aggregate_normalization_combo.currentText())
+                self.np_aggregator = displayed.aggregator
+            job.results = displayed.results
+            job.aggregator = displayed.aggregator
+            self.results = job.results
+            self.status_bar.update_progress(0, f"Watch: processing {len(job.file_paths)} file(s)...")
+            return
+
+        if job.kind == JOB_BATCH:
+            job.results = ResultSet(self.job_queue.result_store)
+            if aggregate:
+                job.aggregator = NPFrequencyAggregator(normalization=self.aggregate_normalization_combo.currentText())
+        if displayed is not None and displayed.state == STATE_RUNNING:
+            return # Output tab stays with the running job; this one can be shown from the Queue tab
+        self._bind_output_to_job(job)
+        if job.kind == JOB_BATCH:
+            self.status_bar.update_progress(0, f"Processing {len(job.file_paths)} files...")
+        else:
+            self.status_bar.update_progress(0, "Processing text...")
+
+    def _bind_output_to_job(self, job: Job):
+        """Show job's (possibly still incoming) results in the Output tab."""
+        self._displayed_job_id = job.id
+        self.results_display_widget.clear_display()
+        self.file_selector_combo.clear()
+        self._file_selector_paths.clear()
         self.file_selector_label.hide()
         self.file_selector_combo.hide()
-        self.export_button.setEnabled(False) 
-        self.process_button.setEnabled(False) 
-        # Use the pre-formatted message from start_processing for the initial update
-        self.status_bar.update_progress(0, initial_status_message )
-        self.processing_error_occurred = False # Initialize error flag
-
-        # 1. Create Worker
-        self.batch_worker = BatchWorker(
-            file_paths=file_paths, 
-            config=config, 
-            anpe_version=self.anpe_version,
-            include_nested=self.include_nested.isChecked(),
-            include_metadata=self.include_metadata.isChecked(),
-            spacy_model_preference=spacy_pref, # Pass preference
-            benepar_model_preference=benepar_pref # Pass preference
-        )
-        
-        # 2. Create Thread and Move Worker
-        self.batch_thread = QThread() 
-        self.batch_worker.moveToThread(self.batch_thread)
-
-        # 3. Connect Signals
-        self.batch_thread.started.connect(self.batch_worker.run)
-        # --- Worker Signals ---
-        self.batch_worker.signals.status_update.connect(self.update_status_message)
-        self.batch_worker.signals.progress.connect(self.update_batch_progress)
-        self.batch_worker.signals.file_result.connect(self.handle_batch_file_result)
-        self.batch_worker.signals.error.connect(self.handle_error)
-        # Use partial to pass worker type identifier
-        finish_slot_batch = functools.partial(self.processing_finished, worker_type='batch')
-        self.batch_worker.signals.finished.connect(finish_slot_batch)
-        self.batch_worker.signals.finished.connect(self.batch_worker.deleteLater)
-        self.batch_worker.signals.finished.connect(self.batch_thread.quit)
-        # --- Thread Signals ---
-        self.batch_thread.finished.connect(self.clear_batch_thread_reference)
-        self.batch_thread.finished.connect(self.batch_thread.deleteLater)
-
-        # 4. Start the Thread
-        logging.debug("MAIN: Starting batch processing thread.")
-        self.batch_thread.start() 
+        self.results = job.results
+        self.np_aggregator = job.aggregator
+        self.processing_error_occurred = job.error is not None
+        self.export_button.setEnabled(False)
+        if job.kind == JOB_TEXT:
+            if job.results is not None:
+                self.handle_single_result(job.results)
+        elif job.results:
+            self.handle_batch_file_results(job.results.handles())
+        if job.is_finished:
+            self.export_button.setEnabled(bool(self.results) and job.error is None)
+
+    @pyqtSlot(int)
+    def show_job_results(self, job_id: int):
+        """Show a job's results in the Output tab (from the Queue tab)."""
+        job = self.job_queue.get(job_id)
+        if job is None or job.results is None:
+            return
+        self._bind_output_to_job(job)
+        self.switch_to_output_tab()
+
+    @pyqtSlot(int, str)
+    def on_job_status(self, job_id: int, message: str):
+        job = self.job_queue.get(job_id)
+        if job is not None and self._is_displayed(job):
+            self.update_status_message(message)
+
+    @pyqtSlot(int, int)
+    def on_job_progress(self, job_id: int, percentage: int):
+        job = self.job_queue.get(job_id)
+        if job is not None and self._is_displayed(job):
+            self.update_batch_progress(percentage, "")
+
+    @pyqtSlot(int, dict)
+    def on_job_text_result(self, job_id: int, result_data: Dict[str, Any]):
+        job = self.job_queue.get(job_id)
+        if job is None:
+            return
+        if self._is_displayed(job):
+            self.handle_single_result(result_data)
+        else:
+            self.log(f"Job #{job.id}: text processing completed.")
+
+    @pyqtSlot(int, list)
+    def on_job_file_results(self, job_id: int, handles: List[Tuple[str, int]]):
+        job = self.job_queue.get(job_id)
+        if job is None:
+            return
+        if job.from_watch:
+            for file_path, result_id in handles:
+                if "error" not in (self.job_queue.result_store.get(result_id) or {}):
+                    self.file_list_widget.mark_watch_file_processed(file_path)
+        if self._is_displayed(job):
+            self.handle_batch_file_results(handles)
+        else:
+            self.log("\n".join(f"Job #{job.id}: processed file: {display_name(file_path)}" for file_path, _ in handles))
+
+    @pyqtSlot(int, str)
+    def on_job_error(self, job_id: int, error_message: str):
+        job = self.job_queue.get(job_id)
+        if job is None:
+            return
+        if self._is_displayed(job):
+            self.handle_error(error_message)
+        else:
+            logging.error(f"Processing Error (job #{job.id}): {error_message}")
+            QMessageBox.warning(self, "Processing Error", f"Job #{job.id} ({job.label}) failed: {error_message}")
+
+    @pyqtSlot(float)
+    def on_throughput_measured(self, bytes_per_second: float):
+        """Keep the file list's time estimates in line with the measured throughput."""
+        save_throughput(bytes_per_second)
+        self.file_list_widget.set_throughput(bytes_per_second)
+
+    @pyqtSlot(int)
+    def on_job_finished(self, job_id: int):
+        """Handle UI updates when a job finishes, is cancelled or fails."""
+        job = self.job_queue.get(job_id)
+        if job is None:
+            return
+        if job.from_watch or job.from_launch:
+            self.file_list_widget.remove_files(job.file_paths)
+        if not self._is_displayed(job):
+            if not self.job_queue.is_busy():
+                self.status_bar.stop_progress("All queued jobs complete", status_type='success')
+            return
+
+        logging.debug(f"Updating UI after job #{job.id} finished ({job.state}).")
+        # Determine final message and status type
+        status_type = 'success' # Default to success
+        final_message = "Processing complete"
+        if job.from_watch:
+            final_message = f"Watch: processed {job.files_done} file(s)"
+        if job.state == STATE_CANCELLED:
+            status_type = 'info'
+            final_message = "Processing cancelled"
+        elif self.processing_error_occurred:
+            status_type = 'error'
+            final_message = "Processing finished with errors"
+        elif self.results is None or (isinstance(self.results, (dict, ResultSet)) and not self.results):
+            status_type = 'info' # Or 'warning'? 'info' seems okay.
+            final_message = "Processing finished (No results)"
+        self.status_bar.stop_progress(final_message, status_type=status_type)
+
+        # Enable export only if results exist AND no error occurred
+        can_export = bool(self.results) and not self.processing_error_occurred
+        self.export_button.setEnabled(can_export)
+
+        # Switch to output tab only on successful completion with results (not for background watch runs)
+        if can_export and not job.from_watch and job.state != STATE_CANCELLED:
+            self.switch_to_output_tab()
+        logging.debug("Processing finished UI updates complete.")
 
     # --- Worker Signal Handlers ---
 
@@ -1118,7 +1252,7 @@ class MainWindow(QMainWindow):
 
     @pyqtSlot(dict) # Receives result dictionary for one run
     def handle_single_result(self, result_data: Dict[str, Any]):
-        """Handle the result from the ExtractionWorker (single text)."""
+        """Show the result of a text job in the Output tab."""
         self.results = result_data # Store the complete result
         # Pass the current state of the metadata checkbox
         metadata_is_on = self.include_metadata.isChecked()
@@ -1132,24 +1266,35 @@ class MainWindow(QMainWindow):
             logging.warning("ANPE core returned no 'results' data or 'results' key was missing for display (single text).")
             self.results_display_widget.clear_display() # Clear display if no valid data
 
-        self.export_button.setEnabled(True) # Enable export (processing_finished will re-evaluate based on self.results)
+        self.export_button.setEnabled(True) # Enable export (on_job_finished will re-evaluate based on self.results)
         # Keep INFO for completion message
         self.log("Single text processing completed.")
-        # processing_finished will handle status bar final message
-
-    @pyqtSlot(str, dict) # Receives file path and its result dictionary
-    def handle_batch_file_result(self, file_path: str, result_data: Dict[str, Any]):
-        """Handle the result for a single file from the BatchWorker."""
-        if self.results is None: self.results = {} # Ensure results dict exists
-        
-        self.results[file_path] = result_data # Store full result for this file (for export)
-        
-        # Populate combo box as results come in
-        base_name = os.path.basename(file_path)
-        self.file_selector_combo.addItem(base_name, file_path) # Display name, store full path
-        
-        # If this is the first result, display it and show the combo box
-        if self.file_selector_combo.count() == 1: # Check if it's the first item added to combo
+        # on_job_finished will handle status bar final message
+
+    @pyqtSlot(list) # Receives [(file path, result id), ...]
+    def handle_batch_file_results(self, handles: List[Tuple[str, int]]):
+        """Show a batch of file results of the displayed batch job (held in the job queue's result store)."""
+        was_empty = self.file_selector_combo.count() == 0
+        # Populate combo box as results come in, one bulk insert per batch
+        new_paths = []
+        for file_path, _ in handles:
+            if file_path not in self._file_selector_paths: # Changed watched files are re-processed
+                self._file_selector_paths.add(file_path)
+                new_paths.append(file_path)
+        if new_paths:
+            first_row = self.file_selector_combo.count()
+            self.file_selector_combo.blockSignals(True) # The first item is displayed below
+            # Display names (member name for archive inputs, "archive!member"), full paths as item data
+            self.file_selector_combo.addItems([display_name(file_path) for file_path in new_paths])
+            for row, file_path in enumerate(new_paths, first_row):
+                self.file_selector_combo.setItemData(row, file_path)
+            self.file_selector_combo.blockSignals(False)
+        
+        # If these are the first results, display the first one and show the combo box
+        if was_empty and self.file_selector_combo.count() > 0:
+            file_path, result_id = handles[0] # The combo's first item
+            result_data = self.job_queue.result_store.get(result_id) or {}
+            base_name = display_name(file_path)
             # Pass the current state of the metadata checkbox
             metadata_is_on = self.include_metadata.isChecked()
             
@@ -1170,13 +1315,13 @@ class MainWindow(QMainWindow):
             self.file_selector_label.show()
             self.file_selector_combo.show()
              
-        # Keep INFO for individual file completion
-        self.log(f"Processed file: {base_name}")
-        # Status bar updated via update_batch_progress signal
+        # Keep INFO for individual file completion (one log record per batch)
+        self.log("\n".join(f"Processed file: {display_name(file_path)}" for file_path, _ in handles))
+        # Status bar updated via on_job_progress
 
     @pyqtSlot(str) # Receives error message string
     def handle_error(self, error_message: str):
-        """Handle errors reported by workers."""
+        """Handle errors reported by the displayed job."""
         logging.error(f"Processing Error: {error_message}") 
         status_type = 'error'
         # Format message with icon before passing to stop_progress
@@ -1184,81 +1329,84 @@ class MainWindow(QMainWindow):
         self.status_bar.stop_progress(formatted_message, status_type=status_type)
         QMessageBox.warning(self, "Processing Error", f"An error occurred: {error_message}")
         self.processing_error_occurred = True # Set error flag
-        # Re-enable process button even on error? (Keep current behavior)
-        # self.process_button.setEnabled(True) 
 
-    @pyqtSlot(str)
-    def processing_finished(self, worker_type: str):
-        """Handle UI updates when a worker finishes, identified by worker_type."""
-        logging.debug(f"Worker finished signal received for worker type: {worker_type}")
-        
-        worker_cleared = False
-
-        # Clear the appropriate worker reference based on the argument
-        if worker_type == 'single' and self.worker is not None:
-            logging.debug("Clearing reference for Single worker.")
-            self.worker = None
-            worker_cleared = True
-        elif worker_type == 'batch' and self.batch_worker is not None:
-            logging.debug("Clearing reference for Batch worker.")
-            self.batch_worker = None
-            worker_cleared = True
-        else:
-            # This can happen if signal arrives after reference is already cleared
-            logging.debug(f"processing_finished ({worker_type}): Worker reference already None. Ignoring UI update.")
-            return
-
-        # --- Proceed with UI updates only if we cleared a worker reference --- 
-        if worker_cleared:
-            logging.debug("Updating UI after processing finished.")
-            
-            # Determine final message and status type
-            status_type = 'success' # Default to success
-            final_message_text = "Processing complete"
-            if self.processing_error_occurred: 
-                 status_type = 'error'
-                 final_message_text = "Processing finished with errors"
-            elif self.results is None or (isinstance(self.results, dict) and not self.results):
-                 status_type = 'info' # Or 'warning'? 'info' seems okay.
-                 final_message_text = "Processing finished (No results)"
-                
-            # Format message with icon
-            final_message = final_message_text # Removed icon
-            
-            self.status_bar.stop_progress(final_message, status_type=status_type)
-            
-            # Enable export only if results exist AND no error occurred
-            can_export = self.results is not None and not self.processing_error_occurred
-            self.export_button.setEnabled(can_export)
-            
-            # Switch to output tab only on successful completion with results
-            if can_export: # Use can_export flag which implies success and results exist
-                 self.switch_to_output_tab()
-            
-            # Re-enable the process button if the extractor is ready
-            if hasattr(self, 'process_button'):
-                self.process_button.setEnabled(self.extractor_ready)
-            
-            # --- Auto-clear input fields after processing ---
-            self.file_list_widget.clear_files()
-            self.direct_text_input.clear()
-            logging.debug("Input fields cleared automatically.")
-            
-            logging.debug("Processing finished UI updates complete.")
+    # --- Watch Mode ---
 
-    @pyqtSlot()
-    def clear_single_thread_reference(self):
-        """Slot called when the single processing thread finishes."""
-        logging.debug("Single processing thread finished. Clearing reference.")
-        if hasattr(self, 'single_thread'):
-            self.single_thread = None
-            
-    @pyqtSlot()
-    def clear_batch_thread_reference(self):
-        """Slot called when the batch processing thread finishes."""
-        logging.debug("Batch processing thread finished. Clearing reference.")
-        if hasattr(self, 'batch_thread'):
-            self.batch_thread = None
+    @pyqtSlot(list)
+    def handle_watch_files(self, file_paths: List[str]):
+        """Queue files reported by watch mode as an incremental batch appended to the current results."""
+        if not self.extractor_ready:
+            logging.warning("Watch: models are not ready; detected files stay in the list until processed manually.")
+            return
+        config = self.apply_configuration()
+        if config is None:
+            return
+        spacy_pref = config.pop('spacy_model_preference', None)
+        benepar_pref = config.pop('benepar_model_preference', None)
+        job = Job(JOB_BATCH, config, self.include_metadata.isChecked(), self.include_nested.isChecked(),
+                  file_paths=file_paths, spacy_model_preference=spacy_pref,
+                  benepar_model_preference=benepar_pref, priority=PRIORITY_NORMAL,
+                  label=f"Watch: {len(file_paths)} file(s)", from_watch=True)
+        self.log(f">>>> Watch: queued {len(file_paths)} new or changed file(s) (job #{job.id})...")
+        self.job_queue.submit(job)
+
+    # --- Launch Inputs (command line and single-instance forwarding) ---
+
+    @pyqtSlot(list, list)
+    def open_launch_inputs(self, file_paths: List[str], texts: List[str]):
+        """
+        Bring the window forward and queue inputs passed on the command line, also
+        by a later launch forwarded to this instance: files are listed in the file
+        list and processed as one batch, each text as a text job. Directories are
+        scanned in the background and queued as a batch each when their scan
+        finishes (on_launch_directory_scanned).
+        """
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        if not file_paths and not texts:
+            return
+        added = self.file_list_widget.add_paths(file_paths) if file_paths else []
+        self.input_stack.setCurrentIndex(0 if file_paths else 1)
+        self._queue_launch_inputs(added, texts, f"Opened: {len(added)} file(s)",
+                                  sum(os.path.getsize(path) for path in added if os.path.isfile(path)))
+
+    @pyqtSlot(str, list, 'qint64')
+    def on_launch_directory_scanned(self, dir_path: str, file_paths: List[str], total_bytes: int):
+        """Queue the files a directory from the command line (or a forwarded launch) added to the list."""
+        label = f"Opened: {len(file_paths)} file(s) from {os.path.basename(dir_path.rstrip(os.sep)) or dir_path}"
+        self._queue_launch_inputs(file_paths, [], label, total_bytes)
+
+    def _queue_launch_inputs(self, added: List[str], texts: List[str], label: str, input_bytes: int):
+        """Submit launch inputs: the listed files as one batch job (label, input_bytes), each text as a text job."""
+        if not added and not texts:
+            return
+        if not self.extractor_ready:
+            # Same as watch mode: listed files wait for the user; texts go to the text input
+            logging.warning("Launch inputs: models are not ready; inputs stay in the input area until processed manually.")
+            for text in texts:
+                self.direct_text_input.append(text)
+            return
+        config = self.apply_configuration()
+        if config is None:
+            return
+        spacy_pref = config.pop('spacy_model_preference', None)
+        benepar_pref = config.pop('benepar_model_preference', None)
+        jobs = []
+        if added:
+            jobs.append(Job(JOB_BATCH, dict(config), self.include_metadata.isChecked(), self.include_nested.isChecked(),
+                            file_paths=added, spacy_model_preference=spacy_pref,
+                            benepar_model_preference=benepar_pref, priority=PRIORITY_NORMAL,
+                            label=label, from_launch=True,
+                            input_bytes=input_bytes))
+        for text in texts:
+            jobs.append(Job(JOB_TEXT, dict(config), self.include_metadata.isChecked(), self.include_nested.isChecked(),
+                            text=text, spacy_model_preference=spacy_pref,
+                            benepar_model_preference=benepar_pref, priority=PRIORITY_NORMAL, from_launch=True))
+        for job in jobs:
+            self.log(f">>>> Opened from launch: queued {job.label} (job #{job.id})...")
+            self.job_queue.submit(job)
 
     # --- Output Tab Logic ---
 
@@ -1266,7 +1414,7 @@ class MainWindow(QMainWindow):
     def display_selected_file_result(self):
         """Display the results for the file selected in the combo box (batch mode)."""
         selected_file_path = self.file_selector_combo.currentData() # Get stored full path
-        if selected_file_path and isinstance(self.results, dict) and selected_file_path in self.results:           
+        if selected_file_path and isinstance(self.results, ResultSet) and selected_file_path in self.results:           
             # Pass the current state of the metadata checkbox
             metadata_is_on = self.include_metadata.isChecked()
             
@@ -1303,6 +1451,8 @@ class MainWindow(QMainWindow):
                 return
             
         export_format = self.export_format_combo.currentText()
+        compression = self.export_compression_combo.currentText()
+        compression_level = self.export_compression_level_spin.value() if compression in COMPRESSION_LEVELS else None
         # Get the optional prefix
         filename_prefix = self.export_filename_prefix_edit.text().strip() 
         
@@ -1310,44 +1460,58 @@ class MainWindow(QMainWindow):
         timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Keep INFO for start of export
-        logging.info(f"Attempting export. Format: {export_format}, Dir: {export_dir}, Prefix: '{filename_prefix}'")
+        logging.info(f"Attempting export. Format: {export_format}, Compression: {compression} (level {compression_level}), Dir: {export_dir}, Prefix: '{filename_prefix}'")
 
         try:
-            from anpe.utils.export import ANPEExporter # Import here to avoid top-level dependency if export not used
+            from anpe_studio.export_utils import CompressedExporter # Streams through gzip/zstd if selected
             from pathlib import Path # Ensure Path is imported
 
-            exporter = ANPEExporter()
+            exporter = CompressedExporter(compression=compression, level=compression_level)
             
             export_successful = False
             message = "" # Initialize message
 
-            # Check if results are from batch processing (dict of file_path: result_data)
+            # Check if results are from batch processing (ResultSet of file_path: result_data)
             # or single processing (single result_data dict)
-            if isinstance(self.results, dict) and all(isinstance(k, str) and isinstance(v, dict) for k, v in self.results.items()):
+            if isinstance(self.results, ResultSet):
                 # Batch results: keys are file paths
                 num_files = len(self.results)
                 logging.info(f"Exporting batch results for {num_files} files.")
                 
                 exported_filenames = [] # Keep track of generated names for the message
+                used_stems = set() # Inputs with the same name (e.g. x.txt in two directories) get a counter
 
-                # Use unified naming based on input files + prefix + timestamp
+                # Use unified naming based on input files + prefix + timestamp (results are read from the store one by one)
                 for file_path, result_data in self.results.items():
-                    base_name = Path(file_path).stem 
-                    # Construct filename: [prefix_]<stem>_anpe_results_<timestamp>.<format>
-                    if filename_prefix:
-                        output_filename = f"{filename_prefix}_{base_name}_anpe_results_{timestamp_str}.{export_format}"
-                    else:
-                        output_filename = f"{base_name}_anpe_results_{timestamp_str}.{export_format}"
+                    # [prefix_]<stem>_anpe_results_<timestamp>.<format>; archive members: archive stem + member path
+                    output_filename = batch_export_filename(file_path, filename_prefix, timestamp_str,
+                                                            export_format, used_stems)
                         
                     full_export_path = os.path.join(export_dir, output_filename)
                     logging.debug(f"Exporting '{file_path}' results to '{full_export_path}'")
                     # TODO: Add check for file overwrite here? (See suggestions)
-                    exporter.export(result_data, format=export_format, output_filepath=full_export_path)
-                    exported_filenames.append(output_filename)
+                    with tracing.span("export", "export", file=output_filename):
+                        exported_path = exporter.export(result_data, format=export_format, output_filepath=full_export_path)
+                    exported_filenames.append(os.path.basename(exported_path))
 
                 export_successful = True
                 # Consider showing first few filenames if list is long?
                 message = f"Results for {num_files} files exported successfully to {export_dir}" 
+
+                # Corpus-level frequency table (if aggregation was enabled for this batch)
+                if self.np_aggregator is not None and not self.np_aggregator.is_empty():
+                    # Construct filename: [prefix_]anpe_np_frequencies_<timestamp>.<csv|json>
+                    table_format = "json" if export_format == "json" else "csv"
+                    if filename_prefix:
+                        table_filename = f"{filename_prefix}_anpe_np_frequencies_{timestamp_str}.{table_format}"
+                    else:
+                        table_filename = f"anpe_np_frequencies_{timestamp_str}.{table_format}"
+                    table_path = os.path.join(export_dir, table_filename)
+                    if table_format == "json":
+                        table_path = self.np_aggregator.export_json(table_path, compression, compression_level)
+                    else:
+                        table_path = self.np_aggregator.export_csv(table_path, compression, compression_level)
+                    message += f"\nNP frequency table: {os.path.basename(table_path)}"
                 
             elif isinstance(self.results, dict) and 'results' in self.results:
                 # Single text result (has 'results' key)
@@ -1363,10 +1527,11 @@ class MainWindow(QMainWindow):
                 
                 logging.debug(f"Exporting single text result to '{full_export_path}'")
                 # TODO: Add check for file overwrite here? (See suggestions)
-                exporter.export(self.results, format=export_format, output_filepath=full_export_path)
+                with tracing.span("export", "export", file=output_filename):
+                    exported_path = exporter.export(self.results, format=export_format, output_filepath=full_export_path)
                 
                 export_successful = True
-                message = f"Results exported successfully to {full_export_path}"
+                message = f"Results exported successfully to {exported_path}"
             else:
                 # Unknown results format
                  logging.error(f"Cannot export. Unknown results format: {type(self.results)}")
@@ -1423,11 +1588,14 @@ class MainWindow(QMainWindow):
         # Clear results area and stored results using the new widget
         self.results_display_widget.clear_display() 
         self.results = None
+        self._displayed_job_id = None
+        self._reset_np_aggregator()
         
         # Hide file selector, disable export
         self.file_selector_label.hide()
         self.file_selector_combo.hide()
         self.file_selector_combo.clear()
+        self._file_selector_paths.clear()
         self.export_button.setEnabled(False)
         
         # Reset tabs and input mode to default (File Input on Input tab)
@@ -1455,6 +1623,8 @@ class MainWindow(QMainWindow):
         self.include_nested.setChecked(False)
         self.include_metadata.setChecked(False)
         self.newline_breaks.setChecked(False)
+        self.aggregate_frequencies.setChecked(False)
+        self.aggregate_normalization_combo.setCurrentText(NORMALIZE_LOWER)
         
         # Reset General Filtering Options
         self.min_length_check.setChecked(False)
@@ -1476,13 +1646,17 @@ class MainWindow(QMainWindow):
 
     # --- Utility and Helper Methods ---
 
+    def _reset_np_aggregator(self):
+        """Detach the displayed corpus NP frequency counters (they are owned and closed by their job)."""
+        self.np_aggregator = None
+
     def create_log_panel(self) -> EnhancedLogPanel:
         """Create the log panel and configure the QtLogHandler."""
         log_widget = EnhancedLogPanel()
         
         # Store handler instance for removal on close
         self.qt_log_handler_instance = QtLogHandler()
-        self.qt_log_handler_instance.log_signal.connect(log_widget.add_log_entry)
+        self.qt_log_handler_instance.log_batch.connect(log_widget.add_log_entries) # Batched every few tens of ms
 
         # Define a simpler log format without duplicate level names
         log_format = '%(message)s'
@@ -1537,12 +1711,17 @@ class MainWindow(QMainWindow):
     def open_settings(self):
         """Opens the settings dialog, passing the initial model status."""
         logging.debug(f"Opening Settings Dialog. Passing initial status: {self.model_status}") # LOGGING
-        # Pass the stored initial status to the dialog
-        dialog = SettingsDialog(self, model_status=self.model_status)
-        dialog.models_changed.connect(self.on_models_changed)
-        dialog.model_usage_changed.connect(self.on_model_usage_preference_changed)
-        dialog.restart_application_requested.connect(self.handle_app_restart_request) # ADDED
-        dialog.exec()
+        if self._settings_dialog is None: # Built on first use, then reused
+            from anpe_studio.widgets.settings_dialog import SettingsDialog # Loads the ANPE model utilities, spaCy and NLTK
+            # Pass the stored initial status to the dialog
+            self._settings_dialog = SettingsDialog(self, model_status=self.model_status)
+            self._settings_dialog.models_changed.connect(self.on_models_changed)
+            self._settings_dialog.model_usage_changed.connect(self.on_model_usage_preference_changed)
+            self._settings_dialog.tracing_changed.connect(self.on_tracing_changed)
+            self._settings_dialog.restart_application_requested.connect(self.handle_app_restart_request) # ADDED
+        else:
+            self._settings_dialog.prepare_to_show(self.model_status)
+        self._settings_dialog.exec()
 
     @pyqtSlot() # ADDED
     def handle_app_restart_request(self): # ADDED
@@ -1581,6 +1760,7 @@ class MainWindow(QMainWindow):
         """Slot called when models might have changed via the management dialog."""
         logging.info(f"Models changed via dialog. Received status data: {status_dict}")
         self.status_bar.showMessage("Model status updated...", 3000, status_type='info')
+        self.job_queue.clear_extractors() # Warm extractors may use removed or outdated models
         
         # Store the received model status
         self.model_status = status_dict
@@ -1614,6 +1794,52 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'model_manage_button'):
             self.model_manage_button.setEnabled(True)
 
+    def _start_model_verification(self):
+        """Discover the installed models in the background to verify a status taken from the model cache."""
+        self._cached_model_status = self.model_status
+        self.model_verify_worker = ModelStatusChecker(use_cache=False) # Also refreshes the cache
+        self.model_verify_thread = QThread(self)
+        self.model_verify_worker.moveToThread(self.model_verify_thread)
+        self.model_verify_thread.started.connect(self.model_verify_worker.run)
+        self.model_verify_worker.status_checked.connect(self.on_model_verification_finished)
+        self.model_verify_worker.error_occurred.connect(self.on_model_verification_error)
+        self.model_verify_worker.status_checked.connect(self.model_verify_thread.quit)
+        self.model_verify_worker.error_occurred.connect(self.model_verify_thread.quit)
+        self.model_verify_thread.finished.connect(self.model_verify_worker.deleteLater)
+        self.model_verify_thread.finished.connect(self.model_verify_thread.deleteLater)
+        self.model_verify_thread.finished.connect(self._clear_model_verification)
+        self.model_verify_thread.start()
+        logging.debug("Verifying the cached model status in the background.")
+
+    @pyqtSlot(dict)
+    def on_model_verification_finished(self, status_dict):
+        """Apply the verified model status if it differs from the cached one the UI shows."""
+        cached_status = self._cached_model_status
+        self._cached_model_status = None
+        if self.model_status is not cached_status:
+            logging.debug("Model verification result ignored: the model status changed meanwhile.")
+            return
+        unchanged = (all(sorted(status_dict.get(key) or []) == sorted(cached_status.get(key) or [])
+                         for key in ('spacy_models', 'benepar_models'))
+                     and status_dict.get('error') == cached_status.get('error'))
+        if unchanged:
+            logging.debug("Cached model status verified.")
+            self.model_status = status_dict # Same models; no longer marked as cached
+            return
+        logging.info(f"Installed models differ from the cached status; updating: {status_dict}")
+        self.on_models_changed(status_dict)
+
+    @pyqtSlot(str)
+    def on_model_verification_error(self, error_msg):
+        """The cached status could not be verified (e.g. anpe fails to import now)."""
+        logging.error(f"Model status verification failed: {error_msg}")
+        self.on_model_verification_finished({'spacy_models': [], 'benepar_models': [], 'error': error_msg})
+
+    @pyqtSlot()
+    def _clear_model_verification(self):
+        self.model_verify_worker = None
+        self.model_verify_thread = None
+
     @pyqtSlot(dict) # New slot for successful status check 
     def on_status_check_finished(self, status_dict):
         """Handle successful completion of the background status check."""
@@ -1762,8 +1988,34 @@ class MainWindow(QMainWindow):
     @pyqtSlot()
     def on_model_usage_preference_changed(self):
         """Slot called when the model usage preference is changed in the SettingsDialog."""
-        # For now, just log this event. The actual preference is read during apply_configuration.
+        # The actual preference is read during apply_configuration.
         logging.info("Model usage preference changed signal received.")
+        self.job_queue.clear_extractors() # Release models that are no longer preferred
+        self.job_queue.set_out_of_process(read_out_of_process_preference())
+
+    @pyqtSlot(bool)
+    def on_tracing_changed(self, enabled: bool):
+        """Start recording a performance trace, or stop and save it."""
+        if enabled == tracing.is_enabled():
+            return
+        if enabled:
+            tracing.clear()
+            tracing.set_enabled(True)
+            logging.info("Performance tracing started. The trace is saved when tracing is switched off or Studio closes.")
+        else:
+            tracing.set_enabled(False)
+            self._write_trace()
+
+    def _write_trace(self):
+        """Save the recorded trace events to a timestamped file in the traces directory."""
+        if tracing.event_count() == 0:
+            return
+        trace_path = get_app_data_dir() / TRACE_DIR_NAME / f"anpe_studio_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            tracing.write_trace(str(trace_path))
+            logging.info(f"Performance trace saved to {trace_path} (open it in chrome://tracing or ui.perfetto.dev).")
+        except OSError as e:
+            logging.error(f"Could not save performance trace: {e}")
 
     def closeEvent(self, event):
         """Handle the main window closing."""
@@ -1781,57 +2033,41 @@ class MainWindow(QMainWindow):
                 else:
                     logging.debug("Initializer thread finished.")
 
-            # Stop Single Processing Worker Thread (and worker if it exists)
-            if hasattr(self, 'single_thread') and self.single_thread is not None:
-                if self.single_thread.isRunning():
-                    logging.debug("Quitting Single Processing thread...")
-                    # If worker still exists, try asking it to stop first? (May not be necessary)
-                    # if self.worker: self.worker.cancel() # Example 
-                    self.single_thread.quit()
-                    if not self.single_thread.wait(500):
-                        logging.warning("Single Processing thread did not finish cleanly.")
-                    else:
-                        logging.debug("Single Processing thread finished.")
-                # Regardless of running, clear reference if it exists
-                self.single_thread = None 
-            # Also clear worker ref just in case
-            if hasattr(self, 'worker') and self.worker is not None:
-                 logging.debug("Clearing dangling worker reference on close.")
-                 self.worker = None
-
-            # Stop Batch Processing Worker Thread (and worker if it exists)
-            if hasattr(self, 'batch_thread') and self.batch_thread is not None:
-                if self.batch_thread.isRunning():
-                    logging.debug("Quitting Batch Processing thread...")
-                    if self.batch_worker: # Try to signal worker cancellation
-                        try: self.batch_worker.cancel() 
-                        except RuntimeError: pass # Ignore if worker already deleted
-                    self.batch_thread.quit()
-                    if not self.batch_thread.wait(500):
-                        logging.warning("Batch Processing thread did not finish cleanly.")
-                    else:
-                        logging.debug("Batch Processing thread finished.")
-                self.batch_thread = None
-            if hasattr(self, 'batch_worker') and self.batch_worker is not None:
-                 logging.debug("Clearing dangling batch_worker reference on close.")
-                 self.batch_worker = None
+            # Model verification cannot be interrupted mid-check; give it a moment to finish
+            if self.model_verify_thread is not None and self.model_verify_thread.isRunning():
+                self.model_verify_thread.quit()
+                if not self.model_verify_thread.wait(3000):
+                    logging.warning("Model verification thread did not finish cleanly.")
+
+            # Cancel queued jobs and stop running job threads
+            self.job_queue.shutdown()
+            if tracing.is_enabled():
+                self._write_trace()
 
         except RuntimeError as e:
              logging.error(f"RuntimeError stopping threads during close (likely already deleted): {e}")
         except Exception as e:
             logging.error(f"General error stopping threads during close: {e}", exc_info=True)
 
+        # On-disk spill files of NP frequency aggregation were removed by the job queue shutdown
+        self._reset_np_aggregator()
+        # Persist watch state (unprocessed files are picked up again next session)
+        self.file_list_widget.stop_watching()
+        self.file_list_widget.stop_scan(wait=True)
+
         # 2. Remove the log handler 
         if hasattr(self, 'qt_log_handler_instance') and self.qt_log_handler_instance:
             logging.debug("Removing log handler...")
             try:
                 logging.getLogger().removeHandler(self.qt_log_handler_instance)
+                self.qt_log_handler_instance.close() # Stops its flush timer
                 self.qt_log_handler_instance = None # Clear the reference
                 logging.info("Log handler removed.")
             except Exception as e:
                 logging.error(f"Error removing log handler: {e}", exc_info=True)
         else:
             logging.debug("Log handler not found or already removed.")
+        self.log_panel.log_model.close() # Deletes the log spill files
 
         # 3. Accept the event to close the window
         logging.info("Accepting close event.")
@@ -1854,8 +2090,11 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            # Create and execute the custom dialog, passing both versions
-            dialog = HelpDialog(help_file_path, GUI_VERSION, self.anpe_version, self) # Pass the correct path object
+            if self._help_dialog is None: # Built on first use, then reused
+                from anpe_studio.widgets.help_dialog import HelpDialog # Imported on first use, like the settings dialog
+                # Create the custom dialog, passing both versions
+                self._help_dialog = HelpDialog(help_file_path, GUI_VERSION, self.anpe_version, self) # Pass the correct path object
+            dialog = self._help_dialog
 
             # If an anchor is provided, try to navigate after the dialog is shown
             if anchor:
@@ -1953,9 +2192,12 @@ class MainWindow(QMainWindow):
         logging.info("Clearing previous results before new processing run.")
         self.results_display_widget.clear_display()
         self.results = None
+        self._displayed_job_id = None
+        self._reset_np_aggregator()
         self.file_selector_label.hide()
         self.file_selector_combo.hide()
         self.file_selector_combo.clear()
+        self._file_selector_paths.clear()
         self.export_button.setEnabled(False)
         # Optional: Reset status bar here if desired
         # self.status_bar.showMessage("Ready", status_type='ready')
@@ -0,0 +1,142 @@
+"""
+On-disk cache of the installed spaCy and Benepar models.
+
+Discovering the models is slow: anpe's model finder loads every known spaCy
+model to check that it works. The cache keeps the last discovered lists
+together with a fingerprint of the places models are installed to: the
+names, mtimes and sizes of the *.dist-info / *.egg-info entries of the
+site-packages directories and of the entries in the NLTK data 'models'
+directories. Computing the fingerprint takes a directory listing and one
+stat per entry, so startup can use the cached lists at once when it matches
+and verify them in the background. This module must not import PyQt.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import site
+import sys
+from typing import Callable, List, Optional, Tuple
+
+from anpe_studio.config_utils import get_app_data_dir
+
+CACHE_FILE_NAME = "model_cache.json"
+CACHE_VERSION = 1 # Bump when the cache layout or the fingerprint inputs change
+DIST_SUFFIXES = (".dist-info", ".egg-info")
+
+
+def site_package_dirs() -> List[str]:
+    """Existing site-packages directories of this interpreter (global, user and on sys.path)."""
+    candidates = []
+    try:
+        candidates.extend(site.getsitepackages())
+    except AttributeError: # Old virtualenv site modules
+        pass
+    try:
+        candidates.append(site.getusersitepackages())
+    except AttributeError:
+        pass
+    candidates.extend(entry for entry in sys.path if os.path.basename(entry) in ("site-packages", "dist-packages"))
+    dirs = []
+    for candidate in candidates:
+        path = os.path.abspath(candidate)
+        if path not in dirs and os.path.isdir(path):
+            dirs.append(path)
+    return dirs
+
+
+def nltk_data_dirs() -> List[str]:
+    """
+    The directories nltk.data.path lists by default (NLTK_DATA, ~/nltk_data and
+    the platform locations), worked out without importing NLTK.
+    """
+    dirs = [path for path in os.environ.get("NLTK_DATA", "").split(os.pathsep) if path]
+    dirs.append(os.path.join(os.path.expanduser("~"), "nltk_data"))
+    dirs.extend(os.path.join(sys.prefix, *parts) for parts in (("nltk_data",), ("share", "nltk_data"), ("lib", "nltk_data")))
+    if sys.platform.startswith("win"):
+        dirs.extend([os.path.join(os.environ.get("APPDATA", "C:\\"), "nltk_data"),
+                     r"C:\nltk_data", r"D:\nltk_data", r"E:\nltk_data"])
+    else:
+        dirs.extend(["/usr/share/nltk_data", "/usr/local/share/nltk_data", "/usr/lib/nltk_data", "/usr/local/lib/nltk_data"])
+    return list(dict.fromkeys(dirs))
+
+
+def _stat_entries(directory: str, suffixes: Optional[Tuple[str, ...]] = None) -> List[Tuple[str, int, int]]:
+    """(name, mtime_ns, size) of the directory itself and of its (matching) entries."""
+    try:
+        stat = os.stat(directory)
+        entries = [("", stat.st_mtime_ns, stat.st_size)]
+        with os.scandir(directory) as it:
+            for entry in it:
+                if suffixes is None or entry.name.endswith(suffixes):
+                    stat = entry.stat()
+                    entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        return [] # Missing or unreadable: contributes nothing (becoming readable changes the fingerprint)
+    entries.sort()
+    return entries
+
+
+def model_fingerprint() -> str:
+    """Hash of the interpreter and the model install locations; changes when a package or model is (un)installed."""
+    parts = [CACHE_VERSION, sys.executable, sys.version]
+    for directory in site_package_dirs():
+        parts.append([directory, _stat_entries(directory, DIST_SUFFIXES)])
+    for directory in nltk_data_dirs():
+        parts.append([directory, _stat_entries(os.path.join(directory, "models"))])
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def _cache_path() -> str:
+    return str(get_app_data_dir() / CACHE_FILE_NAME)
+
+
+def load_cached_models(fingerprint: str) -> Optional[Tuple[List[str], List[str]]]:
+    """(spaCy models, Benepar models) from the cache if it was saved with this fingerprint, else None."""
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("fingerprint") != fingerprint:
+        return None
+    spacy_models, benepar_models = cache.get("spacy_models"), cache.get("benepar_models")
+    if not isinstance(spacy_models, list) or not isinstance(benepar_models, list):
+        return None
+    return spacy_models, benepar_models
+
+
+def save_cached_models(fingerprint: str, spacy_models: List[str], benepar_models: List[str]):
+    """Store discovered models under fingerprint (failures are logged, not raised)."""
+    path = _cache_path()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "spacy_models": list(spacy_models),
+                       "benepar_models": list(benepar_models)}, f)
+        os.replace(temp_path, path) # Readers never see a partly written file
+    except OSError as e:
+        logging.warning(f"Could not save the model cache: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def discover_models(find_spacy: Optional[Callable[[], List[str]]] = None,
+                    find_benepar: Optional[Callable[[], List[str]]] = None) -> Tuple[List[str], List[str]]:
+    """
+    Run the spaCy and Benepar model finders concurrently and return their lists.
+    The finders default to anpe.utils.model_finder (imported here, so ImportError
+    propagates to the caller); exceptions from a finder propagate too.
+    """
+    from concurrent.futures import ThreadPoolExecutor # Not needed on the cached startup path
+    if find_spacy is None or find_benepar is None:
+        from anpe.utils.model_finder import find_installed_spacy_models, find_installed_benepar_models
+        find_spacy = find_spacy or find_installed_spacy_models
+        find_benepar = find_benepar or find_installed_benepar_models
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="model_finder") as executor:
+        spacy_future = executor.submit(find_spacy)
+        benepar_future = executor.submit(find_benepar)
+        return list(spacy_future.result()), list(benepar_future.result())
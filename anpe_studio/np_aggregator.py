@@ -0,0 +1,292 @@
+"""
+Corpus-level noun phrase frequency aggregation.
+
+Accumulates, across all files of a batch, how often each unique noun phrase
+occurs, in how many documents it occurs and which structures it most often
+has. Counters are keyed by a short hash of the normalized phrase and are
+bounded in memory: once they grow past a limit they are spilled to disk as
+sorted runs, which are merged when the table is exported. Export never
+revisits the corpus itself.
+"""
+
+import csv
+import hashlib
+import heapq
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections import Counter
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from anpe_studio.export_utils import COMPRESSION_NONE, get_compressed_path, open_text_stream
+
+# --- Normalization Modes ---
+NORMALIZE_NONE = "exact"
+NORMALIZE_LOWER = "lowercase"
+NORMALIZE_LEMMA = "lemma"
+NORMALIZATION_MODES = [NORMALIZE_NONE, NORMALIZE_LOWER, NORMALIZE_LEMMA]
+
+DEFAULT_MAX_ENTRIES = 200_000 # Unique phrases held in memory before spilling to disk
+DOMINANT_STRUCTURE_COUNT = 3  # Number of structures reported per phrase
+
+# In-memory entry layout: [noun_phrase, count, document_frequency, structure_counts]
+Entry = List[Any]
+
+
+class NPFrequencyAggregator:
+    """
+    Bounded-memory frequency table of noun phrases across a corpus.
+
+    Feed it one extraction result per document with add_result(), then write
+    the table sorted by frequency with export_csv() or export_json().
+    """
+
+    def __init__(self, normalization: str = NORMALIZE_LOWER,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 spill_dir: Optional[str] = None):
+        """
+        Args:
+            normalization: One of NORMALIZATION_MODES.
+            max_entries: Number of unique phrases kept in memory before a spill.
+            spill_dir: Parent directory for spill files (system temp dir if None).
+        """
+        if normalization not in NORMALIZATION_MODES:
+            raise ValueError(f"Invalid normalization: {normalization}. Must be one of {NORMALIZATION_MODES}")
+        self.normalization = normalization
+        self.max_entries = max(1, max_entries)
+        self._spill_parent = spill_dir
+        self._spill_dir: Optional[str] = None
+        self._spill_files: List[str] = []
+        self._entries: Dict[str, Entry] = {}
+        self._lemmatizer = None
+        self._lemma_unavailable = False
+        self.document_count = 0
+        self.phrase_count = 0
+
+    # --- Feeding ---
+
+    def add_result(self, result_data: Dict[str, Any]):
+        """Count all noun phrases (including nested ones) of one document's result."""
+        if not isinstance(result_data, dict) or "error" in result_data:
+            return # Failed files contribute nothing
+        items = result_data.get("results") or []
+
+        seen_in_document = set()
+        for np_item in self._iter_nps(items):
+            text = np_item.get("noun_phrase")
+            if not text:
+                continue
+            normalized = self.normalize(text)
+            key = self._hash_key(normalized)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = [normalized, 0, 0, {}]
+                self._entries[key] = entry
+            entry[1] += 1
+            if key not in seen_in_document:
+                seen_in_document.add(key)
+                entry[2] += 1
+            metadata = np_item.get("metadata")
+            if isinstance(metadata, dict):
+                structures = entry[3]
+                for structure in metadata.get("structures") or []:
+                    structures[structure] = structures.get(structure, 0) + 1
+            self.phrase_count += 1
+
+        self.document_count += 1
+        if len(self._entries) > self.max_entries:
+            self._spill()
+
+    @staticmethod
+    def _iter_nps(items: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """Iterate over noun phrase dicts depth-first without recursion."""
+        stack = list(reversed(list(items)))
+        while stack:
+            item = stack.pop()
+            if not isinstance(item, dict):
+                continue
+            yield item
+            children = item.get("children")
+            if isinstance(children, list):
+                stack.extend(reversed(children))
+
+    def normalize(self, text: str) -> str:
+        """Return the key text for a noun phrase under the configured normalization."""
+        text = " ".join(text.split())
+        if self.normalization == NORMALIZE_NONE:
+            return text
+        text = text.lower()
+        if self.normalization == NORMALIZE_LEMMA:
+            lemmatizer = self._get_lemmatizer()
+            if lemmatizer is not None:
+                text = " ".join(lemmatizer.lemmatize(token) for token in text.split(" "))
+        return text
+
+    def _get_lemmatizer(self):
+        """Lazily create the NLTK WordNet lemmatizer; fall back to lowercase if unavailable."""
+        if self._lemmatizer is None and not self._lemma_unavailable:
+            try:
+                from nltk.stem import WordNetLemmatizer
+                lemmatizer = WordNetLemmatizer()
+                lemmatizer.lemmatize("tests") # Forces loading of the WordNet data
+                self._lemmatizer = lemmatizer
+            except (ImportError, LookupError) as e:
+                logging.warning(f"NP aggregation: lemmatizer unavailable ({e}). Using lowercase keys instead.")
+                self._lemma_unavailable = True
+        return self._lemmatizer
+
+    @staticmethod
+    def _hash_key(normalized: str) -> str:
+        """Short, stable hash used as the counter key."""
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+    # --- Spilling and Merging ---
+
+    def _spill(self):
+        """Write the in-memory counters to disk as a run sorted by key and clear them."""
+        if not self._entries:
+            return
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="anpe_np_freq_", dir=self._spill_parent)
+        spill_path = os.path.join(self._spill_dir, f"run_{len(self._spill_files):05d}.jsonl")
+        with open(spill_path, "w", encoding="utf-8") as f:
+            for key in sorted(self._entries):
+                f.write(json.dumps([key] + self._entries[key], ensure_ascii=False))
+                f.write("\n")
+        logging.debug(f"NP aggregation: spilled {len(self._entries)} entries to {spill_path}")
+        self._spill_files.append(spill_path)
+        self._entries = {}
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[List[Any]]:
+        """Stream one spill run as [key, noun_phrase, count, df, structures] rows."""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _iter_merged(self) -> Iterator[List[Any]]:
+        """Merge the in-memory counters and all spill runs into one stream of unique rows."""
+        memory_run = ([key] + self._entries[key] for key in sorted(self._entries))
+        runs = [self._read_run(path) for path in self._spill_files] + [memory_run]
+        merged = heapq.merge(*runs, key=lambda row: row[0])
+        for key, rows in groupby(merged, key=lambda row: row[0]):
+            rows = list(rows)
+            if len(rows) == 1:
+                yield rows[0]
+                continue
+            count = sum(row[2] for row in rows)
+            document_frequency = sum(row[3] for row in rows)
+            structures = Counter()
+            for row in rows:
+                structures.update(row[4])
+            yield [key, rows[0][1], count, document_frequency, dict(structures)]
+
+    def iter_sorted(self) -> Iterator[Tuple[str, int, int, List[Tuple[str, int]]]]:
+        """
+        Yield (noun_phrase, count, document_frequency, dominant_structures) rows,
+        most frequent first. Sorting is done in bounded chunks merged from disk
+        when the table is larger than max_entries.
+        """
+        sort_key: Callable[[List[Any]], Tuple[int, int, str]] = lambda row: (-row[2], -row[3], row[1])
+        for row in self._external_sort(self._iter_merged(), sort_key):
+            dominant = Counter(row[4]).most_common(DOMINANT_STRUCTURE_COUNT)
+            yield row[1], row[2], row[3], dominant
+
+    def _external_sort(self, rows: Iterator[List[Any]], sort_key) -> Iterator[List[Any]]:
+        """Sort rows with at most max_entries in memory, spilling sorted chunks to disk."""
+        chunk_paths: List[str] = []
+        chunk: List[List[Any]] = []
+        try:
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.max_entries:
+                    chunk_paths.append(self._write_sorted_chunk(chunk, sort_key, len(chunk_paths)))
+                    chunk = []
+            chunk.sort(key=sort_key)
+            if not chunk_paths:
+                yield from chunk
+                return
+            runs = [self._read_run(path) for path in chunk_paths] + [iter(chunk)]
+            yield from heapq.merge(*runs, key=sort_key)
+        finally:
+            for path in chunk_paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _write_sorted_chunk(self, chunk: List[List[Any]], sort_key, index: int) -> str:
+        """Write one sorted chunk of rows for the final frequency sort."""
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="anpe_np_freq_", dir=self._spill_parent)
+        chunk.sort(key=sort_key)
+        path = os.path.join(self._spill_dir, f"sorted_{index:05d}.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for row in chunk:
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+        return path
+
+    # --- Export ---
+
+    def export_csv(self, output_filepath: str, compression: str = COMPRESSION_NONE,
+                   level: Optional[int] = None) -> str:
+        """Write the frequency table as CSV (streamed). Returns the written path."""
+        path = get_compressed_path(output_filepath, compression).resolve()
+        with open_text_stream(path, compression, level, newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Noun_Phrase", "Count", "Document_Frequency", "Dominant_Structures"])
+            for text, count, document_frequency, dominant in self.iter_sorted():
+                structures_str = "|".join(f"{name}:{n}" for name, n in dominant)
+                writer.writerow([text, count, document_frequency, structures_str])
+        logging.info(f"NP frequency table exported to {path}")
+        return str(path)
+
+    def export_json(self, output_filepath: str, compression: str = COMPRESSION_NONE,
+                    level: Optional[int] = None) -> str:
+        """Write the frequency table as JSON (streamed row by row). Returns the written path."""
+        path = get_compressed_path(output_filepath, compression).resolve()
+        with open_text_stream(path, compression, level) as f:
+            header = {
+                "normalization": self.normalization,
+                "documents": self.document_count,
+                "noun_phrases": self.phrase_count,
+            }
+            f.write(json.dumps(header, indent=2)[:-2]) # Reopen the object to append the table
+            f.write(',\n  "frequencies": [')
+            first = True
+            for text, count, document_frequency, dominant in self.iter_sorted():
+                row = {
+                    "noun_phrase": text,
+                    "count": count,
+                    "document_frequency": document_frequency,
+                    "dominant_structures": [{"structure": name, "count": n} for name, n in dominant],
+                }
+                f.write("\n    " if first else ",\n    ")
+                f.write(json.dumps(row, ensure_ascii=False))
+                first = False
+            f.write("\n  ]\n}\n")
+        logging.info(f"NP frequency table exported to {path}")
+        return str(path)
+
+    # --- Lifecycle ---
+
+    @property
+    def unique_in_memory(self) -> int:
+        """Number of unique phrases currently held in memory."""
+        return len(self._entries)
+
+    def is_empty(self) -> bool:
+        """True if no phrase has been counted yet."""
+        return self.phrase_count == 0
+
+    def close(self):
+        """Discard all counters and remove any spill files."""
+        self._entries = {}
+        self._spill_files = []
+        if self._spill_dir and os.path.isdir(self._spill_dir):
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+        self._spill_dir = None
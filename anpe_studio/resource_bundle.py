@@ -0,0 +1,141 @@
+"""
+Qt resource bundle (.rcc) of the files in anpe_studio/resources.
+
+PyQt6 does not ship Qt's rcc tool, so this module writes the binary rcc
+format (version 2, uncompressed) itself. The bundle is built on first start
+into the per-user data directory and named after a fingerprint of the
+bundled files (names, sizes and mtimes), so an edited or added resource
+produces a new bundle and the old one is removed. QResource memory-maps the
+file, so icons, pixmaps and stylesheet url()s are read from one mapping
+instead of from loose files. This module must not import PyQt.
+"""
+
+import logging
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from anpe_studio.config_utils import get_app_data_dir
+
+
+def _find_resources_dir() -> Path:
+    """
+    anpe_studio/resources on disk. When the modules are imported from the
+    installers' app zip, __file__ points into the zip, which holds no
+    resources; they are in the anpe_studio directory also on sys.path.
+    """
+    package_dir = Path(__file__).parent
+    if package_dir.is_dir():
+        return package_dir / "resources"
+    for entry in sys.path:
+        candidate = Path(entry or ".") / package_dir.name / "resources"
+        if candidate.is_dir():
+            return candidate
+    return package_dir / "resources"
+
+
+RESOURCES_DIR = _find_resources_dir()
+BUNDLED_SUFFIXES = (".svg", ".png", ".ico") # What ResourceManager serves; gui_help.md is read from disk
+BUNDLE_PREFIX = "resources-"
+BUNDLE_SUFFIX = ".rcc"
+BUNDLE_FORMAT = 1 # Bump when the writer changes
+
+# rcc binary format
+_RCC_VERSION = 2 # Adds a last-modified time to every tree node; read by Qt 5.13 and later
+_FLAG_DIRECTORY = 0x02
+_LANGUAGE_C = 1 # QLocale.Language.C with AnyTerritory: used for every locale
+
+
+def bundled_files(resources_dir: Path = RESOURCES_DIR) -> List[Tuple[str, int, int]]:
+    """(name, size, mtime_ns) of the files that go into the bundle, sorted by name."""
+    files = []
+    with os.scandir(resources_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.lower().endswith(BUNDLED_SUFFIXES):
+                stat = entry.stat()
+                files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    files.sort()
+    return files
+
+
+def bundle_fingerprint(files: List[Tuple[str, int, int]]) -> str:
+    # crc32 rather than hashlib/json: this runs before the splash, and importing those costs more than the check
+    return f"{zlib.crc32(repr((BUNDLE_FORMAT, files)).encode('utf-8')):08x}"
+
+
+def _qt_hash(name: str) -> int:
+    """qt_hash() over the UTF-16 code units of name, as QResource uses for its binary search."""
+    h = 0
+    encoded = name.encode("utf-16-be")
+    for i in range(0, len(encoded), 2):
+        h = (h << 4) + ((encoded[i] << 8) | encoded[i + 1])
+        h ^= (h & 0xF0000000) >> 23
+        h &= 0x0FFFFFFF
+    return h
+
+
+def write_bundle(resources_dir: Path, files: List[Tuple[str, int, int]], out_path: Path):
+    """
+    Write files (flat, from resources_dir) as an rcc bundle: a header, the
+    file data, the names, then the tree (the root directory followed by its
+    children sorted by name hash).
+    """
+    data, names, tree = bytearray(), bytearray(), bytearray()
+    nodes = []
+    for name, _, mtime_ns in sorted(files, key=lambda file: _qt_hash(file[0])):
+        content = (resources_dir / name).read_bytes()
+        data_offset = len(data)
+        data += len(content).to_bytes(4, "big") + content
+        name_offset = len(names)
+        encoded = name.encode("utf-16-be")
+        names += (len(encoded) // 2).to_bytes(2, "big") + _qt_hash(name).to_bytes(4, "big") + encoded
+        nodes.append((name_offset, data_offset, mtime_ns // 1_000_000))
+
+    # Root: name offset 0 (never looked up by name), directory with its children from node 1
+    tree += (0).to_bytes(4, "big") + _FLAG_DIRECTORY.to_bytes(2, "big")
+    tree += len(nodes).to_bytes(4, "big") + (1).to_bytes(4, "big") + (0).to_bytes(8, "big")
+    for name_offset, data_offset, mtime_ms in nodes:
+        tree += name_offset.to_bytes(4, "big") + (0).to_bytes(2, "big") # No flags: an uncompressed file
+        tree += (0).to_bytes(2, "big") + _LANGUAGE_C.to_bytes(2, "big") # Territory, language
+        tree += data_offset.to_bytes(4, "big") + mtime_ms.to_bytes(8, "big")
+
+    header_size = 20
+    data_offset, names_offset = header_size, header_size + len(data)
+    tree_offset = names_offset + len(names)
+    header = b"qres" + b"".join(value.to_bytes(4, "big") for value in
+                                (_RCC_VERSION, tree_offset, data_offset, names_offset))
+
+    temp_path = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(header + data + names + tree)
+    os.replace(temp_path, out_path) # Another instance never maps a partly written bundle
+
+
+def ensure_bundle(resources_dir: Path = RESOURCES_DIR) -> Optional[Path]:
+    """
+    Path of an up-to-date bundle of resources_dir, building it (and removing
+    stale ones) if needed. None if it cannot be built; callers then use the
+    loose files.
+    """
+    try:
+        files = bundled_files(resources_dir)
+        if not files:
+            return None
+        cache_dir = get_app_data_dir()
+        bundle_path = cache_dir / f"{BUNDLE_PREFIX}{bundle_fingerprint(files)}{BUNDLE_SUFFIX}"
+        if bundle_path.is_file():
+            return bundle_path
+        write_bundle(resources_dir, files, bundle_path)
+        logging.info(f"Built resource bundle {bundle_path.name} ({len(files)} files).")
+        for stale in cache_dir.glob(f"{BUNDLE_PREFIX}*{BUNDLE_SUFFIX}"):
+            if stale != bundle_path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass # Still mapped by a running instance (Windows); removed on a later start
+        return bundle_path
+    except OSError as e:
+        logging.warning(f"Could not build the resource bundle, using the resource files: {e}")
+        return None
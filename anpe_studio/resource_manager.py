@@ -4,15 +4,56 @@ Resource management utilities for ANPE Studio.
 This module provides a centralized way to access resources relative to the application structure.
 """
 
+import logging
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+from PyQt6.QtCore import Qt, QResource
 from PyQt6.QtGui import QIcon, QPixmap
 
+from anpe_studio.resource_bundle import RESOURCES_DIR
+
+BUNDLE_MAP_ROOT = "/anpe_studio" # Bundled files are available as :/anpe_studio/<name>
+
 class ResourceManager:
     """
-    Manages access to application resources using file system paths.
-    Assumes resources are located in a 'resources' directory relative to this module.
+    Manages access to application resources.
+    Resources are located in a 'resources' directory relative to this module. After
+    register_bundle() icons, pixmaps and stylesheet URLs are served from the compiled
+    resource bundle (see resource_bundle.py) instead of the loose files. Icons and
+    pixmaps are decoded once and cached (pixmaps per size and device pixel ratio).
     """
 
+    _bundle_path: Optional[str] = None
+    _icon_cache: Dict[str, QIcon] = {}
+    _pixmap_cache: Dict[Tuple[str, int, float], QPixmap] = {}
+
+    @classmethod
+    def register_bundle(cls) -> bool:
+        """
+        Build (if needed) and register the resource bundle. Call once at startup, before
+        the theme's stylesheets are created. Returns False if the loose files stay in use.
+        """
+        if cls._bundle_path is not None:
+            return True
+        from anpe_studio.resource_bundle import ensure_bundle
+        bundle_path = ensure_bundle()
+        if bundle_path is None:
+            return False
+        if not QResource.registerResource(str(bundle_path), BUNDLE_MAP_ROOT):
+            logging.warning(f"Could not register the resource bundle {bundle_path}, using the resource files.")
+            return False
+        cls._bundle_path = str(bundle_path)
+        cls._icon_cache.clear() # Entries loaded from the loose files
+        cls._pixmap_cache.clear()
+        return True
+
+    @classmethod
+    def _qt_path(cls, resource_name) -> str:
+        """Path Qt should load resource_name from: the bundle if registered, else the file."""
+        if cls._bundle_path is not None and Path(resource_name).suffix.lower() in (".svg", ".png", ".ico"):
+            return f":{BUNDLE_MAP_ROOT}/{resource_name}"
+        return str(cls.get_resource_path(resource_name)).replace("\\", "/")
+
     @classmethod
     def get_resource_path(cls, resource_name):
         """
@@ -24,9 +65,8 @@ class ResourceManager:
         Returns:
             Path: Path object to the resource in the 'resources' directory.
         """
-        # Resources are assumed to be in the 'resources' directory relative to this file
-        resources_dir = Path(__file__).parent / "resources"
-        return resources_dir / resource_name
+        # The 'resources' directory next to the modules (found on sys.path when they load from the app zip)
+        return RESOURCES_DIR / resource_name
 
     @classmethod
     def get_icon(cls, icon_name):
@@ -37,26 +77,39 @@ class ResourceManager:
             icon_name: Name of the icon file
             
         Returns:
-            QIcon: The loaded icon
+            QIcon: The loaded icon (shared; QIcon caches its rendered sizes itself)
         """
-        # Always use file system path
-        icon_path = cls.get_resource_path(icon_name)
-        return QIcon(str(icon_path)) # Ensure path is string
+        icon = cls._icon_cache.get(icon_name)
+        if icon is None:
+            icon = QIcon(cls._qt_path(icon_name))
+            cls._icon_cache[icon_name] = icon
+        return icon
 
     @classmethod
-    def get_pixmap(cls, image_name):
+    def get_pixmap(cls, image_name, size: Optional[int] = None, device_pixel_ratio: float = 1.0):
         """
         Get a QPixmap for the specified resource file.
         
         Args:
             image_name: Name of the image file
+            size: If given, the image is scaled (smoothly, keeping its aspect ratio) to fit
+                  size x size logical pixels
+            device_pixel_ratio: Device pixel ratio of the target screen (used with size)
             
         Returns:
-            QPixmap: The loaded image
+            QPixmap: The loaded image, cached per name, size and device pixel ratio
         """
-        # Always use file system path
-        image_path = cls.get_resource_path(image_name)
-        return QPixmap(str(image_path)) # Ensure path is string
+        key = (image_name, size or 0, device_pixel_ratio if size else 1.0)
+        pixmap = cls._pixmap_cache.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(cls._qt_path(image_name))
+            if size and not pixmap.isNull():
+                physical_size = int(size * device_pixel_ratio)
+                pixmap = pixmap.scaled(physical_size, physical_size, Qt.AspectRatioMode.KeepAspectRatio,
+                                       Qt.TransformationMode.SmoothTransformation)
+                pixmap.setDevicePixelRatio(device_pixel_ratio)
+            cls._pixmap_cache[key] = pixmap
+        return QPixmap(pixmap) # A (shallow) copy, so setDevicePixelRatio() on it does not change the cache
 
     @classmethod
     def get_style_url(cls, resource_name):
@@ -68,11 +121,7 @@ class ResourceManager:
                            (e.g., 'assets/expand_open.svg')
             
         Returns:
-            str: Absolute path string suitable for url() in Qt stylesheets
+            str: Resource path (bundle registered) or absolute path string suitable for url() in Qt stylesheets
         """
-        # Use the robust get_resource_path to find the absolute path first
-        absolute_path = cls.get_resource_path(resource_name)
-        
-        # Return the absolute path as a string, ensuring forward slashes
-        # This seems to be more reliably handled by Qt CSS url() than file:// URIs
-        return str(absolute_path).replace("\\", "/") 
\ No newline at end of file
+        # Absolute paths with forward slashes seem to be more reliably handled by Qt CSS url() than file:// URIs
+        return cls._qt_path(resource_name)
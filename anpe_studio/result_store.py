@@ -0,0 +1,110 @@
+"""
+Shared store for extraction results.
+
+Workers put each result into a ResultStore on their own thread and send the
+GUI only its id, so signals carry small (path, id) handles instead of the
+nested result dicts. A ResultSet maps the input paths of one batch (and
+the watch-mode batches appended to it) to result ids and reads through to
+the store, so the Output tab, the job queue and export all use the one
+stored copy. A ResultSet's results are freed when it is released or
+garbage collected (e.g. once neither the queue nor the Output tab holds
+the batch any more). This module must not import PyQt.
+"""
+
+import itertools
+import threading
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ResultStore:
+    """Thread-safe id -> result mapping. Ids are never reused."""
+
+    def __init__(self):
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def put(self, result: Dict[str, Any]) -> int:
+        """Store a result (without copying it) and return its id."""
+        with self._lock:
+            result_id = next(self._ids)
+            self._results[result_id] = result
+        return result_id
+
+    def get(self, result_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._results.get(result_id)
+
+    def pop(self, result_id: int) -> Optional[Dict[str, Any]]:
+        """Remove a result and return it (None if unknown)."""
+        with self._lock:
+            return self._results.pop(result_id, None)
+
+    def discard(self, result_ids: Iterable[int]):
+        with self._lock:
+            for result_id in result_ids:
+                self._results.pop(result_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+
+class ResultSet(Mapping):
+    """
+    Read-only view of one batch's results: input path -> result dict, in the
+    order results first arrived. Only (path, id) pairs are held here; the results
+    themselves live in the store. Used from the GUI thread only.
+    """
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        self._ids: Dict[str, int] = {}
+        # Free the results with the set; the callback holds the id dict, not the set
+        weakref.finalize(self, _discard_ids, store, self._ids)
+
+    def add(self, file_path: str, result_id: int):
+        """Record a file's result; a result from an earlier run of the same file is freed."""
+        previous = self._ids.get(file_path)
+        if previous is not None and previous != result_id:
+            self.store.discard((previous,))
+        self._ids[file_path] = result_id # A re-processed file keeps its place
+
+    def result_id(self, file_path: str) -> Optional[int]:
+        return self._ids.get(file_path)
+
+    def handles(self) -> List[Tuple[str, int]]:
+        """(path, result id) pairs in the order the files first arrived."""
+        return list(self._ids.items())
+
+    def release(self):
+        """Free all results of this set from the store."""
+        self.store.discard(self._ids.values())
+        self._ids.clear()
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, file_path: str) -> Dict[str, Any]:
+        result = self.store.get(self._ids[file_path])
+        if result is None:
+            raise KeyError(file_path) # Released
+        return result
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, file_path) -> bool:
+        return file_path in self._ids
+
+
+def _discard_ids(store: ResultStore, ids: Dict[str, int]):
+    store.discard(ids.values())
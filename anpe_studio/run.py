@@ -6,12 +6,51 @@ Run the ANPE Studio application.
 import sys
 import os
 
+APP_ZIP_ENV_VAR = "ANPE_STUDIO_APP_ZIP" # Set by the macOS launcher, whose zip is outside the app bundle
+APP_ZIP_NAME = "anpe_studio.zip" # Built by the installers on request, next to the anpe_studio directory
+
+
+def _app_zip(app_dir: str):
+    """
+    The app code zip to import from, if there is one and it is not older than
+    any .py file of the anpe_studio package it was built from, subpackages
+    included (an app replaced or edited without re-running setup must not run
+    the previous version's code).
+    """
+    zip_path = os.environ.get(APP_ZIP_ENV_VAR) or os.path.join(os.path.dirname(app_dir), APP_ZIP_NAME)
+    try:
+        zip_mtime = os.stat(zip_path).st_mtime
+    except OSError:
+        return None
+    newest_source = 0.0
+    for dirpath, dirnames, filenames in os.walk(app_dir):
+        dirnames[:] = [name for name in dirnames if name != "__pycache__" and name != "resources"]
+        for name in filenames:
+            if name.endswith(".py"):
+                try:
+                    newest_source = max(newest_source, os.stat(os.path.join(dirpath, name)).st_mtime)
+                except OSError:
+                    pass # Removed while we walk
+    if newest_source > zip_mtime:
+        print(f"Ignoring {zip_path}: it is older than the app code; re-run setup to rebuild it.", file=sys.stderr)
+        return None
+    return zip_path
+
+
 # Ensure the anpe_studio package is in the path
 current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
-
-from anpe_studio.app import main
+app_zip = _app_zip(os.path.dirname(os.path.abspath(__file__)))
+if app_zip and app_zip not in sys.path:
+    sys.path.insert(0, app_zip) # Ahead of the directory: modules come from the zip, resources from the directory
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # A running instance takes over this launch before the GUI modules are even imported
+    from anpe_studio.single_instance import hand_off_launch
+    if hand_off_launch(sys.argv[1:]):
+        sys.exit(0)
+    # Imported here so that engine processes (which re-import this script as
+    # their main module under 'spawn') do not load the GUI
+    from anpe_studio.app import main
+    main()
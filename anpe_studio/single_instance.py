@@ -0,0 +1,194 @@
+"""
+Single-instance coordination over a local socket (a Unix domain socket, or a
+named pipe on Windows).
+
+The first Studio process listens on a per-user, per-data-directory server
+name. A later launch connects to it before creating its QApplication, sends
+its launch arguments as one JSON line (files as absolute paths, texts as
+given) and exits as soon as the running instance acknowledges them. The
+running instance raises its window and queues the inputs with its warm
+extractors. Launch arguments:
+
+    run.py [FILE_OR_DIR ...] [--text TEXT ...] [--new-instance]
+
+--new-instance, or ANPE_STUDIO_SINGLE_INSTANCE=0, starts an independent
+process as before.
+"""
+
+import json
+import logging
+import os
+import zlib
+from typing import List, NamedTuple, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from PyQt6.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+
+from anpe_studio.config_utils import get_app_data_dir
+
+SINGLE_INSTANCE_ENV_VAR = "ANPE_STUDIO_SINGLE_INSTANCE" # "0" disables forwarding and listening
+PROTOCOL_VERSION = 1
+CONNECT_TIMEOUT_MS = 200 # A local server that does not accept within this is not running
+ACK_TIMEOUT_MS = 3000    # The running instance answers from its event loop
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+ACK = b"ok\n"
+
+# Qt's own command-line options that take a value (QGuiApplication/QApplication), skipped with it
+_QT_VALUE_OPTIONS = {"-platform", "-platformpluginpath", "-platformtheme", "-plugin", "-qmljsdebugger",
+                     "-qwindowgeometry", "-qwindowicon", "-qwindowtitle", "-session", "-style",
+                     "-stylesheet", "-display", "-geometry", "-title", "-name", "-screen"}
+
+
+class LaunchArguments(NamedTuple):
+    files: List[str]     # Absolute paths of files, archives and directories
+    texts: List[str]     # Texts to process (--text)
+    new_instance: bool   # --new-instance: do not forward to a running instance
+
+
+def parse_launch_arguments(argv: List[str], cwd: Optional[str] = None) -> LaunchArguments:
+    """Files and texts from the command line (without the program name); Qt's own options are skipped."""
+    cwd = cwd or os.getcwd()
+    files, texts, new_instance = [], [], False
+    args = iter(argv)
+    for arg in args:
+        if arg == "--text":
+            text = next(args, None)
+            if text:
+                texts.append(text)
+        elif arg.startswith("--text="):
+            if arg[len("--text="):]:
+                texts.append(arg[len("--text="):])
+        elif arg == "--new-instance":
+            new_instance = True
+        elif arg in _QT_VALUE_OPTIONS:
+            next(args, None)
+        elif arg.startswith("-"):
+            continue # Qt flags such as -reverse
+        else:
+            files.append(os.path.abspath(os.path.join(cwd, arg)))
+    return LaunchArguments(files, texts, new_instance)
+
+
+def single_instance_enabled(launch: LaunchArguments) -> bool:
+    return not launch.new_instance and os.environ.get(SINGLE_INSTANCE_ENV_VAR, "") != "0"
+
+
+def server_name() -> str:
+    """Local server name shared by the Studio processes of one user and data directory."""
+    user = os.environ.get("USERNAME") or os.environ.get("USER") or ""
+    return f"anpe-studio-{zlib.crc32(f'{user}|{get_app_data_dir()}'.encode('utf-8')):08x}"
+
+
+def forward_to_running_instance(files: List[str], texts: List[str], name: Optional[str] = None) -> bool:
+    """
+    Hand files and texts to a running instance (blocking; works before the
+    QApplication exists). True once it acknowledged them, False if no
+    instance is listening or it did not answer.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False
+    payload = json.dumps({"version": PROTOCOL_VERSION, "pid": os.getpid(), "files": files, "texts": texts})
+    socket.write(payload.encode("utf-8") + b"\n")
+    reply = b""
+    while not reply.endswith(b"\n"):
+        if not socket.waitForReadyRead(ACK_TIMEOUT_MS):
+            logging.warning("Running ANPE Studio instance did not acknowledge the forwarded inputs.")
+            socket.abort()
+            return False
+        reply += bytes(socket.readAll())
+    socket.disconnectFromServer()
+    return reply == ACK
+
+
+def hand_off_launch(argv: List[str]) -> bool:
+    """
+    Entry points call this before importing the GUI: True if a running
+    instance took over this launch's arguments and this process can exit.
+    """
+    launch = parse_launch_arguments(argv)
+    return single_instance_enabled(launch) and forward_to_running_instance(launch.files, launch.texts)
+
+
+class InstanceServer(QObject):
+    """Listens for later launches and emits inputsReceived(files, texts) for each one (also when both are empty)."""
+    inputsReceived = pyqtSignal(list, list)
+
+    def __init__(self, name: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self) -> bool:
+        """
+        Start listening. False if another instance is listening (it started
+        between our forwarding attempt and now); a stale socket left by a
+        crashed instance is removed.
+        """
+        # Probe first: with UserAccessOption, Qt binds under a temporary name and renames it
+        # into place, so listen() would silently take over a live server's name
+        probe = QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.abort()
+            return False
+        if not self._server.listen(self.name):
+            if self._server.serverError() == QAbstractSocket.SocketError.AddressInUseError:
+                QLocalServer.removeServer(self.name)
+                if self._server.listen(self.name):
+                    return True
+            # Run without coordination rather than not at all
+            logging.warning(f"Single instance: could not listen on {self.name}: {self._server.errorString()}")
+        return True
+
+    def close(self):
+        self._server.close()
+
+    @pyqtSlot()
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            connection = self._server.nextPendingConnection()
+            self._buffers[connection] = b""
+            connection.readyRead.connect(self._on_ready_read)
+            connection.disconnected.connect(self._on_disconnected)
+
+    @pyqtSlot()
+    def _on_ready_read(self):
+        connection = self.sender()
+        if connection not in self._buffers:
+            return
+        data = self._buffers[connection] + bytes(connection.readAll())
+        if len(data) > MAX_REQUEST_BYTES:
+            logging.warning("Single instance: request too large, ignored.")
+            self._drop(connection)
+            return
+        if not data.endswith(b"\n"):
+            self._buffers[connection] = data
+            return
+        try:
+            request = json.loads(data)
+            files = [str(path) for path in request.get("files", [])]
+            texts = [str(text) for text in request.get("texts", [])]
+        except (ValueError, AttributeError, TypeError) as e:
+            logging.warning(f"Single instance: invalid request ignored: {e}")
+            self._drop(connection)
+            return
+        connection.write(ACK)
+        connection.flush()
+        self._drop(connection)
+        logging.info(f"Single instance: launch from process {request.get('pid')} forwarded "
+                     f"{len(files)} file(s) and {len(texts)} text(s).")
+        self.inputsReceived.emit(files, texts)
+
+    @pyqtSlot()
+    def _on_disconnected(self):
+        self._drop(self.sender())
+
+    def _drop(self, connection):
+        if self._buffers.pop(connection, None) is not None:
+            connection.disconnectFromServer()
+            connection.deleteLater()
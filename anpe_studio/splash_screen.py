@@ -19,11 +19,7 @@ from anpe_studio.version import __version__ as gui_version
 from anpe_studio.workers.status_worker import ModelStatusChecker
 from anpe_studio.resource_manager import ResourceManager
 
-# Attempt to import ANPE core version (still needed for display)
-try:
-    from anpe import __version__ as core_version
-except ImportError:
-    core_version = "N/A"
+# ANPE itself is not imported here: the splash must paint before the heavy modules load
 
 
 class SplashScreen(QWidget): # Changed from QSplashScreen to QWidget for custom layout
@@ -146,31 +142,16 @@ class SplashScreen(QWidget): # Changed from QSplashScreen to QWidget for custom
     def _load_and_set_logo(self):
         """Loads the PNG logo and sets it on the label, handling HiDPI."""
         try:
-            # Use the standard PNG icon
-            logo_pixmap = ResourceManager.get_pixmap("app_icon_logo_transparent.png")
-            if logo_pixmap.isNull():
-                 logging.error("Failed to load app_icon_logo_transparent.png")
-                 return
-
             # Determine device pixel ratio for high-DPI rendering
             dpr = self.devicePixelRatioF() if hasattr(self, 'devicePixelRatioF') else QApplication.primaryScreen().devicePixelRatio()
-            
-            # Create a properly scaled pixmap if DPR > 1
-            if dpr > 1.0:
-                physical_logo_size = int(self.LOGO_SIZE * dpr)
-                # Scale the loaded pixmap smoothly to the target physical size
-                # Use scaled() which returns a new pixmap
-                scaled_pixmap = logo_pixmap.scaled(physical_logo_size, physical_logo_size, 
-                                                 Qt.AspectRatioMode.KeepAspectRatio,
-                                                 Qt.TransformationMode.SmoothTransformation)
-                # Set DPR on the *new* scaled pixmap
-                scaled_pixmap.setDevicePixelRatio(dpr)
-                final_pixmap = scaled_pixmap
-            else:
-                # For standard DPI, just use the original pixmap
-                final_pixmap = logo_pixmap 
-                # Ensure DPR is set even for 1.0 for consistency if needed, though usually implicit
-                final_pixmap.setDevicePixelRatio(1.0)
+
+            # Use the standard PNG icon, smoothly scaled to the physical logo size once
+            # (not on every paint of the fading splash) and cached by ResourceManager
+            final_pixmap = ResourceManager.get_pixmap("app_icon_logo_transparent.png", size=self.LOGO_SIZE,
+                                                      device_pixel_ratio=dpr)
+            if final_pixmap.isNull():
+                 logging.error("Failed to load app_icon_logo_transparent.png")
+                 return
 
             # Set the prepared pixmap on the label
             self.logo_label.setPixmap(final_pixmap)
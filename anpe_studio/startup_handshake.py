@@ -0,0 +1,39 @@
+"""
+Startup readiness handshake with the launcher that started Studio.
+
+The Windows launcher (launcher.py) creates an empty file and passes its
+path in ANPE_STUDIO_READY_FILE. Studio appends one line per startup stage:
+
+    <stage> <time.time() when the stage was reached>
+
+first "splash_shown", then "main_window_ready". The launcher watches the
+file, exits once the main window is ready and logs each stage's time since
+it spawned the process. If it gives up waiting it removes the file, and
+later stages are not written. Without the variable (started from a
+terminal, by the macOS bundle or by the benchmarks) nothing is written.
+This module must not import PyQt.
+"""
+
+import logging
+import os
+import time
+
+READY_FILE_ENV_VAR = "ANPE_STUDIO_READY_FILE"
+STAGE_SPLASH_SHOWN = "splash_shown"
+STAGE_MAIN_WINDOW_READY = "main_window_ready" # The last stage: the launcher stops watching
+
+
+def report_startup_stage(stage: str):
+    """Tell the launcher (if any) that stage was reached."""
+    ready_file = os.environ.get(READY_FILE_ENV_VAR)
+    if not ready_file or not os.path.isfile(ready_file):
+        return # Not started by the launcher, or it stopped waiting and removed the file
+    if stage == STAGE_MAIN_WINDOW_READY:
+        # Processes Studio starts from now on (the daemon, a new instance) must not report to this launcher
+        os.environ.pop(READY_FILE_ENV_VAR, None)
+    try:
+        # Opened per stage, so the launcher can delete the file as soon as it has the last one
+        with open(ready_file, "a", encoding="utf-8") as f:
+            f.write(f"{stage} {time.time():.3f}\n")
+    except OSError as e:
+        logging.warning(f"Could not report startup stage '{stage}' to the launcher: {e}")
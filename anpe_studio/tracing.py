@@ -0,0 +1,170 @@
+"""
+Opt-in timeline tracing in the Chrome trace-event format.
+
+When enabled (Settings > Models > "Record a performance trace"), code paths
+such as input reading, parsing, result delivery, result display and export
+record spans tagged with the process and thread they ran on. Engine
+processes send their spans back to the GUI process with their other
+events. write_trace() saves everything as a JSON file that chrome://tracing
+and https://ui.perfetto.dev open directly.
+
+While tracing is off, span() returns a shared no-op context manager, so an
+instrumented call costs one flag check. Timestamps come from
+time.perf_counter_ns(), a system-wide monotonic clock on Windows, macOS and
+Linux, so spans from engine processes line up with the GUI's. This module
+must not import PyQt.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+MAX_EVENTS = 1_000_000 # Events kept in memory; later ones are counted and dropped
+
+_enabled = False
+_events: List[Dict[str, Any]] = [] # list.append is atomic, so threads record without a lock
+_dropped = 0
+_named_threads = set() # (pid, tid) with a thread_name metadata event recorded
+_process_name = "ANPE Studio"
+
+
+class _NullSpan:
+    """Context manager that does nothing (tracing off)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start_ns")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        event = {"name": self.name, "cat": self.category, "ph": "X",
+                 "ts": self.start_ns / 1000.0, "dur": (end_ns - self.start_ns) / 1000.0}
+        if self.args:
+            event["args"] = self.args
+        _record(event)
+        return False
+
+
+def _record(event: Dict[str, Any]):
+    global _dropped
+    if len(_events) >= MAX_EVENTS:
+        _dropped += 1
+        return
+    pid, tid = os.getpid(), threading.get_native_id()
+    event["pid"], event["tid"] = pid, tid
+    if (pid, tid) not in _named_threads:
+        _named_threads.add((pid, tid))
+        _events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                        "args": {"name": threading.current_thread().name}})
+    _events.append(event)
+
+
+# --- Recording ---
+
+def span(name: str, category: str = "studio", **args):
+    """
+    Context manager timing a block as one span (no-op while tracing is off):
+
+        with tracing.span("parse", "extract", file=name):
+            ...
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def async_span(name: str, category: str, span_id: int, start_ns: int, end_ns: int, **args):
+    """
+    Record a span that started earlier, on its own track (e.g. a job's time in
+    the queue), so overlapping spans of the same thread do not have to nest.
+    """
+    if not _enabled:
+        return
+    begin = {"name": name, "cat": category, "ph": "b", "id": span_id, "ts": start_ns / 1000.0}
+    if args:
+        begin["args"] = args
+    _record(begin)
+    _record({"name": name, "cat": category, "ph": "e", "id": span_id, "ts": end_ns / 1000.0})
+
+
+def now_ns() -> int:
+    """Timestamp for async_span()."""
+    return time.perf_counter_ns()
+
+
+# --- Control ---
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    global _enabled
+    _enabled = enabled
+
+
+def set_process_name(name: str):
+    """Name shown for this process in the trace (engine processes call this)."""
+    global _process_name
+    _process_name = name
+
+
+def take_events() -> List[Dict[str, Any]]:
+    """Remove and return the events recorded so far, with this process's name (engine processes forward them)."""
+    global _events
+    events, _events = _events, []
+    _named_threads.clear() # Thread names are sent again with later events
+    if events:
+        events.append({"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": _process_name}})
+    return events
+
+
+def add_events(events: List[Dict[str, Any]]):
+    """Merge events recorded in another process."""
+    global _dropped
+    room = MAX_EVENTS - len(_events)
+    _events.extend(events[:max(0, room)])
+    _dropped += max(0, len(events) - room)
+
+
+def event_count() -> int:
+    return len(_events)
+
+
+def clear():
+    global _events, _dropped
+    _events = []
+    _dropped = 0
+    _named_threads.clear()
+
+
+def write_trace(path: str) -> str:
+    """Write the recorded events as a Chrome trace-event JSON file and clear them. Returns the path."""
+    dropped = _dropped
+    trace = {"traceEvents": take_events(), "displayTimeUnit": "ms",
+             "otherData": {"droppedEvents": dropped}}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f)
+    clear()
+    return path
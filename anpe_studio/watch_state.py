@@ -0,0 +1,162 @@
+"""
+Persistent change tracking for watch-folder ingestion.
+
+Each watched directory has a record of the .txt files that were processed,
+fingerprinted by modification time, size and SHA-256 of the content. A scan
+reports only files that are new or whose content changed since they were
+last processed, and the record survives restarts so that files already seen
+are not processed again. This module must not import PyQt.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from anpe_studio.config_utils import get_app_data_dir
+
+STATE_FILENAME = "watch_state.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_SETTLE_SECONDS = 2.0 # Files modified more recently are assumed to still be written
+
+# (mtime_ns, size, sha256 hex digest)
+Fingerprint = Tuple[int, int, str]
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WatchStateStore:
+    """
+    Processed-file fingerprints of one watched directory tree, persisted in a
+    JSON file shared by all watched directories. Thread-safe: scans run in a
+    background thread while results are marked from the GUI thread.
+    """
+
+    def __init__(self, root: str, state_path: Optional[str] = None):
+        """
+        Args:
+            root: Directory tree being watched.
+            state_path: JSON state file (watch_state.json in the app data dir if None).
+        """
+        self.root = os.path.abspath(root)
+        self.state_path = state_path or str(get_app_data_dir() / STATE_FILENAME)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock() # Serializes writes of the state file
+        self._processed: Dict[str, Fingerprint] = {}
+        self._dirty = False
+        self.load()
+
+    # --- Persistence ---
+
+    def _read_all(self) -> Dict[str, Dict[str, list]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("roots", {}) if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read watch state {self.state_path}: {e}. Starting fresh.")
+            return {}
+
+    def load(self):
+        """Load this root's fingerprints from the state file."""
+        entries = self._read_all().get(self.root, {})
+        with self._lock:
+            self._processed = {path: tuple(fp) for path, fp in entries.items() if len(fp) == 3}
+            self._dirty = False
+        logging.debug(f"Watch state: {len(self._processed)} processed files known under {self.root}")
+
+    def save(self):
+        """Write this root's fingerprints back to the state file (atomic replace)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {path: list(fp) for path, fp in self._processed.items()}
+            self._dirty = False
+        with self._save_lock:
+            roots = self._read_all() # Keep other watched roots intact
+            roots[self.root] = entries
+            tmp_path = f"{self.state_path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": 1, "roots": roots}, f)
+                os.replace(tmp_path, self.state_path)
+            except OSError as e:
+                logging.error(f"Could not save watch state {self.state_path}: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    # --- Scanning ---
+
+    def scan(self, settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+             ignore: Optional[Dict[str, Fingerprint]] = None,
+             directories: Optional[List[str]] = None) -> Tuple[List[Tuple[str, Fingerprint]], bool]:
+        """
+        Find .txt files under root that are new or changed since they were processed.
+
+        Size and mtime are compared first; content is only hashed when they
+        differ, so a touched but unchanged file is not reported.
+
+        Args:
+            settle_seconds: Skip files modified within this many seconds (still being written).
+            ignore: Files already reported and awaiting processing, with their fingerprints.
+            directories: If given, every directory of the tree is appended to it (root first).
+
+        Returns:
+            (changed, unsettled): changed is a list of (path, fingerprint) sorted by
+            path; unsettled is True if some files were skipped as still being written.
+        """
+        ignore = ignore or {}
+        changed: List[Tuple[str, Fingerprint]] = []
+        unsettled = False
+        now = time.time()
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames.sort()
+            if directories is not None:
+                directories.append(dirpath)
+            for name in sorted(filenames):
+                if not name.lower().endswith(".txt"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue # Removed between listing and stat
+                if now - st.st_mtime < settle_seconds:
+                    unsettled = True
+                    continue
+                with self._lock:
+                    known = self._processed.get(path)
+                pending = ignore.get(path)
+                for reference in (known, pending):
+                    if reference and reference[0] == st.st_mtime_ns and reference[1] == st.st_size:
+                        break
+                else:
+                    try:
+                        digest = hash_file(path)
+                    except OSError as e:
+                        logging.warning(f"Watch: could not read {path}: {e}")
+                        continue
+                    fingerprint = (st.st_mtime_ns, st.st_size, digest)
+                    if known and known[2] == digest:
+                        self.mark_processed(path, fingerprint) # Touched, content unchanged
+                    elif not (pending and pending[2] == digest):
+                        changed.append((path, fingerprint))
+        return changed, unsettled
+
+    def mark_processed(self, path: str, fingerprint: Fingerprint):
+        """Record that path was processed with the given fingerprint (call save() to persist)."""
+        with self._lock:
+            self._processed[path] = tuple(fingerprint)
+            self._dirty = True
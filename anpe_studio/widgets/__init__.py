@@ -1,16 +1,35 @@
 """
 Widget components for the ANPE Studio application.
+
+Widgets are imported on first access (e.g. `from anpe_studio.widgets import
+StatusBar`), so importing one widget module, as the splash screen does,
+does not load the others. The settings dialog in particular pulls in the
+ANPE model utilities, spaCy and NLTK.
 """
 
+import importlib
 
 # Keep widget imports
 # from anpe_studio.widgets.step_indicator import StepIndicator
-from anpe_studio.widgets.file_list_widget import FileListWidget
-from anpe_studio.widgets.structure_filter_widget import StructureFilterWidget
-from anpe_studio.widgets.status_bar import StatusBar
-from anpe_studio.widgets.enhanced_log_panel import EnhancedLogPanel
-from anpe_studio.widgets.result_display import ResultDisplayWidget 
-from anpe_studio.widgets.help_dialog import HelpDialog
-from anpe_studio.widgets.license_dialog import LicenseDialog
-from anpe_studio.widgets.settings_dialog import SettingsDialog
-from anpe_studio.widgets.result_display import DetachedResultWindow
+_LAZY_WIDGETS = {
+    "FileListWidget": "anpe_studio.widgets.file_list_widget",
+    "StructureFilterWidget": "anpe_studio.widgets.structure_filter_widget",
+    "StatusBar": "anpe_studio.widgets.status_bar",
+    "EnhancedLogPanel": "anpe_studio.widgets.enhanced_log_panel",
+    "ResultDisplayWidget": "anpe_studio.widgets.result_display",
+    "HelpDialog": "anpe_studio.widgets.help_dialog",
+    "LicenseDialog": "anpe_studio.widgets.license_dialog",
+    "SettingsDialog": "anpe_studio.widgets.settings_dialog",
+    "DetachedResultWindow": "anpe_studio.widgets.result_display",
+}
+
+__all__ = list(_LAZY_WIDGETS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_WIDGETS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value # Later lookups skip __getattr__
+    return value
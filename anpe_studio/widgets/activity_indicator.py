@@ -1,7 +1,11 @@
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import QTimer, Qt, QPoint, QPointF
+from PyQt6.QtCore import QObject, QTimer, Qt, QPoint, QPointF, QEvent
 from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QRadialGradient
+from PyQt6 import sip
+import logging
 import math
+import os
+import time
 
 # Import theme colors
 from anpe_studio.theme import PRIMARY_COLOR, SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR
@@ -14,6 +18,149 @@ STATE_ERROR = 'error'
 STATE_CHECKING = 'checking' # New state for background checks
 STATE_LOADING = 'loading' # New state specifically for splash loading
 
+# --- Frame Pacing ---
+BASE_STEP_MS = 15.0 # Animation speeds below are per 15 ms step (the original fixed timer interval)
+MOTION_FRAME_MS = 16 # Ripples and state transitions (~60 fps)
+STEADY_FRAME_MS = { # Breathing/blinking glows change slowly, so a few frames per second are enough
+    STATE_IDLE: 100,
+    STATE_CHECKING: 50,
+    STATE_WARNING: 66,
+    STATE_ERROR: 40,
+}
+MAX_FRAME_STEP_MS = 100.0 # A longer gap (blocked event loop, resumed after a pause) advances by this much
+FRAME_BUDGET_SHARE = 0.05 # Indicator painting may use at most this share of the time between frames
+
+# Measurement mode: log the frame clock's wakeups and the CPU time spent in indicators
+STATS_ENV_VAR = "ANPE_STUDIO_INDICATOR_STATS"
+STATS_LOG_INTERVAL_S = 10.0
+
+
+class FrameClock(QObject):
+    """
+    One timer driving the animation of every visible activity indicator.
+
+    Indicators request a frame interval for their current state and release
+    it while hidden or while their window is minimized; the timer runs at the
+    shortest requested interval and stops when nothing is subscribed, so a
+    steady status bar costs a few wakeups per second and a minimized window
+    none. The interval is stretched if painting the indicators would take
+    more than FRAME_BUDGET_SHARE of the time between frames.
+
+    With measurement on (STATS_ENV_VAR=1 or set_measurement_enabled(True)),
+    the thread CPU time of ticks and indicator paints is recorded; stats()
+    returns it and a summary is logged every STATS_LOG_INTERVAL_S seconds.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._subscribers = {} # indicator -> requested frame interval (ms)
+        self._paint_cost_ms = 0.0 # Paint time since the last tick
+        self._frame_cost_ms = 0.0 # Smoothed paint time per tick
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer) # Lets the OS coalesce wakeups
+        self._timer.timeout.connect(self._tick)
+        self.measuring = os.environ.get(STATS_ENV_VAR, "") not in ("", "0")
+        self.reset_stats()
+
+    # --- Subscriptions ---
+
+    def request(self, indicator, interval_ms: int):
+        """Deliver frames to indicator at least every interval_ms (adds it if new)."""
+        if indicator not in self._subscribers:
+            indicator._last_frame_ms = self.now_ms() # Resume without a jump
+        if self._subscribers.get(indicator) != interval_ms:
+            self._subscribers[indicator] = interval_ms
+            self._reschedule()
+
+    def release(self, indicator):
+        if self._subscribers.pop(indicator, None) is not None:
+            self._reschedule()
+
+    def is_subscribed(self, indicator) -> bool:
+        return indicator in self._subscribers
+
+    def interval_ms(self) -> int:
+        """Current tick interval, 0 while stopped."""
+        return self._timer.interval() if self._timer.isActive() else 0
+
+    def _reschedule(self):
+        if sip.isdeleted(self._timer): # Application teardown: widgets are hidden after the clock is gone
+            return
+        if not self._subscribers:
+            self._timer.stop()
+            return
+        interval = min(self._subscribers.values())
+        interval = max(interval, int(self._frame_cost_ms / FRAME_BUDGET_SHARE))
+        if self._timer.interval() != interval:
+            self._timer.setInterval(interval)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @staticmethod
+    def now_ms() -> float:
+        return time.perf_counter() * 1000.0
+
+    # --- Frames ---
+
+    def _tick(self):
+        cpu_start = time.thread_time_ns() if self.measuring else 0
+        self._frame_cost_ms = 0.8 * self._frame_cost_ms + 0.2 * self._paint_cost_ms
+        self._paint_cost_ms = 0.0
+        now = self.now_ms()
+        self._ticks += 1
+        for indicator in list(self._subscribers):
+            if sip.isdeleted(indicator): # Deleted with its parent while shown
+                del self._subscribers[indicator]
+                continue
+            if indicator._advance(now):
+                self._frames += 1
+        self._reschedule() # Subscribers may have changed their rate, and the paint cost is updated
+        if self.measuring:
+            self._tick_cpu_ns += time.thread_time_ns() - cpu_start
+            if time.perf_counter() - self._stats_logged_at >= STATS_LOG_INTERVAL_S:
+                self._stats_logged_at = time.perf_counter()
+                stats = self.stats()
+                logging.info(f"Activity indicators: {stats['wakeups_per_s']} wakeups/s, {stats['paints_per_s']} paints/s, "
+                             f"{stats['cpu_ms_per_s']} ms CPU/s ({stats['cpu_percent']}%), {stats['subscribers']} animating")
+
+    def add_paint(self, wall_ms: float, cpu_ns: int):
+        """Called by indicators after painting (cpu_ns is 0 unless measuring)."""
+        self._paint_cost_ms += wall_ms
+        self._paints += 1
+        self._paint_cpu_ns += cpu_ns
+
+    # --- Measurement ---
+
+    def set_measurement_enabled(self, enabled: bool):
+        self.measuring = enabled
+        self.reset_stats()
+
+    def reset_stats(self):
+        self._ticks = self._frames = self._paints = 0
+        self._tick_cpu_ns = self._paint_cpu_ns = 0
+        self._stats_since = self._stats_logged_at = time.perf_counter()
+
+    def stats(self) -> dict:
+        """Counters since the last reset; the CPU figures are 0 unless measuring."""
+        seconds = max(1e-9, time.perf_counter() - self._stats_since)
+        cpu_ms = (self._tick_cpu_ns + self._paint_cpu_ns) / 1e6
+        return {"seconds": round(seconds, 2), "subscribers": len(self._subscribers), "interval_ms": self.interval_ms(),
+                "wakeups": self._ticks, "wakeups_per_s": round(self._ticks / seconds, 1),
+                "frames": self._frames, "paints": self._paints, "paints_per_s": round(self._paints / seconds, 1),
+                "tick_cpu_ms": round(self._tick_cpu_ns / 1e6, 2), "paint_cpu_ms": round(self._paint_cpu_ns / 1e6, 2),
+                "cpu_ms_per_s": round(cpu_ms / seconds, 3), "cpu_percent": round(cpu_ms / seconds / 10.0, 3)}
+
+
+_frame_clock = None
+
+
+def frame_clock() -> FrameClock:
+    """The shared FrameClock (created on first use, on the GUI thread)."""
+    global _frame_clock
+    if _frame_clock is None:
+        _frame_clock = FrameClock()
+    return _frame_clock
+
 class PulsingActivityIndicator(QWidget):
     """
     An activity indicator displaying four states with smooth transitions:
@@ -21,7 +168,8 @@ class PulsingActivityIndicator(QWidget):
     - Active (ACTIVE): Blue solid ripple expanding outwards.
     - Warning (WARNING): Orange glowing circle with faster breathing.
     - Error (ERROR): Red glowing circle with smooth blinking.
-    Uses theme colors and non-linear easing.
+    Uses theme colors and non-linear easing. Frames come from the shared FrameClock:
+    none while hidden or minimized, a few per second in the steady glow states.
     """
 
     def __init__(self, parent=None):
@@ -63,18 +211,44 @@ class PulsingActivityIndicator(QWidget):
         self._checking_pulse_phase = 0.0
         self._checking_pulse_speed = 0.06 # Faster than idle, slower than error blink
 
-        # --- Set up timer for animation ---
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._update_animation)
-        self._timer.setInterval(15) # Smooth interval
-
-        # Initialize in idle state without visual transition
-        self._ensure_timer_running()
-
-    def _ensure_timer_running(self):
-        """Starts the timer if it's not already active."""
-        if not self._timer.isActive():
-            self._timer.start()
+        # --- Animation frames come from the shared frame clock while the indicator is visible ---
+        self._last_frame_ms = 0.0
+        self._watched_window = None # Top-level window whose minimizing pauses the animation
+
+    def _frame_interval(self):
+        """Frame interval the current state needs, or None if nothing should be drawn."""
+        if not self.isVisible() or self.window().isMinimized():
+            return None
+        if self._transition_progress < 1.0 or self._target_state in (STATE_ACTIVE, STATE_LOADING):
+            return MOTION_FRAME_MS
+        return STEADY_FRAME_MS.get(self._target_state, MOTION_FRAME_MS)
+
+    def _update_subscription(self):
+        """Request frames at the rate the state needs, or pause while hidden/minimized."""
+        interval = self._frame_interval()
+        if interval is None:
+            frame_clock().release(self)
+        else:
+            frame_clock().request(self, interval)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        window = self.window()
+        if window is not self and window is not self._watched_window:
+            if self._watched_window is not None and not sip.isdeleted(self._watched_window):
+                self._watched_window.removeEventFilter(self)
+            window.installEventFilter(self) # For minimize/restore
+            self._watched_window = window
+        self._update_subscription()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_subscription()
+
+    def eventFilter(self, obj, event):
+        if obj is self._watched_window and event.type() == QEvent.Type.WindowStateChange:
+            self._update_subscription()
+        return False
 
     def _set_state(self, new_state):
         """Internal method to initiate a state transition."""
@@ -107,7 +281,7 @@ class PulsingActivityIndicator(QWidget):
         self._target_state = new_state
         self._transition_progress = 0.0
         # print(f"[Indicator] Transitioning from {self._current_visual_state} to {self._target_state}. Progress reset.")
-        self._ensure_timer_running()
+        self._update_subscription()
 
     def _get_dominant_state(self):
         """Helper to determine which state is visually dominant during transition."""
@@ -157,8 +331,23 @@ class PulsingActivityIndicator(QWidget):
         self.active_color = QColor(color)
         self.update() # Trigger repaint if needed
 
-    def _update_animation(self):
-        """Update transition progress and state-specific animations."""
+    def _advance(self, now_ms):
+        """
+        Advance the animation to now_ms if this indicator's frame interval has
+        passed (called by the frame clock). Returns True if a frame was produced.
+        """
+        interval = self._frame_interval()
+        elapsed = now_ms - self._last_frame_ms
+        if interval is None or elapsed < interval * 0.9: # Coarse timers fire a little early
+            return False
+        self._last_frame_ms = now_ms
+        self._update_animation(min(elapsed, MAX_FRAME_STEP_MS) / BASE_STEP_MS)
+        if self._frame_interval() != interval: # E.g. a transition into a steady state finished
+            self._update_subscription()
+        return True
+
+    def _update_animation(self, steps=1.0):
+        """Update transition progress and state-specific animations by `steps` 15 ms steps."""
         # --- DEBUGGING ---
         # if self._transition_progress < 1.0:
         #      print(f"[Indicator Update] Transitioning from {self._current_visual_state} to {self._target_state}. Progress: {self._transition_progress:.2f}")
@@ -166,16 +355,16 @@ class PulsingActivityIndicator(QWidget):
 
         # Update transition progress
         if self._transition_progress < 1.0:
-            self._transition_progress = min(1.0, self._transition_progress + self._transition_step)
+            self._transition_progress = min(1.0, self._transition_progress + self._transition_step * steps)
             # When transition finishes, the _current_visual_state is effectively the _target_state
             # We don't need to explicitly set _current_visual_state = _target_state here,
             # the paintEvent interpolation handles reaching the final state.
 
         # Update state-specific animation phases
-        self._idle_breath_phase = (self._idle_breath_phase + self._idle_breath_speed) % (2 * math.pi)
-        self._warning_breath_phase = (self._warning_breath_phase + self._warning_breath_speed) % (2 * math.pi)
-        self._error_blink_phase = (self._error_blink_phase + self._error_blink_speed) % (2 * math.pi)
-        self._checking_pulse_phase = (self._checking_pulse_phase + self._checking_pulse_speed) % (2 * math.pi)
+        self._idle_breath_phase = (self._idle_breath_phase + self._idle_breath_speed * steps) % (2 * math.pi)
+        self._warning_breath_phase = (self._warning_breath_phase + self._warning_breath_speed * steps) % (2 * math.pi)
+        self._error_blink_phase = (self._error_blink_phase + self._error_blink_speed * steps) % (2 * math.pi)
+        self._checking_pulse_phase = (self._checking_pulse_phase + self._checking_pulse_speed * steps) % (2 * math.pi)
 
         # --- Update ACTIVE/LOADING state ripple progress ---
         # Use faster duration for LOADING state
@@ -183,7 +372,7 @@ class PulsingActivityIndicator(QWidget):
         if self._target_state == STATE_LOADING:
             duration_steps = 150 # Faster completion (was 200)
         
-        progress_step = 1.0 / duration_steps if duration_steps > 0 else 1.0 # Avoid division by zero
+        progress_step = steps / duration_steps if duration_steps > 0 else 1.0 # Avoid division by zero
         
         new_ripples = []
         for progress in self.ripples:
@@ -331,6 +520,13 @@ class PulsingActivityIndicator(QWidget):
         return QColor(r, g, b, a)
 
     def paintEvent(self, event):
+        clock = frame_clock()
+        cpu_start = time.thread_time_ns() if clock.measuring else 0
+        start = time.perf_counter()
+        self._paint(event)
+        clock.add_paint((time.perf_counter() - start) * 1000.0, time.thread_time_ns() - cpu_start if clock.measuring else 0)
+
+    def _paint(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(Qt.PenStyle.NoPen)
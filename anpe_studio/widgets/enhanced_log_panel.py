@@ -2,11 +2,11 @@
 Enhanced log panel widget with filtering, clear, and copy capabilities.
 """
 
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView,
                              QComboBox, QPushButton, QLabel, QApplication,
                              QMessageBox, QFileDialog, QFrame)
 from PyQt6.QtCore import Qt, pyqtSlot, QUrl, QSize
-from PyQt6.QtGui import QTextCursor, QColor, QTextCharFormat, QBrush, QFont, QDesktopServices
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QDesktopServices, QAction, QKeySequence
 import logging # Import logging for level constants
 import platform # For system info
 import sys      # For Python version
@@ -15,14 +15,19 @@ from datetime import datetime # For timestamp
 import os       # For path operations
 from anpe_studio.theme import get_scroll_bar_style
 from anpe_studio.resource_manager import ResourceManager # Keep for now, might be used elsewhere
+from anpe_studio.widgets.log_list_model import LogListModel, LogEntryDelegate
+
+DEFAULT_MAX_LINES = 20000 # Lines shown for the current filter; older matching lines scroll out
 
 class EnhancedLogPanel(QWidget):
     """Enhanced log panel with filtering and copy functionality."""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, max_lines: int = DEFAULT_MAX_LINES):
         super().__init__(parent)
-        self._log_entries = [] # Store all entries for filtering
-        self._current_filter_level = logging.INFO # Default filter level
+        self.max_lines = max_lines
+        # Recent entries, with per-level indexes for filtering (the view only shows max_lines of them);
+        # older ones are spilled to disk for export
+        self.log_model = LogListModel(max_rows=max_lines, parent=self)
         self.setup_ui()
         
     def setup_ui(self):
@@ -71,19 +76,6 @@ class EnhancedLogPanel(QWidget):
         
         self.layout.addLayout(self.header_layout)
         
-        # Log text area
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setFont(QFont("Courier New", 9))
-        self.log_text.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
-        
-        # Ensure scroll bars are always visible and styled
-        self.log_text.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        self.log_text.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.log_text.setStyleSheet(get_scroll_bar_style())
-        
-        self.layout.addWidget(self.log_text, 1) # Give stretch factor
-        
         # Log level color mapping
         self.level_colors = {
             logging.DEBUG: QColor(100, 100, 100), # Gray
@@ -93,59 +85,76 @@ class EnhancedLogPanel(QWidget):
             logging.CRITICAL: QColor(128, 0, 128) # Purple
         }
 
+        # Log view: only the visible rows are painted, however many entries there are. A one-column
+        # table with fixed row heights, since a QListView re-lays out every row when rows are added
+        self.log_view = QTableView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setItemDelegate(LogEntryDelegate(self.level_colors, self.log_view))
+        self.log_view.setFont(QFont("Courier New", 9))
+        self.log_view.setShowGrid(False)
+        self.log_view.setWordWrap(False)
+        self.log_view.horizontalHeader().hide()
+        self.log_view.horizontalHeader().setStretchLastSection(True)
+        self.log_view.verticalHeader().hide()
+        self.log_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.log_view.verticalHeader().setDefaultSectionSize(QFontMetrics(self.log_view.font()).height() + 2)
+        self.log_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.log_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.log_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        
+        # Ensure scroll bars are always visible and styled
+        self.log_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.log_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff) # Long lines are elided (full text on hover)
+        self.log_view.setStyleSheet(get_scroll_bar_style())
+
+        # Copy selected lines (Ctrl+C or context menu)
+        self.copy_action = QAction("Copy", self.log_view)
+        self.copy_action.setShortcut(QKeySequence.StandardKey.Copy)
+        self.copy_action.setShortcutContext(Qt.ShortcutContext.WidgetShortcut)
+        self.copy_action.triggered.connect(self.copy_selected)
+        self.select_all_action = QAction("Select All", self.log_view)
+        self.select_all_action.setShortcut(QKeySequence.StandardKey.SelectAll)
+        self.select_all_action.setShortcutContext(Qt.ShortcutContext.WidgetShortcut)
+        self.select_all_action.triggered.connect(self.log_view.selectAll)
+        self.log_view.addAction(self.copy_action)
+        self.log_view.addAction(self.select_all_action)
+        self.log_view.setContextMenuPolicy(Qt.ContextMenuPolicy.ActionsContextMenu)
+        
+        self.layout.addWidget(self.log_view, 1) # Give stretch factor
+
     @pyqtSlot(str, int) # Slot accepts message (str) and level (int)
     def add_log_entry(self, message, level):
         """Add a log entry with a specific level."""
-        entry = {"level": level, "message": message}
-        self._log_entries.append(entry)
-        
-        # Append to display only if it passes the current filter
-        if self.should_display(entry):
-            self.append_to_display(entry)
+        self.add_log_entries([(message, level)])
 
-    def append_to_display(self, entry):
-        """Append formatted entry to the QTextEdit."""
-        level = entry["level"]
-        message = entry["message"]
-        level_name = logging.getLevelName(level)
-        
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        
-        # Format based on level
-        log_format = QTextCharFormat()
-        log_format.setForeground(QBrush(self.level_colors.get(level, QColor("black"))))
-        if level >= logging.ERROR:
-            log_format.setFontWeight(QFont.Weight.Bold)
-        
-        # Insert level name first (bold/colored)
-        level_format = QTextCharFormat()
-        level_format.setForeground(QBrush(self.level_colors.get(level, QColor("black"))))
-        level_format.setFontWeight(QFont.Weight.Bold)
-        cursor.insertText(f"[{level_name}] ", level_format)
-        
-        # Insert message with standard formatting for the level
-        cursor.insertText(message + "\n", log_format)
-        
-        # Auto-scroll to bottom
-        self.log_text.ensureCursorVisible()
+    @pyqtSlot(list)
+    def add_log_entries(self, records):
+        """Add a batch of (message, level) records with a single display update."""
+        scroll_bar = self.log_view.verticalScrollBar()
+        follow = scroll_bar.value() >= scroll_bar.maximum() # Keep following new lines unless scrolled up
+        self.log_model.add_records(records)
+        if follow:
+            self.log_view.scrollToBottom()
+
+    def set_max_lines(self, max_lines: int):
+        """Set the number of lines shown for the current filter (older lines scroll out)."""
+        self.max_lines = max_lines
+        self.log_model.set_max_rows(max_lines)
 
     def update_filter(self, level_name):
         """Update the displayed logs based on the selected filter level."""
-        self._current_filter_level = self.log_levels.get(level_name, logging.INFO)
-        self.log_text.clear()
-        for entry in self._log_entries:
-            if self.should_display(entry):
-                self.append_to_display(entry)
+        self.log_model.set_filter_level(self.log_levels.get(level_name, logging.INFO))
+        self.log_view.scrollToBottom()
 
-    def should_display(self, entry):
-        """Check if the entry's level meets the current filter level."""
-        return entry["level"] >= self._current_filter_level
+    def copy_selected(self):
+        """Copy the selected log lines to the clipboard."""
+        rows = sorted(index.row() for index in self.log_view.selectionModel().selectedRows())
+        if rows:
+            QApplication.clipboard().setText("\n".join(self.log_model.index(row).data() for row in rows))
 
     def clear_log(self):
         """Clear the log display and the stored entries."""
-        self._log_entries.clear()
-        self.log_text.clear()
+        self.log_model.clear()
 
     def prompt_export(self):
         """Show a confirmation dialog before exporting logs and system info."""
@@ -171,12 +180,12 @@ class EnhancedLogPanel(QWidget):
             logging.debug("Log export cancelled by user.")
 
     def export_log_file(self):
-        """Gather info, ask for save location, and write the log file."""
+        """Gather info, ask for save location, and stream the log to the file."""
         try:
             system_info = self._gather_system_info()
             
-            # Prepare log content
-            log_content_parts = [
+            # Header; the entries are written line by line below
+            header_parts = [
                 "========================================",
                 "        ANPE Studio Log Export",
                 "========================================",
@@ -186,13 +195,6 @@ class EnhancedLogPanel(QWidget):
                 "\n--- Log Entries ---"
             ]
             
-            # Append all log entries, regardless of current filter
-            for entry in self._log_entries:
-                level_name = logging.getLevelName(entry["level"])
-                log_content_parts.append(f"[{level_name}] {entry['message']}")
-            
-            full_log_content = "\n".join(log_content_parts)
-            
             # Suggest filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             suggested_filename = f"anpe_studio_log_{timestamp}.log"
@@ -208,7 +210,11 @@ class EnhancedLogPanel(QWidget):
             if save_path:
                 try:
                     with open(save_path, 'w', encoding='utf-8') as f:
-                        f.write(full_log_content)
+                        f.write("\n".join(header_parts))
+                        # All log entries (spilled to disk, then in memory), regardless of current filter
+                        for line in self.log_model.iter_lines():
+                            f.write("\n")
+                            f.write(line)
                     logging.info(f"Log file exported successfully to: {save_path}")
                     self._show_export_success_dialog(save_path)
                 except Exception as e:
@@ -0,0 +1,225 @@
+"""
+Table model behind the file list: one row per input with its name, size and
+estimated processing time.
+"""
+
+from array import array
+from itertools import compress
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from anpe_studio.archive_inputs import display_name
+
+COLUMN_NAME = 0
+COLUMN_SIZE = 1
+COLUMN_COST = 2
+HEADERS = ("Name", "Size", "Est. Time")
+RESET_REMOVAL_RANGES = 32 # Above this many separate row ranges, removal resets the model instead
+FEW_PATHS = 8 # Up to this many paths, remove_paths finds each row with list.index
+
+
+def format_size(num_bytes: int) -> str:
+    """Human-readable byte count (e.g. '1.4 MB')."""
+    size = float(num_bytes)
+    for unit in ("bytes", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{int(size)} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_duration(seconds: float) -> str:
+    """Short duration for estimates (e.g. '<1 s', '42 s', '3 min', '1.5 h')."""
+    if seconds < 1:
+        return "<1 s"
+    if seconds < 60:
+        return f"{seconds:.0f} s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+class FileListModel(QAbstractTableModel):
+    """
+    Input paths and sizes kept in flat parallel arrays, so a million rows
+    cost little more than the path strings themselves. Names and estimates
+    are computed only for rows the view asks about (the visible ones).
+    Sizes are in bytes, -1 if unknown.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths: List[str] = []
+        self._sizes = array("q")
+        self._path_set = set() # Same paths as _paths, for O(1) duplicate checks
+        self.total_bytes = 0   # Total size of the listed inputs (unknown sizes count as 0)
+        self.bytes_per_second: Optional[float] = None # Measured throughput; None until a batch has run
+
+    # --- Qt Model Interface ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.ToolTipRole and section == COLUMN_COST:
+            return "Estimated processing time, from the throughput measured in earlier batches"
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COLUMN_NAME:
+                return display_name(self._paths[row])
+            size = self._sizes[row]
+            if column == COLUMN_SIZE:
+                return format_size(size) if size >= 0 else "?"
+            estimate = self.estimate_seconds(size)
+            return format_duration(estimate) if estimate is not None else "-"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._paths[row] # Full path (or archive!member) on hover
+        if role == Qt.ItemDataRole.TextAlignmentRole and column != COLUMN_NAME:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """Sort rows by name, size or estimate (the estimate orders like the size)."""
+        if not self._paths or column < 0:
+            return
+        if column == COLUMN_NAME:
+            names = [display_name(path).lower() for path in self._paths]
+            key = names.__getitem__
+        else:
+            key = self._sizes.__getitem__
+        order_rows = sorted(range(len(self._paths)), key=key,
+                            reverse=(order == Qt.SortOrder.DescendingOrder))
+        self.layoutAboutToBeChanged.emit([], QAbstractTableModel.LayoutChangeHint.VerticalSortHint)
+        self._paths = [self._paths[row] for row in order_rows]
+        self._sizes = array("q", (self._sizes[row] for row in order_rows))
+        persistent = self.persistentIndexList() # Includes the selection, which follows its rows
+        if persistent:
+            new_rows = [0] * len(order_rows)
+            for new_row, old_row in enumerate(order_rows):
+                new_rows[old_row] = new_row
+            self.changePersistentIndexList(persistent, [self.index(new_rows[index.row()], index.column())
+                                                        for index in persistent])
+        self.layoutChanged.emit([], QAbstractTableModel.LayoutChangeHint.VerticalSortHint)
+
+    # --- Editing ---
+
+    def add_entries(self, entries: Iterable[Tuple[str, int]]) -> int:
+        """Append (path, size) entries that are not in the list yet. Returns the number added."""
+        new_entries = []
+        for path, size in entries:
+            if path not in self._path_set: # Set lookup: adding stays linear for huge folders
+                self._path_set.add(path)
+                new_entries.append((path, size))
+        if not new_entries:
+            return 0
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_entries) - 1)
+        for path, size in new_entries:
+            self._paths.append(path)
+            self._sizes.append(size)
+            if size > 0:
+                self.total_bytes += size
+        self.endInsertRows()
+        return len(new_entries)
+
+    def remove_rows(self, rows: Sequence[int]) -> List[str]:
+        """
+        Remove the given rows (any order) in one pass. Returns the removed paths.
+        A few contiguous ranges are removed in place; scattered selections
+        rebuild the arrays and reset the model, which is cheaper than
+        hundreds of separate row removals.
+        """
+        rows = sorted(set(row for row in rows if 0 <= row < len(self._paths)))
+        if not rows:
+            return []
+        if len(rows) == len(self._paths):
+            removed = self._paths
+            self.clear()
+            return removed
+        ranges = [] # (first, last) inclusive, ascending
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        removed = [self._paths[row] for row in rows]
+        for path in removed:
+            self._path_set.discard(path)
+        for row in rows:
+            if self._sizes[row] > 0:
+                self.total_bytes -= self._sizes[row]
+
+        if len(ranges) <= RESET_REMOVAL_RANGES:
+            for first, last in reversed(ranges): # Bottom up, so earlier rows keep their numbers
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._paths[first:last + 1]
+                del self._sizes[first:last + 1]
+                self.endRemoveRows()
+        else:
+            keep = bytearray(b"\x01") * len(self._paths)
+            for row in rows:
+                keep[row] = 0
+            self.beginResetModel()
+            self._paths = list(compress(self._paths, keep))
+            self._sizes = array("q", compress(self._sizes, keep))
+            self.endResetModel()
+        return removed
+
+    def remove_paths(self, paths: Iterable[str]) -> List[str]:
+        """Remove the given paths if listed. Returns the paths that were removed."""
+        to_remove = set(paths) & self._path_set
+        if not to_remove:
+            return []
+        if len(to_remove) <= FEW_PATHS:
+            # E.g. one finished job's file: list.index scans in C, far faster than a Python pass over every row
+            return self.remove_rows([self._paths.index(path) for path in to_remove])
+        return self.remove_rows([row for row, path in enumerate(self._paths) if path in to_remove])
+
+    def clear(self):
+        self.beginResetModel()
+        self._paths = []
+        self._sizes = array("q")
+        self._path_set = set()
+        self.total_bytes = 0
+        self.endResetModel()
+
+    def set_bytes_per_second(self, bytes_per_second: Optional[float]):
+        """Update the throughput used for estimates and refresh the estimate column."""
+        self.bytes_per_second = bytes_per_second if bytes_per_second and bytes_per_second > 0 else None
+        if self._paths:
+            self.dataChanged.emit(self.index(0, COLUMN_COST), self.index(len(self._paths) - 1, COLUMN_COST),
+                                  [Qt.ItemDataRole.DisplayRole])
+
+    # --- Queries ---
+
+    def paths(self) -> List[str]:
+        return list(self._paths)
+
+    def path_list(self) -> List[str]:
+        """The model's own list of paths, without copying (do not modify)."""
+        return self._paths
+
+    def path_at(self, row: int) -> str:
+        return self._paths[row]
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._path_set
+
+    def estimate_seconds(self, num_bytes: int) -> Optional[float]:
+        """Estimated processing time for num_bytes of text, or None if unknown."""
+        if self.bytes_per_second is None or num_bytes < 0:
+            return None
+        return num_bytes / self.bytes_per_second
+
+    def total_estimate_seconds(self) -> Optional[float]:
+        return self.estimate_seconds(self.total_bytes)
@@ -2,26 +2,42 @@
 File list widget for selecting and managing files for processing.
 """
 
+import logging
 import os
+from typing import Optional
+
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView,
     QPushButton, QFileDialog, QLabel, QMessageBox, QApplication, QStackedWidget
 )
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, Qt, QThread, QItemSelectionModel
+
+from anpe_studio.archive_inputs import ARCHIVE_PATTERNS, expand_inputs
+from anpe_studio.widgets.file_list_model import (FileListModel, COLUMN_NAME, COLUMN_SIZE, COLUMN_COST,
+                                                 format_duration, format_size)
+from anpe_studio.workers.directory_scan_worker import DirectoryScanWorker
+from anpe_studio.workers.folder_watcher import FolderWatcher
 
 # Import theme colors
 from anpe_studio.theme import PRIMARY_COLOR, LIGHT_HOVER_BLUE, TEXT_COLOR, BORDER_COLOR
 
+ROW_HEIGHT = 24 # Fixed row height: the view never measures rows, whatever the list length
+
 
 class FileListWidget(QWidget):
     """
     Widget for selecting and managing multiple files for processing.
-    Supports adding individual files, directories of files, and removing files.
+    Supports adding individual files, directories of files, and removing files,
+    and a watch mode that adds new or changed files from a watched directory.
     NOTE: Text input functionality has been moved to MainWindow.
     """
     
     # Signal emitted when the file list changes
-    filesChanged = pyqtSignal(list)  # List of file paths
+    filesChanged = pyqtSignal(int)  # Number of listed files; read file_paths for the paths
+    # Signal emitted with new or changed files found by watch mode, ready for processing
+    watchFilesReady = pyqtSignal(list)  # List of file paths
+    # Signal emitted when a scan started by add_paths finishes: directory, input keys it added, their total size
+    scanFilesAdded = pyqtSignal(str, list, 'qint64')
     
     def __init__(self, parent=None):
         """
@@ -32,9 +48,19 @@ class FileListWidget(QWidget):
         """
         super().__init__(parent)
         
-        # File paths
-        self.file_paths = []
+        # Listed inputs (paths, sizes and estimates) live in the table model
+        self.model = FileListModel(self)
+        self._scan_thread = None # Background directory scan (Add Dir)
+        self._scan_worker = None
+        self._scan_added = 0
+        self._scan_errors = []
+        self._scan_stopped = False
+        self._scan_dir = None
+        self._scan_new_keys = None # Keys added by the running scan, if it reports them (add_paths)
+        self._scan_new_bytes = 0
+        self._scan_queue = [] # Directories from add_paths waiting for the running scan
         # self.is_file_mode_flag = True # No longer needed
+        self.folder_watcher = None # Active FolderWatcher in watch mode
         
         # Set up the UI
         self.setup_ui()
@@ -52,7 +78,8 @@ class FileListWidget(QWidget):
         # --- Tip Label (for when no files are loaded) ---
         self.tip_label = QLabel()
         self.tip_label.setText(
-            "ANPE Studio only supports .txt files. Please ensure texts are cleaned before processing."
+            "ANPE Studio only supports .txt files (also inside .zip and .tar archives). "
+            "Please ensure texts are cleaned before processing."
         )
         # Align text to top-left
         self.tip_label.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
@@ -67,39 +94,57 @@ class FileListWidget(QWidget):
         """)
 
         # --- File List ---
-        self.file_list = QListWidget()
-        self.file_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
-        # self.layout.addWidget(self.file_list, 1) # Give list stretch factor # This line will be replaced
+        self.file_list = QTableView()
+        self.file_list.setModel(self.model)
+        self.file_list.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.file_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.file_list.setShowGrid(False)
+        self.file_list.setWordWrap(False)
+        self.file_list.setTextElideMode(Qt.TextElideMode.ElideMiddle)
+        self.file_list.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        vertical_header = self.file_list.verticalHeader()
+        vertical_header.hide()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(ROW_HEIGHT)
+        header = self.file_list.horizontalHeader()
+        header.setHighlightSections(False)
+        # The header gets its own (empty) selection model: with the view's, painting it checks
+        # every row to see whether a whole column is selected, which stalls on large selections
+        header.setSelectionModel(QItemSelectionModel(self.model, header))
+        # No ResizeToContents: it would measure every row
+        header.setSectionResizeMode(COLUMN_NAME, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(COLUMN_SIZE, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(COLUMN_COST, QHeaderView.ResizeMode.Interactive)
+        header.resizeSection(COLUMN_SIZE, 80)
+        header.resizeSection(COLUMN_COST, 80)
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder) # Unsorted until a header is clicked
+        self.file_list.setSortingEnabled(True)
 
-        # Apply custom styling for list items
+        # Apply custom styling for rows
         self.file_list.setStyleSheet(f"""
-            QListWidget {{
+            QTableView {{
                 border: 1px solid {BORDER_COLOR}; /* Match theme border */
                 background-color: white;
                 outline: 0; /* Remove focus outline */
             }}
-            QListWidget::item {{
-                padding: 4px 6px; /* Adjust padding as needed */
+            QTableView::item {{
+                padding: 0px 6px; /* Adjust padding as needed */
                 color: {TEXT_COLOR};
                 background-color: white;
+                border: none;
                 outline: 0;
             }}
-            QListWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {PRIMARY_COLOR};
                 color: white;
                 border: none; /* Remove selection border if any */
                 outline: 0;
             }}
-            QListWidget::item:hover:!selected {{
+            QTableView::item:hover:!selected {{
                 background-color: {LIGHT_HOVER_BLUE};
                 color: {TEXT_COLOR};
                 outline: 0;
             }}
-            /* Optional: Style for selected item when widget doesn't have focus */
-            /* QListWidget::item:selected:!active {{
-                background-color: #DDDDDD; 
-                color: {TEXT_COLOR};
-            }} */
         """)
 
         # --- View Stack (to switch between tip_label and file_list) ---
@@ -114,12 +159,17 @@ class FileListWidget(QWidget):
         self.add_files_button.setProperty("secondary", True)
         self.add_dir_button = QPushButton("Add Dir")
         self.add_dir_button.setProperty("secondary", True)
+        self.watch_dir_button = QPushButton("Watch Dir")
+        self.watch_dir_button.setProperty("secondary", True)
+        self.watch_dir_button.setCheckable(True)
+        self.watch_dir_button.setToolTip("Watch a directory and process new or changed .txt files automatically")
         self.remove_button = QPushButton("Remove Selected") # Be more specific
         self.remove_button.setProperty("secondary", True)
         self.clear_files_button = QPushButton("Clear All Files")
         self.clear_files_button.setProperty("secondary", True)
         self.file_button_layout.addWidget(self.add_files_button)
         self.file_button_layout.addWidget(self.add_dir_button)
+        self.file_button_layout.addWidget(self.watch_dir_button)
         self.file_button_layout.addStretch()
         self.file_button_layout.addWidget(self.remove_button)
         self.file_button_layout.addWidget(self.clear_files_button)
@@ -136,114 +186,290 @@ class FileListWidget(QWidget):
         # Remove input_group connection
         self.add_files_button.clicked.connect(self.add_files)
         self.add_dir_button.clicked.connect(self.add_directory)
+        self.watch_dir_button.toggled.connect(self.toggle_watch_mode)
         self.remove_button.clicked.connect(self.remove_selected)
         self.clear_files_button.clicked.connect(self.clear_files)
-        self.file_list.itemSelectionChanged.connect(self.update_status)
         # Remove text button connections
 
         # --- Initial State ---
         self.update_status() # Set initial status label
 
     def add_files(self):
-        """Add files to the list using a file dialog."""
+        """Add files to the list using a file dialog. Archives add their .txt members."""
         file_paths, _ = QFileDialog.getOpenFileNames(
-            self, "Select Files to Process", "", "Text Files (*.txt);;All Files (*)"
+            self, "Select Files to Process", "",
+            f"Text Files and Archives (*.txt {ARCHIVE_PATTERNS});;Text Files (*.txt);;"
+            f"Archives ({ARCHIVE_PATTERNS});;All Files (*)"
         )
         
         if file_paths:
-            added_count = 0
-            for path in file_paths:
-                if path not in self.file_paths:
-                    self.file_paths.append(path)
-                    item = QListWidgetItem(os.path.basename(path))
-                    item.setToolTip(path)  # Show full path on hover
-                    self.file_list.addItem(item)
-                    added_count += 1
-            
-            if added_count > 0:
+            # Members are read straight from the archive at processing time ("archive!member")
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                entries, archive_errors = expand_inputs(file_paths)
+            finally:
+                QApplication.restoreOverrideCursor()
+            if archive_errors:
+                QMessageBox.warning(self, "Error Reading Archive",
+                                    "Could not read archive contents:\n" + "\n".join(archive_errors))
+
+            if self._add_entries(entries) > 0:
                 self.update_status()
-                self.filesChanged.emit(self.file_paths)
+                self.filesChanged.emit(self.model.rowCount())
     
+    def add_paths(self, paths):
+        """
+        Add files and archives (without a dialog, e.g. from the command line) and
+        scan directories in the background, one after the other. Returns the
+        input keys newly added by the files and archives; already listed ones
+        are skipped. The keys each directory adds are reported by
+        scanFilesAdded when its scan finishes.
+        """
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                if self.is_scanning():
+                    logging.info(f"A directory scan is running; {path} is scanned after it.")
+                    self._scan_queue.append(path)
+                else:
+                    self.start_scan(path, report_added=True)
+            else:
+                files.append(path)
+        entries, archive_errors = expand_inputs(files)
+        for error in archive_errors:
+            logging.error(f"Could not read archive contents: {error}")
+        new_entries = [(path, size) for path, size in entries if path not in self.model]
+        if self._add_entries(new_entries) > 0:
+            self.update_status()
+            self.filesChanged.emit(self.model.rowCount())
+        return [path for path, _ in new_entries]
+
+    @property
+    def file_paths(self):
+        """Listed input paths in display order (the model's own list: do not modify)."""
+        return self.model.path_list()
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the listed files."""
+        return self.model.total_bytes
+
+    def _add_entries(self, entries):
+        """Append (path, size) entries that are not in the list yet. Returns the number added."""
+        added = self.model.add_entries(entries)
+        if added:
+            header = self.file_list.horizontalHeader()
+            if header.sortIndicatorSection() >= 0:
+                # Appended rows are not in sort order; drop the indicator rather than re-sort under the user
+                header.blockSignals(True)
+                header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+                header.blockSignals(False)
+        return added
+
+    def set_throughput(self, bytes_per_second: Optional[float]):
+        """Set the measured extraction throughput used for the time estimates."""
+        self.model.set_bytes_per_second(bytes_per_second)
+        self.update_status()
+
     def add_directory(self):
-        """Add all text files from a directory."""
+        """Add all text files from a directory (scanned in the background), or stop a running scan."""
+        if self.is_scanning():
+            self.stop_scan()
+            return
         dir_path = QFileDialog.getExistingDirectory(
             self, "Select Directory with Text Files"
         )
         
         if dir_path:
-            added_count = 0
-            text_files = []
-            try: # Add error handling for os.walk
-                for root, _, files in os.walk(dir_path):
-                    for file in files:
-                        if file.lower().endswith('.txt'): # Case-insensitive
-                            full_path = os.path.join(root, file)
-                            if full_path not in self.file_paths:
-                                text_files.append(full_path)
-            except OSError as e:
-                 QMessageBox.warning(self, "Error Reading Directory", f"Could not read directory contents:\n{e}")
-                 return
-
-            if not text_files:
-                 QMessageBox.information(
-                     self, "No New Text Files", 
-                     f"No new text files (.txt) found in the selected directory or its subdirectories."
-                 )
-                 return
-
-            for path in text_files:
-                 self.file_paths.append(path)
-                 item = QListWidgetItem(os.path.basename(path))
-                 item.setToolTip(path)
-                 self.file_list.addItem(item)
-                 added_count += 1
-
-            if added_count > 0:
-                self.update_status()
-                self.filesChanged.emit(self.file_paths)
+            self.start_scan(dir_path)
+
+    # --- Directory Scanning ---
+
+    def start_scan(self, dir_path: str, report_added: bool = False):
+        """
+        Scan dir_path for .txt files in a background thread, adding them to the
+        list in batches. With report_added, scanFilesAdded is emitted with the
+        newly added keys when the scan finishes (unless it was stopped).
+        """
+        if self.is_scanning():
+            return
+        self._scan_added = 0
+        self._scan_errors = []
+        self._scan_stopped = False
+        self._scan_dir = dir_path
+        self._scan_new_keys = [] if report_added else None
+        self._scan_new_bytes = 0
+        self._scan_worker = DirectoryScanWorker(dir_path)
+        self._scan_thread = QThread()
+        self._scan_worker.moveToThread(self._scan_thread)
+        self._scan_thread.started.connect(self._scan_worker.run)
+        self._scan_worker.batchFound.connect(self._on_scan_batch)
+        self._scan_worker.error.connect(self._scan_errors.append)
+        self._scan_worker.finished.connect(self._on_scan_finished)
+        self._scan_worker.finished.connect(self._scan_thread.quit)
+        self._scan_worker.finished.connect(self._scan_worker.deleteLater)
+        self._scan_thread.finished.connect(self._scan_thread.deleteLater)
+        self._scan_thread.finished.connect(self._clear_scan_thread_reference)
+        self.add_dir_button.setText("Stop Scan")
+        self._scan_thread.start()
+        self.update_status()
+
+    def stop_scan(self, wait: bool = False):
+        """Cancel a running directory scan and those queued after it (files found so far stay in the list)."""
+        self._scan_queue.clear()
+        if self._scan_worker is not None:
+            self._scan_stopped = True
+            self._scan_worker.cancel()
+        if wait and self._scan_thread is not None:
+            self._scan_thread.quit()
+            self._scan_thread.wait(5000)
+
+    def is_scanning(self) -> bool:
+        return self._scan_thread is not None
+
+    @pyqtSlot(list)
+    def _on_scan_batch(self, entries):
+        if self._scan_new_keys is not None:
+            entries = [(path, size) for path, size in entries if path not in self.model]
+            self._scan_new_keys.extend(path for path, _ in entries)
+            self._scan_new_bytes += sum(size for _, size in entries)
+        added = self._add_entries(entries)
+        if added:
+            self._scan_added += added
+            self.update_status() # filesChanged is emitted once, when the scan finishes
+
+    @pyqtSlot(int, int)
+    def _on_scan_finished(self, found: int, total_bytes: int):
+        self.add_dir_button.setText("Add Dir")
+        if self._scan_added:
+            self.filesChanged.emit(self.model.rowCount())
+        new_keys, self._scan_new_keys = self._scan_new_keys, None
+        if new_keys and not self._scan_stopped:
+            self.scanFilesAdded.emit(self._scan_dir, new_keys, self._scan_new_bytes)
+        if self._scan_errors:
+            shown = "\n".join(self._scan_errors[:10])
+            more = f"\n... and {len(self._scan_errors) - 10} more" if len(self._scan_errors) > 10 else ""
+            QMessageBox.warning(self, "Error Reading Directory", f"Could not read some directories:\n{shown}{more}")
+        elif self._scan_added == 0 and not self._scan_stopped and new_keys is not None:
+            logging.info(f"No new text files found in {self._scan_dir}") # Opened from a launch: no dialog
+        elif self._scan_added == 0 and not self._scan_stopped:
+            QMessageBox.information(
+                self, "No New Text Files", 
+                f"No new text files (.txt) found in the selected directory or its subdirectories."
+            )
+
+    @pyqtSlot()
+    def _clear_scan_thread_reference(self):
+        self._scan_thread = None
+        self._scan_worker = None
+        if self._scan_queue:
+            self.start_scan(self._scan_queue.pop(0), report_added=True)
+        self.update_status()
     
     def remove_selected(self):
         """Remove selected files from the list."""
-        selected_items = self.file_list.selectedItems()
-        if not selected_items: return
-
-        removed_count = 0
-        # Iterate backwards when removing items by index/row
-        rows_to_remove = sorted([self.file_list.row(item) for item in selected_items], reverse=True)
-
-        for row in rows_to_remove:
-             item = self.file_list.takeItem(row)
-             path_to_remove = item.toolTip() # Get full path from tooltip
-             if path_to_remove in self.file_paths:
-                 self.file_paths.remove(path_to_remove)
-                 removed_count += 1
-             del item # Explicitly delete item
-
-        if removed_count > 0:
+        rows = set()
+        for selection_range in self.file_list.selectionModel().selection():
+            rows.update(range(selection_range.top(), selection_range.bottom() + 1)) # By index: no per-item lookups
+        if not rows: return
+
+        removed_paths = self.model.remove_rows(list(rows))
+        if removed_paths:
+            if self.folder_watcher is not None:
+                for path in removed_paths:
+                    self.folder_watcher.discard_pending(path)
             self.update_status()
-            self.filesChanged.emit(self.file_paths)
+            self.filesChanged.emit(self.model.rowCount())
 
     def clear_files(self):
-        """Clear all files from the list."""
+        """Clear all files from the list (stops a running directory scan)."""
+        self.stop_scan()
         if not self.file_paths: return # Don't do anything if already empty
-        self.file_list.clear()
-        self.file_paths = []
+        self.model.clear()
         self.update_status()
-        self.filesChanged.emit(self.file_paths)
+        self.filesChanged.emit(self.model.rowCount())
     
+    def remove_files(self, paths):
+        """Remove the given paths from the list (e.g. watched files once processed)."""
+        if not self.model.remove_paths(paths): return
+        self.update_status()
+        self.filesChanged.emit(self.model.rowCount())
+
+    # --- Watch Mode ---
+
+    def toggle_watch_mode(self, enabled: bool):
+        """Start watching a user-selected directory, or stop watching."""
+        if enabled:
+            dir_path = QFileDialog.getExistingDirectory(self, "Select Directory to Watch")
+            if not dir_path:
+                self.watch_dir_button.blockSignals(True)
+                self.watch_dir_button.setChecked(False)
+                self.watch_dir_button.blockSignals(False)
+                return
+            self.start_watching(dir_path)
+        else:
+            self.stop_watching()
+
+    def start_watching(self, dir_path: str):
+        """Watch dir_path for new or changed .txt files (already processed files are skipped)."""
+        self.stop_watching()
+        self.folder_watcher = FolderWatcher(dir_path, self)
+        self.folder_watcher.filesDetected.connect(self._on_watch_files_detected)
+        self.folder_watcher.watchError.connect(
+            lambda message: QMessageBox.warning(self, "Watch Error", f"Could not scan watched directory:\n{message}"))
+        self.folder_watcher.start()
+        if not self.watch_dir_button.isChecked():
+            self.watch_dir_button.blockSignals(True)
+            self.watch_dir_button.setChecked(True)
+            self.watch_dir_button.blockSignals(False)
+        self.update_status()
+
+    def stop_watching(self):
+        """Stop watch mode. Files not yet processed are picked up again next time."""
+        if self.folder_watcher is None: return
+        watcher = self.folder_watcher
+        self.folder_watcher = None
+        pending = watcher.pending_files()
+        watcher.stop()
+        watcher.deleteLater()
+        self.remove_files(pending)
+        self.update_status()
+
+    def is_watching(self) -> bool:
+        return self.folder_watcher is not None
+
+    def mark_watch_file_processed(self, path: str):
+        """Record a watched file as processed so it is not processed again, even after a restart."""
+        if self.folder_watcher is not None:
+            self.folder_watcher.mark_processed(path)
+
+    def _on_watch_files_detected(self, paths):
+        """Show newly detected files in the list and hand them on for processing."""
+        entries, _ = expand_inputs(paths) # Adds sizes; watch mode reports plain .txt files only
+        self._add_entries(entries)
+        self.update_status()
+        self.filesChanged.emit(self.model.rowCount())
+        self.watchFilesReady.emit(list(paths))
+
     def update_status(self):
-        """Update the status label with file count."""
+        """Update the status label with file count and total size."""
         count = len(self.file_paths)
         
         if count == 0:
             self.status_label.setText("No files imported")
             self.view_stack.setCurrentWidget(self.tip_label) # Show tip label
-        elif count == 1:
-            self.status_label.setText("1 file imported")
-            self.view_stack.setCurrentWidget(self.file_list) # Show file list
         else:
-            self.status_label.setText(f"{count} files imported")
+            details = format_size(self.total_bytes)
+            estimate = self.model.total_estimate_seconds()
+            if estimate is not None:
+                details += f", est. {format_duration(estimate)}"
+            files_text = "1 file" if count == 1 else f"{count} files"
+            self.status_label.setText(f"{files_text} imported ({details})")
             self.view_stack.setCurrentWidget(self.file_list) # Show file list
+        if self.is_scanning():
+            self.status_label.setText(f"{self.status_label.text()} | Scanning directory...")
+        if self.folder_watcher is not None:
+            self.status_label.setText(f"{self.status_label.text()} | Watching: {self.folder_watcher.root}")
     
     def get_files(self):
         """
@@ -252,4 +478,4 @@ class FileListWidget(QWidget):
         Returns:
             List of file paths
         """
-        return self.file_paths.copy() 
\ No newline at end of file
+        return self.model.paths()
\ No newline at end of file
@@ -3,7 +3,9 @@ Custom QDialog to display help content from a Markdown file
 using a QTextBrowser for better formatting and scrolling.
 """
 
+import json
 import logging
+import os
 import sys
 import re
 from pathlib import Path
@@ -12,11 +14,15 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QTextBrowser, QPushButton, QDialogButtonBox, QLabel, QWidget, QHBoxLayout, QFrame, QGridLayout,
     QSplitter, QTreeWidget, QTreeWidgetItem, QSizePolicy, QScrollArea
 )
-from PyQt6.QtCore import Qt, QUrl, QSize, QCoreApplication
+from PyQt6.QtCore import Qt, QUrl, QSize, QCoreApplication, QT_VERSION_STR
 from PyQt6.QtGui import QDesktopServices, QIcon, QPixmap, QFont, QColor, QTextDocument, QGuiApplication # For opening URLs and painting
 from PyQt6.QtWidgets import QMessageBox # For About box
 from anpe_studio.theme import PRIMARY_COLOR, get_scroll_bar_style, LIGHT_HOVER_BLUE, LIGHT_GREY_BACKGROUND  # Import theme colors and scroll bar style
 from anpe_studio.resource_manager import ResourceManager
+from anpe_studio.config_utils import get_app_data_dir
+
+HELP_CACHE_FILE_NAME = "help_render_cache.json"
+HELP_CACHE_FORMAT = 1 # Bump when the markdown conversion or styling changes without a version bump
 
 class HelpDialog(QDialog):
     def __init__(self, help_file_path: Path, gui_version: str, core_version: str, parent=None):
@@ -188,8 +194,20 @@ class HelpDialog(QDialog):
         layout.addWidget(content_splitter)
 
     def load_help_content(self):
-        """Load and display the help content from the markdown file."""
+        """Load and display the help content from the markdown file (or its cached rendering)."""
         try:
+            cache_key = self._render_cache_key()
+            cached = _load_help_render(cache_key)
+            if cached is not None:
+                # Same help file and app version as last time: skip the markdown conversion and heading search
+                self.sections = cached["sections"]
+                self.section_levels = cached["section_levels"]
+                self.text_browser.setHtml(cached["html"])
+                self.heading_positions = cached["heading_positions"]
+                self.populate_navigation_tree()
+                logging.debug("Help content loaded from the render cache.")
+                return
+
             with open(self.help_file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
                 
@@ -213,11 +231,20 @@ class HelpDialog(QDialog):
                 
                 # Populate the navigation tree
                 self.populate_navigation_tree()
+
+            _save_help_render(cache_key, {"sections": self.sections, "section_levels": self.section_levels,
+                                          "html": styled_html, "heading_positions": self.heading_positions})
                 
         except Exception as e:
             self.text_browser.setPlainText(f"Error loading help content: {str(e)}")
             logging.error(f"Error loading help content: {str(e)}")
 
+    def _render_cache_key(self) -> Dict:
+        """What the rendered help depends on: the help file, the app version (styling) and Qt (heading positions)."""
+        stat = os.stat(self.help_file_path)
+        return {"format": HELP_CACHE_FORMAT, "path": str(self.help_file_path), "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size, "gui_version": self.gui_version, "qt_version": QT_VERSION_STR}
+
     def process_content(self, content):
         """Process markdown content to extract sections for navigation."""
         self.sections = {}
@@ -585,4 +612,34 @@ class HelpDialog(QDialog):
             {html_content}
         </body>
         </html>
-        """ 
\ No newline at end of file
+        """ 
+
+
+def _help_cache_path() -> Path:
+    return get_app_data_dir() / HELP_CACHE_FILE_NAME
+
+
+def _load_help_render(cache_key: Dict) -> Optional[Dict]:
+    """The cached rendering for cache_key, or None."""
+    try:
+        with open(_help_cache_path(), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("key") != cache_key:
+        return None
+    render = cache.get("render")
+    if not isinstance(render, dict) or not all(name in render for name in ("sections", "section_levels", "html", "heading_positions")):
+        return None
+    return render
+
+
+def _save_help_render(cache_key: Dict, render: Dict):
+    path = _help_cache_path()
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": cache_key, "render": render}, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logging.warning(f"Could not save the help render cache: {e}")
@@ -0,0 +1,191 @@
+"""
+Queue panel listing extraction jobs with per-job progress, reordering and cancellation.
+"""
+
+from typing import Dict, Optional
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton,
+    QLabel, QSpinBox, QProgressBar, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
+
+from anpe_studio.theme import BORDER_COLOR, get_scroll_bar_style
+from anpe_studio.workers.job_queue import (
+    JobQueueManager, Job, JOB_TEXT, PRIORITY_LABELS, STATE_QUEUED, STATE_RUNNING, STATE_FINISHED
+)
+
+COLUMN_ID, COLUMN_JOB, COLUMN_PRIORITY, COLUMN_STATUS, COLUMN_PROGRESS = range(5)
+MAX_CONCURRENT_JOBS = 8
+
+
+class JobQueuePanel(QWidget):
+    """
+    Shows the jobs of a JobQueueManager. Queued jobs can be moved up or down
+    and cancelled; running jobs can be cancelled; finished jobs can be shown
+    in the Output tab.
+    """
+
+    # Emitted with a job id when the user asks to view that job's results
+    showResultsRequested = pyqtSignal(int)
+
+    def __init__(self, manager: JobQueueManager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self._items: Dict[int, QTreeWidgetItem] = {}
+        self._progress_bars: Dict[int, QProgressBar] = {}
+        self.setup_ui()
+
+        self.manager.jobAdded.connect(self.rebuild)
+        self.manager.jobRemoved.connect(self.rebuild)
+        self.manager.jobFinished.connect(self.rebuild) # Finished jobs move to the end
+        self.manager.jobStarted.connect(self.rebuild)
+        self.manager.queueReordered.connect(self.rebuild)
+        self.manager.jobUpdated.connect(self.update_job)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        # --- Concurrency ---
+        concurrency_layout = QHBoxLayout()
+        concurrency_layout.addWidget(QLabel("Concurrent jobs:"))
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, MAX_CONCURRENT_JOBS)
+        self.concurrency_spin.setValue(self.manager.max_concurrent)
+        self.concurrency_spin.setToolTip("Jobs with different settings each load their own models; "
+                                         "jobs with the same settings share one loaded model and take turns.")
+        self.concurrency_spin.valueChanged.connect(self.manager.set_max_concurrent)
+        concurrency_layout.addWidget(self.concurrency_spin)
+        concurrency_layout.addStretch()
+        layout.addLayout(concurrency_layout)
+
+        # --- Job List ---
+        self.job_tree = QTreeWidget()
+        self.job_tree.setHeaderLabels(["#", "Job", "Priority", "Status", "Progress"])
+        self.job_tree.setRootIsDecorated(False)
+        self.job_tree.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.job_tree.setStyleSheet(f"QTreeWidget {{ border: 1px solid {BORDER_COLOR}; }}" + get_scroll_bar_style())
+        header = self.job_tree.header()
+        header.setSectionResizeMode(COLUMN_ID, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(COLUMN_JOB, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(COLUMN_PRIORITY, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(COLUMN_STATUS, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(COLUMN_PROGRESS, QHeaderView.ResizeMode.Fixed)
+        header.resizeSection(COLUMN_PROGRESS, 120)
+        self.job_tree.itemSelectionChanged.connect(self.update_buttons)
+        self.job_tree.itemDoubleClicked.connect(lambda item, _column: self.request_show_results())
+        layout.addWidget(self.job_tree, 1)
+
+        # --- Actions ---
+        button_layout = QHBoxLayout()
+        self.move_up_button = QPushButton("Move Up")
+        self.move_down_button = QPushButton("Move Down")
+        self.cancel_button = QPushButton("Cancel Job")
+        self.show_results_button = QPushButton("Show Results")
+        self.clear_finished_button = QPushButton("Clear Finished")
+        for button in (self.move_up_button, self.move_down_button, self.cancel_button,
+                       self.show_results_button, self.clear_finished_button):
+            button.setProperty("secondary", True)
+        button_layout.addWidget(self.move_up_button)
+        button_layout.addWidget(self.move_down_button)
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.show_results_button)
+        button_layout.addWidget(self.clear_finished_button)
+        layout.addLayout(button_layout)
+
+        self.move_up_button.clicked.connect(lambda: self._move_selected(-1))
+        self.move_down_button.clicked.connect(lambda: self._move_selected(1))
+        self.cancel_button.clicked.connect(self._cancel_selected)
+        self.show_results_button.clicked.connect(self.request_show_results)
+        self.clear_finished_button.clicked.connect(self.manager.remove_finished)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.rebuild()
+
+    def selected_job(self) -> Optional[Job]:
+        items = self.job_tree.selectedItems()
+        if not items:
+            return None
+        return self.manager.get(items[0].data(COLUMN_ID, Qt.ItemDataRole.UserRole))
+
+    @pyqtSlot()
+    def rebuild(self, *args):
+        """Recreate all rows in the manager's display order, keeping the selection."""
+        selected = self.selected_job()
+        self.job_tree.clear()
+        self._items = {}
+        self._progress_bars = {}
+        for job in self.manager.jobs():
+            item = QTreeWidgetItem()
+            item.setData(COLUMN_ID, Qt.ItemDataRole.UserRole, job.id)
+            self.job_tree.addTopLevelItem(item)
+            progress_bar = QProgressBar()
+            progress_bar.setRange(0, 100)
+            progress_bar.setFixedHeight(16)
+            self.job_tree.setItemWidget(item, COLUMN_PROGRESS, progress_bar)
+            self._items[job.id] = item
+            self._progress_bars[job.id] = progress_bar
+            self.update_job(job.id)
+            if selected is not None and selected.id == job.id:
+                item.setSelected(True)
+        self.update_buttons()
+
+    @pyqtSlot(int)
+    def update_job(self, job_id: int):
+        """Refresh one row."""
+        job = self.manager.get(job_id)
+        item = self._items.get(job_id)
+        if job is None or item is None:
+            return
+        item.setText(COLUMN_ID, str(job.id))
+        item.setText(COLUMN_JOB, job.label)
+        item.setToolTip(COLUMN_JOB, job.label if job.kind == JOB_TEXT else "\n".join(job.file_paths[:20]))
+        item.setText(COLUMN_PRIORITY, PRIORITY_LABELS.get(job.priority, str(job.priority)))
+        status = job.state if not job.status_message or job.state == STATE_QUEUED else f"{job.state}: {job.status_message}"
+        item.setText(COLUMN_STATUS, status)
+        item.setToolTip(COLUMN_STATUS, status)
+        progress_bar = self._progress_bars.get(job_id)
+        if progress_bar is not None:
+            if job.state == STATE_RUNNING and job.kind == JOB_TEXT:
+                progress_bar.setRange(0, 0) # Indeterminate while a text job runs
+            else:
+                progress_bar.setRange(0, 100)
+                progress_bar.setValue(100 if job.state == STATE_FINISHED else job.progress)
+        self._update_summary()
+        if self.selected_job() is job:
+            self.update_buttons()
+
+    def _update_summary(self):
+        jobs = self.manager.jobs()
+        running = sum(1 for job in jobs if job.state == STATE_RUNNING)
+        queued = sum(1 for job in jobs if job.state == STATE_QUEUED)
+        self.summary_label.setText(f"{running} running, {queued} queued, {len(jobs) - running - queued} finished")
+
+    @pyqtSlot()
+    def update_buttons(self):
+        job = self.selected_job()
+        is_queued = job is not None and job.state == STATE_QUEUED
+        self.move_up_button.setEnabled(is_queued)
+        self.move_down_button.setEnabled(is_queued)
+        self.cancel_button.setEnabled(job is not None and not job.is_finished)
+        self.show_results_button.setEnabled(job is not None and job.results is not None)
+        self.clear_finished_button.setEnabled(any(other.is_finished for other in self.manager.jobs()))
+
+    def _move_selected(self, delta: int):
+        job = self.selected_job()
+        if job is not None:
+            self.manager.move(job.id, delta)
+
+    def _cancel_selected(self):
+        job = self.selected_job()
+        if job is not None:
+            self.manager.cancel(job.id)
+
+    def request_show_results(self):
+        job = self.selected_job()
+        if job is not None and job.results is not None:
+            self.showResultsRequested.emit(job.id)
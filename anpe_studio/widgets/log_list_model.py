@@ -0,0 +1,222 @@
+"""
+List model and delegate behind the log panel: one row per log line, with
+level filtering that does not touch the stored entries.
+"""
+
+import logging
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QSize, Qt
+from PyQt6.QtGui import QColor, QFont, QFontMetrics
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate
+
+from anpe_studio.log_spill import LogSpill
+
+FILTER_LEVELS = (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+DEFAULT_MAX_ROWS = 20000 # Rows shown for the current filter; older matching lines scroll out
+DEFAULT_MAX_ENTRIES = 100000 # Lines kept in memory; older ones move to the on-disk spill
+EVICTION_SLACK = 0.1 # Evict only once this fraction over the cap, so eviction runs rarely
+
+LevelRole = Qt.ItemDataRole.UserRole + 1    # int log level
+MessageRole = Qt.ItemDataRole.UserRole + 2  # Message without the level prefix
+
+
+class LogListModel(QAbstractListModel):
+    """
+    Log lines stored compactly (messages in a list, levels in a byte-sized
+    array) with one index array per filter level, listing the lines at or
+    above that level. Switching the filter swaps the active index array
+    and resets the view, so it costs O(visible rows), not O(entries).
+    Multi-line messages (e.g. tracebacks) are stored one line per entry.
+
+    At most max_entries lines are kept in memory. Beyond that the oldest
+    lines are written to a LogSpill (rotating segment files) and dropped
+    from memory; iter_lines() streams the spill followed by memory, so an
+    export still covers the whole session, up to the spill's own size cap.
+    """
+
+    def __init__(self, max_rows: int = DEFAULT_MAX_ROWS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 spill: Optional[LogSpill] = None, parent=None):
+        super().__init__(parent)
+        self._messages: List[str] = []
+        self._levels = array("B") # Level numbers fit in a byte (custom levels are clamped)
+        self._by_level: Dict[int, array] = {level: array("L") for level in FILTER_LEVELS}
+        self._filter_level = logging.INFO
+        self.max_rows = max(1, max_rows)
+        self.max_entries = max(self.max_rows, max_entries)
+        self._shown = 0 # Rows exposed to the view: the newest max_rows lines of the active index array
+        self._spill = spill if spill is not None else LogSpill()
+
+    # --- Qt Model Interface ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._shown
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entry_at(index.row())
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return f"[{logging.getLevelName(self._levels[entry])}] {self._messages[entry]}"
+        if role == LevelRole:
+            return self._levels[entry]
+        if role == MessageRole:
+            return self._messages[entry]
+        return None
+
+    def _entry_at(self, row: int) -> int:
+        visible = self._by_level[self._filter_level]
+        return visible[len(visible) - self._shown + row]
+
+    # --- Editing ---
+
+    def add_records(self, records: List[Tuple[str, int]]):
+        """Append (message, level) records and show those passing the filter."""
+        visible = self._by_level[self._filter_level]
+        visible_before = len(visible)
+        targets = {} # level -> index arrays the level's lines go into
+        for message, level in records:
+            level = min(max(level, 0), 255)
+            arrays = targets.get(level)
+            if arrays is None:
+                arrays = targets[level] = [indexes for threshold, indexes in self._by_level.items() if level >= threshold]
+            for line in message.split("\n"):
+                entry = len(self._messages)
+                self._messages.append(line)
+                self._levels.append(level)
+                for indexes in arrays:
+                    indexes.append(entry)
+        added = len(visible) - visible_before
+        if added >= self.max_rows:
+            self.beginResetModel() # Everything shown is replaced
+            self._shown = self.max_rows
+            self.endResetModel()
+        elif added > 0:
+            overflow = self._shown + added - self.max_rows
+            if overflow > 0: # Oldest rows scroll out to keep the row cap
+                self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+                self._shown -= overflow
+                self.endRemoveRows()
+            self.beginInsertRows(QModelIndex(), self._shown, self._shown + added - 1)
+            self._shown += added
+            self.endInsertRows()
+        if len(self._messages) > self.max_entries * (1 + EVICTION_SLACK):
+            self._evict(len(self._messages) - self.max_entries)
+
+    def _evict(self, count: int):
+        """Move the oldest count lines to the spill and renumber the index arrays."""
+        self._spill.write_lines(self._format_lines(0, count))
+        visible = self._by_level[self._filter_level]
+        lost = self._shown - (len(visible) - bisect_left(visible, count)) # Shown rows among the evicted lines
+        if lost > 0: # Only with a strict filter, whose matching lines are all old
+            self.beginRemoveRows(QModelIndex(), 0, lost - 1)
+        del self._messages[:count]
+        del self._levels[:count]
+        for level, indexes in self._by_level.items():
+            self._by_level[level] = array("L", [entry - count for entry in indexes[bisect_left(indexes, count):]])
+        if lost > 0:
+            self._shown -= lost
+            self.endRemoveRows()
+
+    def set_filter_level(self, level: int):
+        """Show lines at or above level (one of FILTER_LEVELS)."""
+        if level not in self._by_level:
+            raise ValueError(f"Unsupported filter level: {level}")
+        self.beginResetModel()
+        self._filter_level = level
+        self._shown = min(len(self._by_level[level]), self.max_rows)
+        self.endResetModel()
+
+    def set_max_rows(self, max_rows: int):
+        self.beginResetModel()
+        self.max_rows = max(1, max_rows)
+        self.max_entries = max(self.max_rows, self.max_entries)
+        self._shown = min(len(self._by_level[self._filter_level]), self.max_rows)
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._messages = []
+        self._levels = array("B")
+        self._by_level = {level: array("L") for level in FILTER_LEVELS}
+        self._shown = 0
+        self._spill.clear()
+        self.endResetModel()
+
+    def close(self):
+        """Delete the spill files. Call when the log is no longer needed."""
+        self._spill.close()
+
+    # --- Queries ---
+
+    @property
+    def filter_level(self) -> int:
+        return self._filter_level
+
+    def entry_count(self) -> int:
+        """Lines held in memory, whatever the filter."""
+        return len(self._messages)
+
+    def spilled_count(self) -> int:
+        """Older lines held on disk."""
+        return self._spill.line_count
+
+    def _format_lines(self, start: int, stop: int) -> Iterator[str]:
+        for index in range(start, stop):
+            yield f"[{logging.getLevelName(self._levels[index])}] {self._messages[index]}"
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        All lines of the session as '[LEVEL] message', oldest first, regardless
+        of the filter: the spill from disk, then the lines in memory. Lines
+        too old for the spill are summarized in a note.
+        """
+        if self._spill.discarded_lines:
+            yield f"[NOTE] {self._spill.discarded_lines} older log line(s) were discarded to bound disk usage."
+        yield from self._spill.iter_lines()
+        yield from self._format_lines(0, len(self._messages))
+
+
+class LogEntryDelegate(QStyledItemDelegate):
+    """Paints a log row as a bold, level-colored '[LEVEL]' prefix and the message (bold for errors)."""
+
+    def __init__(self, level_colors: Dict[int, QColor], parent=None):
+        super().__init__(parent)
+        self.level_colors = level_colors
+
+    def _color_for(self, level: int) -> QColor:
+        color = self.level_colors.get(level)
+        if color is None: # Custom level: color of the nearest standard level below it
+            known = [known_level for known_level in self.level_colors if known_level <= level]
+            color = self.level_colors[max(known)] if known else QColor("black")
+        return color
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        style = option.widget.style() if option.widget else QApplication.style()
+        option.text = ""
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget) # Background/selection
+
+        level = index.data(LevelRole)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        color = option.palette.highlightedText().color() if selected else self._color_for(level)
+        rect = option.rect.adjusted(4, 0, -4, 0)
+
+        painter.save()
+        painter.setPen(color)
+        bold_font = QFont(option.font)
+        bold_font.setBold(True)
+        prefix = f"[{logging.getLevelName(level)}] "
+        painter.setFont(bold_font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, prefix)
+        rect.setLeft(rect.left() + QFontMetrics(bold_font).horizontalAdvance(prefix))
+        message_font = bold_font if level >= logging.ERROR else option.font
+        painter.setFont(message_font)
+        message = QFontMetrics(message_font).elidedText(index.data(MessageRole), Qt.TextElideMode.ElideRight, rect.width())
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, message)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), QFontMetrics(option.font).height() + 2)
@@ -21,6 +21,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QColor, QFont, QStandardItemModel, QStandardItem, QIcon, QKeySequence, QShortcut
 from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QVariant, QSortFilterProxyModel, QRegularExpression, QSize
+from anpe_studio import tracing
 from anpe_studio.resource_manager import ResourceManager
 
 # Attempt relative import first, then absolute
@@ -607,19 +608,20 @@ class ResultDisplayWidget(QWidget):
         # AnpeResultModel will handle this by creating an empty tree.
 
         try:
-            logging.debug("Creating source model...")
-            self.source_model = AnpeResultModel(actual_np_results) # Pass the list directly
+            with tracing.span("build result model", "display", noun_phrases=len(actual_np_results)):
+                logging.debug("Creating source model...")
+                self.source_model = AnpeResultModel(actual_np_results) # Pass the list directly
             
-            logging.debug("Creating custom proxy model for numeric sorting...")
-            # Use our custom QSortFilterProxyModel that handles numeric sorting
-            self.proxy_model = AnpeResultProxyModel() 
-            self.proxy_model.setSourceModel(self.source_model)
-            self.proxy_model.setFilterKeyColumn(AnpeResultModel.COL_NP) # Filter by NP
-            self.proxy_model.setRecursiveFilteringEnabled(True)
-            self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+                logging.debug("Creating custom proxy model for numeric sorting...")
+                # Use our custom QSortFilterProxyModel that handles numeric sorting
+                self.proxy_model = AnpeResultProxyModel() 
+                self.proxy_model.setSourceModel(self.source_model)
+                self.proxy_model.setFilterKeyColumn(AnpeResultModel.COL_NP) # Filter by NP
+                self.proxy_model.setRecursiveFilteringEnabled(True)
+                self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
             
-            logging.debug("Setting model on tree view...")
-            self.tree_view.setModel(self.proxy_model)
+                logging.debug("Setting model on tree view...")
+                self.tree_view.setModel(self.proxy_model)
             # Reset sorting when new data is loaded to default (order)
             # Important: -1 means unsorted (original order)
             self.proxy_model.sort(-1, Qt.SortOrder.AscendingOrder)
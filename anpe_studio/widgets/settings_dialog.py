@@ -17,12 +17,14 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox,
     QGridLayout, QProgressBar, QMessageBox, QWidget, QSpacerItem, QSizePolicy,
     QApplication, QFrame, QStackedWidget, QListWidget, QListWidgetItem, 
-    QSplitter, QFormLayout, QComboBox, QTextEdit, QToolButton # Added QToolButton
+    QSplitter, QFormLayout, QComboBox, QTextEdit, QToolButton, QCheckBox # Added QToolButton
 )
 from PyQt6.QtGui import QIcon, QPixmap, QTextCursor, QColor, QTransform, QDesktopServices # <<< Added QDesktopServices
 
 from anpe_studio.theme import ERROR_COLOR, PRIMARY_COLOR, SUCCESS_COLOR, get_scroll_bar_style, LIGHT_HOVER_BLUE # Import theme elements
 from anpe_studio.resource_manager import ResourceManager # ADDED THIS IMPORT
+from anpe_studio.config_utils import (OUT_OF_PROCESS_KEY, TRACE_DIR_NAME, TRACING_KEY, get_app_data_dir,
+                                      read_out_of_process_preference, read_tracing_preference)
 from anpe_studio.widgets.activity_indicator import PulsingActivityIndicator # IMPORT THE INDICATOR
 # Import the worker classes from their new location
 from anpe_studio.workers.settings_workers import (
@@ -72,6 +74,7 @@ class ModelsPage(QWidget):
     # Signals to notify the parent dialog (and potentially main window)
     models_changed = pyqtSignal() 
     model_usage_changed = pyqtSignal()
+    tracing_changed = pyqtSignal(bool)
 
     def __init__(self, parent=None, model_status=None):
         super().__init__(parent)
@@ -182,6 +185,20 @@ class ModelsPage(QWidget):
         benepar_explanation_label.setStyleSheet(explanation_style)
         # Add explanation spanning both columns
         usage_layout.addRow(benepar_explanation_label)
+
+        self.out_of_process_checkbox = QCheckBox("Run extraction in a separate process")
+        self.out_of_process_checkbox.setToolTip("Parse in a background process so the window stays responsive during long runs.\n"
+                                                "Models are loaded once per process and kept for later runs.")
+        self.out_of_process_checkbox.setChecked(read_out_of_process_preference()) # Before signals are connected
+        usage_layout.addRow(self.out_of_process_checkbox)
+
+        self.tracing_checkbox = QCheckBox("Record a performance trace")
+        self.tracing_checkbox.setToolTip("Record a timeline of reading, parsing, result delivery, display and export.\n"
+                                         "It is saved when recording is switched off or Studio closes, as a file in\n"
+                                         f"{get_app_data_dir() / TRACE_DIR_NAME}\n"
+                                         "that chrome://tracing or ui.perfetto.dev can open.")
+        self.tracing_checkbox.setChecked(read_tracing_preference()) # Before signals are connected
+        usage_layout.addRow(self.tracing_checkbox)
         # --------------------------
 
         main_layout.addWidget(usage_group)
@@ -381,6 +398,8 @@ class ModelsPage(QWidget):
         # Usage settings
         self.spacy_usage_combo.currentTextChanged.connect(self.save_usage_settings)
         self.benepar_usage_combo.currentTextChanged.connect(self.save_usage_settings)
+        self.out_of_process_checkbox.toggled.connect(self.save_out_of_process_setting)
+        self.tracing_checkbox.toggled.connect(self.save_tracing_setting)
         # Management actions
         self.refresh_button.clicked.connect(self.refresh_status) # <<< Connects to the NEW async refresh_status
         # Connect the new button to the dynamic handler (to be created)
@@ -434,6 +453,22 @@ class ModelsPage(QWidget):
         logging.info(f"Saved usage settings: spaCy={spacy_pref}, Benepar={benepar_pref}")
         self.model_usage_changed.emit() # Signal that usage pref changed
 
+    @pyqtSlot(bool)
+    def save_out_of_process_setting(self, enabled: bool):
+        """Save whether extraction runs in a separate process."""
+        self.settings.setValue(OUT_OF_PROCESS_KEY, enabled)
+        self.settings.sync()
+        logging.info(f"Saved out-of-process extraction setting: {enabled}")
+        self.model_usage_changed.emit() # Main window applies it to the job queue
+
+    @pyqtSlot(bool)
+    def save_tracing_setting(self, enabled: bool):
+        """Save whether a performance trace is recorded."""
+        self.settings.setValue(TRACING_KEY, enabled)
+        self.settings.sync()
+        logging.info(f"Saved performance tracing setting: {enabled}")
+        self.tracing_changed.emit(enabled)
+
     def _update_usage_combos(self, installed_spacy: list, installed_benepar: list):
         """Updates the items in the usage combo boxes based on the provided lists."""
         current_spacy_selection = self.spacy_usage_combo.currentText()
@@ -2079,12 +2114,11 @@ class AboutPage(QWidget):
         icon_label = QLabel()
         icon_label.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
         try:
-             pixmap = ResourceManager.get_pixmap("app_icon_logo_transparent.png")
+             pixmap = ResourceManager.get_pixmap("app_icon_logo_transparent.png", size=100)
         except ImportError:
              logging.warning("ResourceManager not found, using placeholder icon.")
              pixmap = QPixmap(100, 100)
              pixmap.fill(Qt.GlobalColor.gray)
-        pixmap = pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
         icon_label.setPixmap(pixmap)
         icon_label.setFixedSize(100, 100)
         header_layout.addWidget(icon_label, 0, Qt.AlignmentFlag.AlignTop)
@@ -2457,6 +2491,7 @@ class SettingsDialog(QDialog):
     models_changed = pyqtSignal(dict)  # Now includes complete status data
     # Signal emitted if model usage preference changes
     model_usage_changed = pyqtSignal() 
+    tracing_changed = pyqtSignal(bool) # Performance tracing switched on/off
     restart_application_requested = pyqtSignal() # ADDED FOR RESTART FUNCTIONALITY
 
     def __init__(self, parent=None, model_status=None):
@@ -2487,6 +2522,21 @@ class SettingsDialog(QDialog):
         # Install event filter to capture Alt key presses/releases globally within the dialog
         self.installEventFilter(self)
 
+    def prepare_to_show(self, model_status=None):
+        """
+        Refresh a dialog that is being reopened (the main window builds it once
+        and reuses it): show the latest model status and the first page again.
+        """
+        if model_status is not None and model_status is not self.model_status:
+            self.model_status = model_status
+            # A running install/uninstall/status check reports its own result when it finishes
+            if self.models_page and not self.models_page.is_worker_running():
+                self.models_page.model_status = model_status
+                self.models_page._update_ui_from_status(model_status)
+        if self.nav_list.count() > 0:
+            self.nav_list.setCurrentRow(0)
+        self._center_on_screen()
+
     def _center_on_screen(self):
         """Centers the dialog on the primary screen."""
         try:
@@ -2611,6 +2661,7 @@ class SettingsDialog(QDialog):
         # Connect signals from ModelsPage to SettingsDialog signals
         self.models_page.models_changed.connect(self.models_changed.emit)
         self.models_page.model_usage_changed.connect(self.model_usage_changed.emit)
+        self.models_page.tracing_changed.connect(self.tracing_changed.emit)
 
     # --- Event Filter Implementation --- 
     def eventFilter(self, source, event):
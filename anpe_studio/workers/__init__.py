@@ -1,6 +1,20 @@
-"""Make worker classes available."""
+"""Make worker classes available (imported on first access, see anpe_studio.widgets)."""
 
-from .extraction_worker import ExtractionWorker
-from .batch_worker import BatchWorker
-from .log_handler import QtLogHandler # Keep existing if needed
-# Add others if they exist and are needed 
\ No newline at end of file
+import importlib
+
+_LAZY_WORKERS = {
+    "ExtractionWorker": "anpe_studio.workers.extraction_worker",
+    "BatchWorker": "anpe_studio.workers.batch_worker",
+    "QtLogHandler": "anpe_studio.workers.log_handler", # Keep existing if needed
+}
+
+__all__ = list(_LAZY_WORKERS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_WORKERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -4,7 +4,13 @@ Worker for handling batch file extraction in a background thread.
 
 import os
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
-from anpe import ANPEExtractor
+from anpe_studio.archive_inputs import InputTextReader, display_name
+from anpe_studio.config_utils import apply_model_preferences
+from anpe_studio.extractor_pool import ExtractorPool, PooledExtractor, anpe_extractor_factory
+from anpe_studio.daemon import DaemonClient, DaemonError, find_running_daemon
+from anpe_studio.engine_process import EngineError, EngineProcessPool
+from anpe_studio.result_store import ResultStore
+from anpe_studio.workers.signal_coalescer import BatchSignalCoalescer
 from typing import Dict, Any, List, Optional 
 import logging 
 
@@ -15,7 +21,7 @@ class BatchSignals(QObject):
     progress = pyqtSignal(int, str) # Percentage, Status message (context for % update)
     error = pyqtSignal(str)        # Emits error message string
     finished = pyqtSignal()      # Emitted when processing finishes (success or error)
-    file_result = pyqtSignal(str, dict) # Emits file path and result dictionary
+    file_results = pyqtSignal(list) # Emits [(file path, result id), ...] finished since the last batch; results are in the ResultStore
 
 class BatchWorker(QObject):
     """Performs ANPE extraction on multiple files using provided config."""
@@ -23,7 +29,11 @@ class BatchWorker(QObject):
     def __init__(self, file_paths: List[str], config: Dict[str, Any], anpe_version: str,
                  include_metadata: bool, include_nested: bool,
                  spacy_model_preference: Optional[str] = None, # Added preference
-                 benepar_model_preference: Optional[str] = None): # Added preference
+                 benepar_model_preference: Optional[str] = None, # Added preference
+                 use_daemon: bool = True, # Use a running extraction daemon if available
+                 extractor_pool: Optional[ExtractorPool] = None, # Shared warm extractors (job queue)
+                 engine_pool: Optional[EngineProcessPool] = None, # Extract in a child process (job queue)
+                 result_store: Optional[ResultStore] = None): # Where results are put (shared by the job queue)
         super().__init__()
         # Store config and input data
         self.file_paths = file_paths
@@ -33,91 +43,190 @@ class BatchWorker(QObject):
         self.include_nested = include_nested   # For output formatting
         self.spacy_model_preference = spacy_model_preference # Store preference
         self.benepar_model_preference = benepar_model_preference # Store preference
+        self.use_daemon = use_daemon
+        self.extractor_pool = extractor_pool
+        self.engine_pool = engine_pool
+        self.result_store = result_store if result_store is not None else ResultStore()
         self.signals = BatchSignals()
+        # Status, progress and results reach the GUI at a fixed rate, results in batches
+        self._coalescer = BatchSignalCoalescer(self.signals)
         self._is_cancelled = False
+        self._engine = None # Engine process running this batch, if any
 
     @pyqtSlot()
     def run(self):
         """Execute the batch extraction process."""
         self.signals.started.emit()
         logging.info(f"Starting processing for {len(self.file_paths)} files...")
-        results = {}
         total_files = len(self.file_paths)
-        extractor: Optional[ANPEExtractor] = None # Define extractor variable
+        extractor = None # ANPEExtractor or PooledExtractor
         
         try:
+            # Prefer a running daemon with warm models (thin client mode)
+            daemon_client = find_running_daemon() if self.use_daemon else None
+            if daemon_client is not None and self._run_via_daemon(daemon_client):
+                return
+
             # Create extractor instance ONCE with the specific config for this batch run
             # Prepare the config, adding model preferences if they exist
-            run_config = self.config.copy() # Start with base config
-            if self.spacy_model_preference:
-                run_config['spacy_model'] = self.spacy_model_preference
-            if self.benepar_model_preference:
-                run_config['benepar_model'] = self.benepar_model_preference
+            run_config = apply_model_preferences(self.config, self.spacy_model_preference,
+                                                 self.benepar_model_preference)
+
+            # Extract in an engine process so parsing does not compete with the GUI for the GIL
+            if self.engine_pool is not None and self._run_in_engine(run_config):
+                return
                 
-            logging.debug(f"WORKER (Batch): Creating ANPEExtractor with effective config: {run_config}")
             # logging.debug(f"WORKER (Batch): Model Prefs: spaCy='{self.spacy_model_preference}', Benepar='{self.benepar_model_preference}'") # Commented out old log
-            extractor = ANPEExtractor(
-                config=run_config # Pass the updated config
-                # spacy_model=self.spacy_model_preference, # Removed direct argument
-                # benepar_model=self.benepar_model_preference # Removed direct argument
-            )
+            if self.extractor_pool is not None:
+                logging.debug(f"WORKER (Batch): Using shared warm extractor for effective config: {run_config}")
+                extractor = PooledExtractor(self.extractor_pool, run_config)
+            else:
+                logging.debug(f"WORKER (Batch): Creating ANPEExtractor with effective config: {run_config}")
+                extractor = anpe_extractor_factory(run_config) # Imports anpe on first use
 
-            for i, file_path in enumerate(self.file_paths):
-                if self._is_cancelled:
-                    logging.info("Cancellation requested.")
-                    break
-                
-                file_name = os.path.basename(file_path)
-                # Emit status update BEFORE processing the file
-                status_msg_processing = f"Processing ({i+1}/{total_files}): {file_name}"
-                self.signals.status_update.emit(status_msg_processing)
-
-                try:
-                    # Log start of processing this specific file
-                    logging.info(f"Processing ({i+1}/{total_files}): {file_name}")
-                    
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                    
-                    # Use the pre-configured extractor instance
-                    logging.debug(f"Extracting from file '{file_name}'. Options: meta={self.include_metadata}, nested={self.include_nested}")
-                    file_result = extractor.extract(
-                        text=text,
-                        metadata=self.include_metadata,
-                        include_nested=self.include_nested
-                    )
-                    results[file_path] = file_result
-                    # Emit result for this single file immediately
-                    self.signals.file_result.emit(file_path, file_result)
-                    
-                except Exception as file_e:
-                    logging.error(f"Error processing file {file_path}: {file_e}", exc_info=True)
-                    error_info = {"error": str(file_e)}
-                    results[file_path] = error_info
-                    # Emit error info for this file
-                    self.signals.file_result.emit(file_path, error_info)
-                    # Continue processing other files
-                
-                # MOVED progress calculation and emit to *after* processing the file
-                progress_percent = int(((i + 1) / total_files) * 100)
-                self.signals.progress.emit(progress_percent, "") # Send empty string
+            # Inputs (plain files or archive members) are read ahead on a background thread
+            with InputTextReader(self.file_paths) as reader:
+                for i, (file_path, text, read_error) in enumerate(reader):
+                    if self._is_cancelled:
+                        logging.info("Cancellation requested.")
+                        break
+
+                    file_name = display_name(file_path)
+                    # Emit status update BEFORE processing the file
+                    status_msg_processing = f"Processing ({i+1}/{total_files}): {file_name}"
+                    self._coalescer.post_status(status_msg_processing)
+
+                    try:
+                        # Log start of processing this specific file
+                        logging.info(f"Processing ({i+1}/{total_files}): {file_name}")
+                        if read_error is not None:
+                            raise OSError(read_error)
+
+                        # Use the pre-configured extractor instance
+                        logging.debug(f"Extracting from file '{file_name}'. Options: meta={self.include_metadata}, nested={self.include_nested}")
+                        file_result = extractor.extract(
+                            text=text,
+                            metadata=self.include_metadata,
+                            include_nested=self.include_nested
+                        )
+                        # Queue the result; it is delivered with the next batch
+                        self._coalescer.post_result(file_path, self.result_store.put(file_result))
+
+                    except Exception as file_e:
+                        logging.error(f"Error processing file {file_path}: {file_e}", exc_info=True)
+                        error_info = {"error": str(file_e)}
+                        # Emit error info for this file
+                        self._coalescer.post_result(file_path, self.result_store.put(error_info))
+                        # Continue processing other files
+
+                    # MOVED progress calculation and emit to *after* processing the file
+                    progress_percent = int(((i + 1) / total_files) * 100)
+                    self._coalescer.post_progress(progress_percent)
 
 
             if not self._is_cancelled:
                 logging.info("Batch processing successful.")
-                # No longer need to emit the full results dict here, handled per file
-                # self.signals.result.emit(results) 
             else:
                 logging.info("Batch processing cancelled.")
 
         except Exception as e:
             logging.error(f"Unhandled error during batch processing: {e}", exc_info=True)
-            self.signals.error.emit(str(e))
+            self._coalescer.post_error(str(e))
         finally:
             logging.info("Finishing.")
-            self.signals.finished.emit()
+            self._coalescer.post_finished() # Delivered after the remaining results
+
+    def _run_via_daemon(self, client: DaemonClient) -> bool:
+        """
+        Stream the batch through the extraction daemon, emitting the same signals
+        as the local loop. Returns False if the daemon failed before any file was
+        processed, so the caller can fall back to local extraction.
+        """
+        total_files = len(self.file_paths)
+        completed = 0
+        logging.info(f"Using extraction daemon at {client.address}")
+        if total_files:
+            self._coalescer.post_status(f"Processing (1/{total_files}): {display_name(self.file_paths[0])}")
+        events = client.iter_batch(self.file_paths, self.config, self.include_metadata, self.include_nested,
+                                   self.spacy_model_preference, self.benepar_model_preference)
+        try:
+            for event in events:
+                if self._is_cancelled:
+                    logging.info("Cancellation requested.")
+                    break
+                if event.get("event") != "file":
+                    continue
+                completed += 1
+                file_path = event["path"]
+                if "error" in event:
+                    logging.error(f"Error processing file {file_path}: {event['error']}")
+                    self._coalescer.post_result(file_path, self.result_store.put({"error": event["error"]}))
+                else:
+                    self._coalescer.post_result(file_path, self.result_store.put(event["result"]))
+                self._coalescer.post_progress(int(completed / total_files * 100))
+                if completed < total_files:
+                    next_name = display_name(self.file_paths[completed])
+                    self._coalescer.post_status(f"Processing ({completed + 1}/{total_files}): {next_name}")
+        except DaemonError as e:
+            if completed == 0:
+                logging.warning(f"Daemon batch failed ({e}). Falling back to local extraction.")
+                return False
+            raise
+        finally:
+            events.close() # Disconnecting stops the batch on the daemon
+
+        if self._is_cancelled:
+            logging.info("Batch processing cancelled.")
+        else:
+            logging.info("Batch processing successful (daemon).")
+        return True
+
+    def _run_in_engine(self, run_config: Dict[str, Any]) -> bool:
+        """
+        Run the batch in an engine process, emitting the same signals as the
+        local loop. Returns False if no engine could be started, so the caller
+        can fall back to in-process extraction.
+        """
+        try:
+            engine = self.engine_pool.acquire(run_config)
+        except EngineError as e:
+            logging.warning(f"{e}. Falling back to in-process extraction.")
+            return False
+        total_files = len(self.file_paths)
+        completed = 0
+        logging.info(f"Using extraction engine process {engine.pid}")
+        self._engine = engine
+        def on_start(_index: int, file_path: str):
+            if not self._is_cancelled:
+                self._coalescer.post_status(f"Processing ({completed + 1}/{total_files}): {display_name(file_path)}")
+
+        try:
+            # Archive members may arrive in archive order rather than list order, so count completions
+            for _index, file_path, file_result, error in engine.iter_batch(
+                    run_config, self.file_paths, self.include_metadata, self.include_nested, on_start=on_start):
+                completed += 1
+                if error is not None:
+                    self._coalescer.post_result(file_path, self.result_store.put({"error": error}))
+                else:
+                    self._coalescer.post_result(file_path, self.result_store.put(file_result))
+                self._coalescer.post_progress(int(completed / total_files * 100))
+                # After a cancel the engine stops once the file in progress is done; keep reading until then
+                if self._is_cancelled:
+                    engine.cancel() # In case cancel() ran before the batch was sent
+        finally:
+            self._engine = None
+            self.engine_pool.release(engine)
+
+        if self._is_cancelled:
+            logging.info("Batch processing cancelled.")
+        else:
+            logging.info("Batch processing successful (engine process).")
+        return True
 
     def cancel(self):
         """Request cancellation of the batch process."""
         logging.info("Received cancellation request.")
-        self._is_cancelled = True 
\ No newline at end of file
+        self._is_cancelled = True
+        engine = self._engine
+        if engine is not None:
+            engine.cancel() # Called from the GUI thread while the worker thread waits for results 
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Worker for finding .txt files under a directory in a background thread.
+"""
+
+import logging
+import os
+import time
+from typing import List, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+BATCH_SIZE = 2000            # Files per batchFound signal
+BATCH_INTERVAL_SECONDS = 0.2 # ...or sooner, so the list fills while a slow share is scanned
+
+
+class DirectoryScanWorker(QObject):
+    """
+    Walks a directory tree with os.scandir and reports .txt files in
+    batches of (path, size) as they are found, so the file list can grow
+    incrementally instead of waiting for the whole tree. Symlinked
+    directories are not followed (like os.walk).
+    """
+    batchFound = pyqtSignal(list)     # [(path, size in bytes), ...]
+    finished = pyqtSignal(int, int)   # Files found, total bytes
+    error = pyqtSignal(str)           # Unreadable directory (the scan continues)
+
+    def __init__(self, root: str):
+        super().__init__()
+        self.root = root
+        self._is_cancelled = False
+
+    @pyqtSlot()
+    def run(self):
+        found = total_bytes = 0
+        batch: List[Tuple[str, int]] = []
+        last_emit = time.monotonic()
+        stack = [self.root]
+        try:
+            while stack and not self._is_cancelled:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as listing:
+                        entries = sorted(listing, key=lambda entry: entry.name)
+                except OSError as e:
+                    logging.warning(f"Could not read directory {directory}: {e}")
+                    self.error.emit(f"{directory}: {e.strerror or e}")
+                    continue
+                subdirectories = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        elif entry.name.lower().endswith('.txt') and entry.is_file():
+                            size = entry.stat().st_size
+                            batch.append((entry.path, size))
+                            found += 1
+                            total_bytes += size
+                    except OSError:
+                        continue # Removed or unreadable between listing and stat
+                    if len(batch) >= BATCH_SIZE or (batch and time.monotonic() - last_emit >= BATCH_INTERVAL_SECONDS):
+                        self.batchFound.emit(batch)
+                        batch = []
+                        last_emit = time.monotonic()
+                stack.extend(reversed(subdirectories)) # Visit subdirectories in name order
+            if batch and not self._is_cancelled:
+                self.batchFound.emit(batch)
+        except Exception as e:
+            logging.error(f"Error scanning directory {self.root}: {e}", exc_info=True)
+            self.error.emit(str(e))
+        finally:
+            logging.info(f"Directory scan of {self.root} {'cancelled' if self._is_cancelled else 'finished'}: "
+                         f"{found} .txt files, {total_bytes} bytes.")
+            self.finished.emit(found, total_bytes)
+
+    def cancel(self):
+        """Stop scanning after the current directory."""
+        self._is_cancelled = True
@@ -3,14 +3,18 @@ Worker for handling single text extraction in a background thread.
 """
 
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
-from anpe import ANPEExtractor
+from anpe_studio.config_utils import apply_model_preferences
+from anpe_studio.extractor_pool import ExtractorPool, PooledExtractor, anpe_extractor_factory
+from anpe_studio.daemon import DaemonError, find_running_daemon
+from anpe_studio.engine_process import EngineError, EngineProcessPool
+from anpe_studio.result_store import ResultStore
 from typing import Dict, Any, Optional # Import Dict, Any, and Optional
 import logging
 
 class ExtractionSignals(QObject):
     """Defines signals available from the ExtractionWorker."""
     started = pyqtSignal()
-    result = pyqtSignal(dict) # Emits the extraction result dictionary
+    result = pyqtSignal(int)  # Emits the id of the extraction result in the ResultStore
     error = pyqtSignal(str)   # Emits error message string
     finished = pyqtSignal() # Emitted when processing finishes (success or error)
 
@@ -20,7 +24,11 @@ class ExtractionWorker(QObject):
     def __init__(self, text_content: str, config: Dict[str, Any], anpe_version: str,
                  include_metadata: bool, include_nested: bool,
                  spacy_model_preference: Optional[str] = None, # Added preference
-                 benepar_model_preference: Optional[str] = None): # Added preference
+                 benepar_model_preference: Optional[str] = None, # Added preference
+                 use_daemon: bool = True, # Use a running extraction daemon if available
+                 extractor_pool: Optional[ExtractorPool] = None, # Shared warm extractors (job queue)
+                 engine_pool: Optional[EngineProcessPool] = None, # Extract in a child process (job queue)
+                 result_store: Optional[ResultStore] = None): # Where the result is put (shared by the job queue)
         super().__init__()
         # Store config and input data
         self.text_content = text_content
@@ -30,6 +38,10 @@ class ExtractionWorker(QObject):
         self.include_nested = include_nested   # For output formatting
         self.spacy_model_preference = spacy_model_preference # Store preference
         self.benepar_model_preference = benepar_model_preference # Store preference
+        self.use_daemon = use_daemon
+        self.extractor_pool = extractor_pool
+        self.engine_pool = engine_pool
+        self.result_store = result_store if result_store is not None else ResultStore()
         self.signals = ExtractionSignals()
 
     @pyqtSlot()
@@ -38,21 +50,40 @@ class ExtractionWorker(QObject):
         self.signals.started.emit()
         logging.debug("WORKER (Text): Starting extraction...")
         try:
+            # Prefer a running daemon with warm models (thin client mode)
+            daemon_client = find_running_daemon() if self.use_daemon else None
+            if daemon_client is not None:
+                try:
+                    logging.debug(f"WORKER (Text): Using extraction daemon at {daemon_client.address}")
+                    result_data = daemon_client.extract(
+                        self.text_content, self.config, self.include_metadata, self.include_nested,
+                        self.spacy_model_preference, self.benepar_model_preference)
+                    logging.info("Extraction successful (daemon).")
+                    self.signals.result.emit(self.result_store.put(result_data))
+                    return
+                except DaemonError as e:
+                    logging.warning(f"WORKER (Text): Daemon extraction failed ({e}). Falling back to local extraction.")
+
             # Create extractor instance with the specific config for this run
             # Prepare the config, adding model preferences if they exist
-            run_config = self.config.copy() # Start with base config
-            if self.spacy_model_preference:
-                run_config['spacy_model'] = self.spacy_model_preference
-            if self.benepar_model_preference:
-                run_config['benepar_model'] = self.benepar_model_preference
+            run_config = apply_model_preferences(self.config, self.spacy_model_preference,
+                                                 self.benepar_model_preference)
+
+            # Extract in an engine process so parsing does not compete with the GUI for the GIL
+            if self.engine_pool is not None:
+                result_data = self._extract_in_engine(run_config)
+                if result_data is not None:
+                    logging.info("Extraction successful (engine process).")
+                    self.signals.result.emit(self.result_store.put(result_data))
+                    return
                 
-            logging.debug(f"WORKER (Text): Creating ANPEExtractor with effective config: {run_config}")
             # logging.debug(f"WORKER (Text): Model Prefs: spaCy='{self.spacy_model_preference}', Benepar='{self.benepar_model_preference}'") # Commented out old log
-            extractor = ANPEExtractor(
-                config=run_config # Pass the updated config
-                # spacy_model=self.spacy_model_preference, # Removed direct argument
-                # benepar_model=self.benepar_model_preference # Removed direct argument
-            )
+            if self.extractor_pool is not None:
+                logging.debug(f"WORKER (Text): Using shared warm extractor for effective config: {run_config}")
+                extractor = PooledExtractor(self.extractor_pool, run_config)
+            else:
+                logging.debug(f"WORKER (Text): Creating ANPEExtractor with effective config: {run_config}")
+                extractor = anpe_extractor_factory(run_config) # Imports anpe on first use
             
             # Perform extraction
             logging.debug(f"WORKER (Text): Extracting from text (len={len(self.text_content)}). Options: meta={self.include_metadata}, nested={self.include_nested}")
@@ -62,10 +93,27 @@ class ExtractionWorker(QObject):
                 include_nested=self.include_nested
             )
             logging.info("Extraction successful.")
-            self.signals.result.emit(result_data)
+            self.signals.result.emit(self.result_store.put(result_data))
         except Exception as e:
             logging.error(f"WORKER (Text): Error during extraction: {e}", exc_info=True)
             self.signals.error.emit(str(e))
         finally:
             logging.debug("WORKER (Text): Finishing.")
-            self.signals.finished.emit() 
\ No newline at end of file
+            self.signals.finished.emit()
+
+    def _extract_in_engine(self, run_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Extract in an engine process. Returns None if no engine could be started,
+        so the caller can fall back to in-process extraction. Extraction errors
+        and engine crashes are raised.
+        """
+        try:
+            engine = self.engine_pool.acquire(run_config)
+        except EngineError as e:
+            logging.warning(f"WORKER (Text): {e}. Falling back to in-process extraction.")
+            return None
+        try:
+            logging.debug(f"WORKER (Text): Using engine process {engine.pid} with effective config: {run_config}")
+            return engine.extract(run_config, self.text_content, self.include_metadata, self.include_nested)
+        finally:
+            self.engine_pool.release(engine) 
\ No newline at end of file
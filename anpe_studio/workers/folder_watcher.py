@@ -0,0 +1,181 @@
+"""
+Watch-folder support: monitors a directory tree and reports new or changed
+.txt files for incremental batch processing.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal, pyqtSlot
+
+from anpe_studio.watch_state import DEFAULT_SETTLE_SECONDS, Fingerprint, WatchStateStore
+
+DEBOUNCE_MS = 1500         # Quiet period after the last filesystem event before scanning
+POLL_INTERVAL_MS = 60_000  # Fallback rescan for shares that do not deliver change notifications
+SAVE_DELAY_MS = 1000       # Coalesces state file writes when many files finish together
+
+
+class FolderScanWorker(QObject):
+    """Scans the watched tree for changed files in a background thread."""
+    finished = pyqtSignal(list, bool, list) # [(path, fingerprint), ...], unsettled, directories of the tree
+    error = pyqtSignal(str)
+
+    def __init__(self, store: WatchStateStore, pending: Dict[str, Fingerprint]):
+        super().__init__()
+        self.store = store
+        self.pending = dict(pending)
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            directories = []
+            changed, unsettled = self.store.scan(settle_seconds=DEFAULT_SETTLE_SECONDS, ignore=self.pending,
+                                                 directories=directories)
+            self.store.save() # Persist fingerprints refreshed for touched files
+            self.finished.emit(changed, unsettled, directories)
+        except Exception as e:
+            logging.error(f"Watch: error scanning {self.store.root}: {e}", exc_info=True)
+            self.error.emit(str(e))
+            self.finished.emit([], False, [])
+
+
+class FolderWatcher(QObject):
+    """
+    Watches a directory tree and emits filesDetected with new or changed .txt
+    files once writes have settled. Call mark_processed() for each file after
+    it was processed successfully; files not marked are reported again after
+    a restart.
+    """
+    filesDetected = pyqtSignal(list) # List of file paths
+    watchError = pyqtSignal(str)
+
+    def __init__(self, root: str, parent=None):
+        super().__init__(parent)
+        self.store = WatchStateStore(root)
+        self.root = self.store.root
+        self._pending: Dict[str, Fingerprint] = {} # Reported, not yet processed
+        self._scan_thread: Optional[QThread] = None
+        self._scan_worker: Optional[FolderScanWorker] = None
+        self._rescan_requested = False
+        self._stopped = False
+
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self._on_fs_event)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._start_scan)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._start_scan)
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.store.save)
+
+    def start(self):
+        """Begin watching and run an initial scan (picks up files added while Studio was closed)."""
+        logging.info(f"Watching folder: {self.root}")
+        self._update_watched_directories([self.root]) # Subdirectories are added from the scan's result
+        self._poll_timer.start()
+        self._start_scan()
+
+    def stop(self):
+        """Stop watching and persist state. Pending files stay unprocessed for the next session."""
+        self._stopped = True # A scan finishing after this neither re-adds watches nor reports files
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+        if self._fs_watcher.directories():
+            self._fs_watcher.removePaths(self._fs_watcher.directories())
+        if self._scan_thread is not None:
+            self._scan_thread.quit()
+            self._scan_thread.wait(5000)
+        self._save_timer.stop()
+        self.store.save()
+        logging.info(f"Stopped watching folder: {self.root}")
+
+    def mark_processed(self, file_path: str) -> bool:
+        """Record a reported file as processed. Returns False if it was not reported by this watcher."""
+        fingerprint = self._pending.pop(file_path, None)
+        if fingerprint is None:
+            return False
+        self.store.mark_processed(file_path, fingerprint)
+        self._save_timer.start()
+        return True
+
+    def discard_pending(self, file_path: str):
+        """Forget a reported file without marking it processed (e.g. removed from the list)."""
+        self._pending.pop(file_path, None)
+
+    def pending_files(self) -> List[str]:
+        return list(self._pending)
+
+    @pyqtSlot(str)
+    def _on_fs_event(self, path: str):
+        # Bursts of events (e.g. a copy of many files) restart the timer and yield one scan
+        self._debounce_timer.start()
+
+    def _update_watched_directories(self, directories: List[str]):
+        """
+        Watch exactly these directories (the tree as the last scan found it).
+        Files are not watched: each one would cost an inotify watch or a file
+        handle, and the scan's fingerprints find changed files anyway. A file
+        rewritten in place (no directory change) is found by the next poll.
+        """
+        watched = set(self._fs_watcher.directories())
+        current = set(directories)
+        gone = [path for path in watched if path not in current]
+        if gone:
+            self._fs_watcher.removePaths(gone)
+        new_paths = [path for path in directories if path not in watched]
+        if new_paths:
+            failed = self._fs_watcher.addPaths(new_paths)
+            if failed:
+                logging.debug(f"Watch: could not add {len(failed)} directories to the file system watcher; relying on polling for them.")
+
+    @pyqtSlot()
+    def _start_scan(self):
+        if self._stopped:
+            return
+        if self._scan_thread is not None:
+            self._rescan_requested = True # Scan again once the current one finishes
+            return
+        self._rescan_requested = False
+
+        self._scan_worker = FolderScanWorker(self.store, self._pending)
+        self._scan_thread = QThread()
+        self._scan_worker.moveToThread(self._scan_thread)
+        self._scan_thread.started.connect(self._scan_worker.run)
+        self._scan_worker.finished.connect(self._on_scan_finished)
+        self._scan_worker.error.connect(self.watchError)
+        self._scan_worker.finished.connect(self._scan_thread.quit)
+        self._scan_worker.finished.connect(self._scan_worker.deleteLater)
+        self._scan_thread.finished.connect(self._scan_thread.deleteLater)
+        self._scan_thread.finished.connect(self._clear_scan_thread_reference)
+        self._scan_thread.start()
+
+    @pyqtSlot()
+    def _clear_scan_thread_reference(self):
+        self._scan_thread = None
+        self._scan_worker = None
+        if self._rescan_requested:
+            self._debounce_timer.start()
+
+    @pyqtSlot(list, bool, list)
+    def _on_scan_finished(self, changed: list, unsettled: bool, directories: list):
+        if self._stopped:
+            return
+        if directories:
+            self._update_watched_directories(directories) # Empty after a scan error: keep the current watches
+        if unsettled:
+            self._rescan_requested = True # Re-check files that were still being written
+        if not changed:
+            return
+        for path, fingerprint in changed:
+            self._pending[path] = tuple(fingerprint)
+        paths = [path for path, _ in changed]
+        logging.info(f"Watch: {len(paths)} new or changed file(s) in {self.root}")
+        self.filesDetected.emit(paths)
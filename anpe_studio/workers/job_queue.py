@@ -0,0 +1,444 @@
+"""
+Job queue for text and batch extraction runs.
+
+Jobs are queued by priority and started in order, up to a configurable
+number running at the same time. All jobs share one pool of warm
+extractors, so models are loaded once per configuration rather than once
+per run. In out-of-process mode the extractors live in engine child
+processes (see anpe_studio.engine_process) so parsing cannot stall the GUI.
+"""
+
+import functools
+import itertools
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+from anpe_studio import tracing
+from anpe_studio.engine_process import EngineProcessPool
+from anpe_studio.extractor_pool import ExtractorPool
+from anpe_studio.result_store import ResultSet, ResultStore
+from anpe_studio.workers.batch_worker import BatchWorker
+from anpe_studio.workers.extraction_worker import ExtractionWorker
+
+# --- Job Types ---
+JOB_TEXT = "text"
+JOB_BATCH = "batch"
+
+# --- Priorities (lower value runs first) ---
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITY_LABELS = {PRIORITY_HIGH: "High", PRIORITY_NORMAL: "Normal", PRIORITY_LOW: "Low"}
+
+# --- Job States ---
+STATE_QUEUED = "Queued"
+STATE_RUNNING = "Running"
+STATE_FINISHED = "Finished"
+STATE_FAILED = "Failed"
+STATE_CANCELLED = "Cancelled"
+FINAL_STATES = (STATE_FINISHED, STATE_FAILED, STATE_CANCELLED)
+
+THROUGHPUT_SMOOTHING = 0.3 # Weight of the newest batch in the throughput estimate
+
+
+def default_concurrency() -> int:
+    """Default number of concurrent jobs: one per two cores, at most 2 (each config holds its own models)."""
+    return max(1, min(2, (os.cpu_count() or 1) // 2))
+
+
+class Job:
+    """One queued extraction run and its results."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, kind: str, config: Dict[str, Any], include_metadata: bool, include_nested: bool,
+                 text: str = "", file_paths: Optional[List[str]] = None,
+                 spacy_model_preference: Optional[str] = None,
+                 benepar_model_preference: Optional[str] = None,
+                 priority: int = PRIORITY_NORMAL, label: Optional[str] = None,
+                 from_watch: bool = False, input_bytes: int = 0, from_launch: bool = False):
+        self.id = next(Job._ids)
+        self.kind = kind
+        self.config = config
+        self.include_metadata = include_metadata
+        self.include_nested = include_nested
+        self.text = text
+        self.file_paths = list(file_paths or [])
+        self.spacy_model_preference = spacy_model_preference
+        self.benepar_model_preference = benepar_model_preference
+        self.priority = priority
+        self.from_watch = from_watch # Incremental watch-mode batch, appended to the current session
+        self.from_launch = from_launch # Inputs passed on the command line, also by a later launch (single instance)
+        self.input_bytes = input_bytes # Total size of the batch inputs if known, for throughput measurement
+        if label is None:
+            if kind == JOB_TEXT:
+                label = f"Text ({len(text)} chars)"
+            elif len(self.file_paths) == 1:
+                label = os.path.basename(self.file_paths[0])
+            else:
+                label = f"{len(self.file_paths)} files"
+        self.label = label
+
+        self.state = STATE_QUEUED
+        self.progress = 0
+        self.status_message = ""
+        self.error: Optional[str] = None
+        self.files_done = 0
+        self.started_at: Optional[float] = None      # time.monotonic() when the job started
+        self.first_result_at: Optional[float] = None # ...and when its first results arrived
+        self.first_result_files = 0                  # Files in that first delivery
+        self.queued_at_ns = tracing.now_ns() # Trace timeline (anpe_studio.tracing)
+        self.started_at_ns = 0
+        # Results: dict for text jobs, a ResultSet (file_path -> result) for batch jobs.
+        # Set by the owner when the job starts (batch jobs get a ResultSet here if not).
+        self.results = None
+        self.aggregator = None # Optional NPFrequencyAggregator fed by the owner
+
+        self.worker: Optional[QObject] = None
+        self.thread: Optional[QThread] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINAL_STATES
+
+
+class JobQueueManager(QObject):
+    """
+    Runs queued Jobs in priority order with at most max_concurrent at once.
+    Worker signals are re-emitted with the job id.
+    """
+    jobAdded = pyqtSignal(int)
+    jobStarted = pyqtSignal(int)
+    jobUpdated = pyqtSignal(int)          # State, progress or status changed
+    jobFinished = pyqtSignal(int)
+    jobRemoved = pyqtSignal(int)
+    queueReordered = pyqtSignal()
+    textResult = pyqtSignal(int, dict)     # job id, result
+    fileResults = pyqtSignal(int, list)    # job id, [(file path, result id), ...]; read through job.results
+    jobError = pyqtSignal(int, str)        # job id, error message
+    jobStatus = pyqtSignal(int, str)       # job id, status message (batch jobs)
+    jobProgress = pyqtSignal(int, int)     # job id, percentage (batch jobs)
+    throughputMeasured = pyqtSignal(float) # Updated throughput estimate in bytes per second
+
+    def __init__(self, max_concurrent: Optional[int] = None, out_of_process: bool = False,
+                 bytes_per_second: Optional[float] = None, parent=None):
+        super().__init__(parent)
+        self.bytes_per_second = bytes_per_second # Measured batch throughput, None until measured
+        self.max_concurrent = max(1, max_concurrent or default_concurrency())
+        self.extractor_pool = ExtractorPool(max_extractors=max(2, self.max_concurrent))
+        self.result_store = ResultStore() # Workers put results here; jobs hold ids
+        self.out_of_process = out_of_process
+        self._engine_pool: Optional[EngineProcessPool] = None # Created on first use
+        self._jobs: Dict[int, Job] = {}
+        self._order: List[int] = [] # Submission order of all jobs; queued jobs run in priority order
+
+    # --- Queries ---
+
+    def get(self, job_id: int) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        """All jobs in display order: running, queued (in run order), then finished."""
+        running = [job for job in self._jobs.values() if job.state == STATE_RUNNING]
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        return running + self.queued_jobs() + finished
+
+    def queued_jobs(self) -> List[Job]:
+        """Queued jobs in the order they will start."""
+        queued = [self._jobs[job_id] for job_id in self._order if self._jobs[job_id].state == STATE_QUEUED]
+        return sorted(queued, key=lambda job: job.priority) # Stable: submission order within a priority
+
+    def running_count(self) -> int:
+        """Jobs whose thread is still active (includes running jobs that are being cancelled)."""
+        return sum(1 for job in self._jobs.values() if job.thread is not None)
+
+    def is_busy(self) -> bool:
+        """True if any job is running or queued."""
+        return any(not job.is_finished for job in self._jobs.values())
+
+    # --- Control ---
+
+    def submit(self, job: Job) -> int:
+        """Queue a job and start it if there is capacity. Returns its id."""
+        self._jobs[job.id] = job
+        self._order.append(job.id)
+        logging.info(f"Job #{job.id} queued: {job.label} (priority {PRIORITY_LABELS.get(job.priority, job.priority)})")
+        self.jobAdded.emit(job.id)
+        self._dispatch()
+        return job.id
+
+    def set_max_concurrent(self, count: int):
+        self.max_concurrent = max(1, count)
+        if self._engine_pool is not None:
+            self._engine_pool.set_max_idle(self.max_concurrent)
+        self._dispatch()
+
+    def set_out_of_process(self, enabled: bool):
+        """Run jobs started from now on in engine processes (True) or in threads of this process (False)."""
+        if enabled == self.out_of_process:
+            return
+        self.out_of_process = enabled
+        logging.info(f"Extraction will run {'in a separate process' if enabled else 'in the GUI process'}.")
+        if not enabled and self._engine_pool is not None:
+            self._engine_pool.clear() # Idle engines exit; busy ones exit when their job ends
+
+    def engine_pool(self) -> Optional[EngineProcessPool]:
+        """The engine process pool if out-of-process mode is on (created lazily)."""
+        if not self.out_of_process:
+            return None
+        if self._engine_pool is None:
+            self._engine_pool = EngineProcessPool(max_idle=self.max_concurrent,
+                                                  max_extractors=max(2, self.max_concurrent))
+        return self._engine_pool
+
+    def clear_extractors(self):
+        """Drop all warm extractors, in this process and in engine processes (e.g. after models changed)."""
+        self.extractor_pool.clear()
+        if self._engine_pool is not None:
+            self._engine_pool.clear()
+
+    def move(self, job_id: int, delta: int):
+        """Move a queued job delta places earlier (negative) or later (positive) in the run order."""
+        queued = self.queued_jobs()
+        index = next((i for i, job in enumerate(queued) if job.id == job_id), None)
+        if index is None:
+            return
+        target = max(0, min(len(queued) - 1, index + delta))
+        if target == index:
+            return
+        job = queued.pop(index)
+        queued.insert(target, job)
+        # Adopt the neighbour's priority so the new position is consistent with priority ordering
+        neighbour = queued[target + 1] if delta < 0 else queued[target - 1]
+        job.priority = neighbour.priority
+        queued_ids = [queued_job.id for queued_job in queued]
+        others = [job_id for job_id in self._order if job_id not in set(queued_ids)]
+        self._order = others + queued_ids
+        self.jobUpdated.emit(job.id)
+        self.queueReordered.emit()
+
+    def cancel(self, job_id: int):
+        """Cancel a queued job, or stop a running one (a running text job's result is discarded)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.is_finished:
+            return
+        if job.state == STATE_QUEUED:
+            job.state = STATE_CANCELLED
+            logging.info(f"Job #{job.id} cancelled before it started.")
+            self.jobUpdated.emit(job.id)
+            self.jobFinished.emit(job.id)
+            return
+        job.state = STATE_CANCELLED
+        job.status_message = "Cancelling..."
+        logging.info(f"Job #{job.id} cancellation requested.")
+        if isinstance(job.worker, BatchWorker):
+            try:
+                job.worker.cancel()
+            except RuntimeError:
+                pass # Worker already deleted
+        self.jobUpdated.emit(job.id)
+
+    def remove_finished(self):
+        """Remove finished, failed and cancelled jobs (and their results) from the queue."""
+        removed = [job for job in self._jobs.values() if job.is_finished and job.thread is None]
+        for job in removed:
+            del self._jobs[job.id]
+            self._order.remove(job.id)
+        for job in removed:
+            self._close_aggregator(job)
+            self.jobRemoved.emit(job.id) # Its results are freed once the Output tab lets go of them too
+
+    def _close_aggregator(self, job: Job):
+        """Close a removed job's aggregator unless another remaining job shares it."""
+        if job.aggregator is None:
+            return
+        if not any(other.aggregator is job.aggregator for other in self._jobs.values()):
+            job.aggregator.close()
+        job.aggregator = None
+
+    def shutdown(self, wait_ms: int = 500):
+        """Cancel everything and stop worker threads (used when the window closes)."""
+        for job in list(self._jobs.values()):
+            if job.state == STATE_QUEUED:
+                job.state = STATE_CANCELLED
+            elif job.state == STATE_RUNNING:
+                self.cancel(job.id)
+        for job in list(self._jobs.values()):
+            thread = job.thread
+            if thread is not None:
+                try:
+                    if thread.isRunning():
+                        thread.quit()
+                        if not thread.wait(wait_ms):
+                            logging.warning(f"Job #{job.id} thread did not finish cleanly.")
+                except RuntimeError:
+                    pass # Thread already deleted
+            job.thread = None
+            job.worker = None
+        for job in list(self._jobs.values()):
+            self._close_aggregator(job)
+        self.result_store.clear()
+        if self._engine_pool is not None:
+            self._engine_pool.shutdown()
+            self._engine_pool = None
+
+    # --- Execution ---
+
+    def _dispatch(self):
+        """Start queued jobs while there is capacity."""
+        while self.running_count() < self.max_concurrent:
+            queued = self.queued_jobs()
+            if not queued:
+                return
+            self._start(queued[0])
+
+    def _start(self, job: Job):
+        job.state = STATE_RUNNING
+        job.started_at = time.monotonic()
+        job.started_at_ns = tracing.now_ns()
+        tracing.async_span("queued", "queue", job.id, job.queued_at_ns, job.started_at_ns, job=job.label)
+        job.status_message = "Starting..."
+        if job.kind == JOB_TEXT:
+            job.worker = ExtractionWorker(
+                text_content=job.text, config=job.config, anpe_version="",
+                include_metadata=job.include_metadata, include_nested=job.include_nested,
+                spacy_model_preference=job.spacy_model_preference,
+                benepar_model_preference=job.benepar_model_preference,
+                extractor_pool=self.extractor_pool, engine_pool=self.engine_pool(),
+                result_store=self.result_store
+            )
+            job.worker.signals.result.connect(functools.partial(self._on_text_result, job.id))
+        else:
+            job.worker = BatchWorker(
+                file_paths=job.file_paths, config=job.config, anpe_version="",
+                include_metadata=job.include_metadata, include_nested=job.include_nested,
+                spacy_model_preference=job.spacy_model_preference,
+                benepar_model_preference=job.benepar_model_preference,
+                extractor_pool=self.extractor_pool, engine_pool=self.engine_pool(),
+                result_store=self.result_store
+            )
+            job.worker.signals.status_update.connect(functools.partial(self._on_status_update, job.id))
+            job.worker.signals.progress.connect(functools.partial(self._on_progress, job.id))
+            job.worker.signals.file_results.connect(functools.partial(self._on_file_results, job.id))
+
+        job.thread = QThread()
+        job.worker.moveToThread(job.thread)
+        job.thread.started.connect(job.worker.run)
+        job.worker.signals.error.connect(functools.partial(self._on_error, job.id))
+        job.worker.signals.finished.connect(functools.partial(self._on_worker_finished, job.id))
+        job.worker.signals.finished.connect(job.worker.deleteLater)
+        job.worker.signals.finished.connect(job.thread.quit)
+        job.thread.finished.connect(functools.partial(self._on_thread_finished, job.id))
+        job.thread.finished.connect(job.thread.deleteLater)
+
+        logging.info(f"Job #{job.id} started: {job.label}")
+        self.jobStarted.emit(job.id)
+        self.jobUpdated.emit(job.id)
+        job.thread.start()
+
+    @pyqtSlot(int, str)
+    def _on_status_update(self, job_id: int, message: str):
+        job = self._jobs.get(job_id)
+        if job is not None and job.state == STATE_RUNNING:
+            job.status_message = message
+            self.jobStatus.emit(job_id, message)
+            self.jobUpdated.emit(job_id)
+
+    @pyqtSlot(int, int, str)
+    def _on_progress(self, job_id: int, percentage: int, message: str):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.progress = percentage
+            self.jobProgress.emit(job_id, percentage)
+            self.jobUpdated.emit(job_id)
+
+    @pyqtSlot(int, int)
+    def _on_text_result(self, job_id: int, result_id: int):
+        result = self.result_store.pop(result_id) # A text job holds its one result itself
+        job = self._jobs.get(job_id)
+        if job is None or job.state == STATE_CANCELLED:
+            return # Result of a cancelled text job is discarded
+        job.results = result
+        job.progress = 100
+        self.textResult.emit(job_id, result)
+
+    @pyqtSlot(int, list)
+    def _on_file_results(self, job_id: int, handles: List[Tuple[str, int]]):
+        job = self._jobs.get(job_id)
+        if job is None:
+            self.result_store.discard(result_id for _, result_id in handles)
+            return
+        if job.results is None:
+            job.results = ResultSet(self.result_store)
+        if job.first_result_at is None:
+            job.first_result_at = time.monotonic()
+            job.first_result_files = len(handles)
+        with tracing.span("analysis", "results", files=len(handles)):
+            for file_path, result_id in handles:
+                job.results.add(file_path, result_id)
+                if job.aggregator is not None:
+                    job.aggregator.add_result(self.result_store.get(result_id)) # Feed corpus-level frequency counters
+        job.files_done += len(handles)
+        self.fileResults.emit(job_id, handles)
+
+    @pyqtSlot(int, str)
+    def _on_error(self, job_id: int, message: str):
+        job = self._jobs.get(job_id)
+        if job is None or job.state == STATE_CANCELLED:
+            return
+        job.error = message
+        self.jobError.emit(job_id, message)
+
+    @pyqtSlot(int)
+    def _on_worker_finished(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job.worker = None
+        if job.state == STATE_RUNNING:
+            job.state = STATE_FAILED if job.error else STATE_FINISHED
+            job.status_message = job.error or "Done"
+        elif job.state == STATE_CANCELLED:
+            job.status_message = "Cancelled"
+        logging.info(f"Job #{job.id} {job.state.lower()}: {job.label}")
+        if job.started_at is not None:
+            tracing.async_span("running", "queue", job.id, job.started_at_ns, tracing.now_ns(),
+                               job=job.label, state=job.state)
+        if job.state == STATE_FINISHED and job.kind == JOB_BATCH:
+            self._measure_throughput(job)
+        self.jobUpdated.emit(job_id)
+        self.jobFinished.emit(job_id)
+
+    def _measure_throughput(self, job: Job):
+        """Fold a finished batch into the throughput estimate (smoothed over batches)."""
+        if job.input_bytes <= 0 or job.files_done == 0 or job.started_at is None:
+            return
+        now = time.monotonic()
+        if job.files_done > job.first_result_files:
+            # Time after the first results excludes model loading; assume files of average size
+            seconds = now - job.first_result_at
+            num_bytes = job.input_bytes * (job.files_done - job.first_result_files) / job.files_done
+        elif self.bytes_per_second is None: # Everything arrived at once
+            seconds, num_bytes = now - job.started_at, job.input_bytes # Better than no estimate at all
+        else:
+            return
+        if seconds <= 0:
+            return
+        measured = num_bytes / seconds
+        if self.bytes_per_second is None:
+            self.bytes_per_second = measured
+        else:
+            self.bytes_per_second += THROUGHPUT_SMOOTHING * (measured - self.bytes_per_second)
+        logging.debug(f"Job #{job.id} throughput: {measured:.0f} bytes/s (estimate now {self.bytes_per_second:.0f} bytes/s).")
+        self.throughputMeasured.emit(self.bytes_per_second)
+
+    @pyqtSlot(int)
+    def _on_thread_finished(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.thread = None
+        self._dispatch()
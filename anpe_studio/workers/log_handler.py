@@ -2,45 +2,94 @@
 Log handler for redirecting log messages to the GUI.
 """
 
+import collections
 import logging
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 import sys
 
+DEFAULT_BUFFER_CAPACITY = 10000 # Records held between flushes; older ones are dropped beyond this
+DEFAULT_FLUSH_INTERVAL_MS = 75
+
 class QtLogHandler(logging.Handler, QObject):
     """
-    Log handler that redirects log messages to a QTextEdit widget.
-    This allows log messages to be displayed in the GUI.
+    Log handler that redirects log messages to the GUI log panel.
+
+    Records from any thread are appended to a bounded ring buffer (a deque,
+    whose appends and pops are atomic, so emit() never waits on the GUI).
+    A timer on the GUI thread drains the buffer every few tens of
+    milliseconds and emits the records as one batch, so a flood of debug
+    logging costs one event and one panel update per flush instead of one
+    per record. If the buffer fills up between flushes, the oldest records
+    are dropped and counted.
     """
-    
-    # Define a signal that emits the log message (str) and log level (int)
-    log_signal = pyqtSignal(str, int)
-    
-    def __init__(self):
+
+    # Emits a list of (message, level) tuples, oldest first
+    log_batch = pyqtSignal(list)
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_CAPACITY, flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS):
         """
-        Initialize the log handler.
+        Initialize the log handler. Must be created on the GUI thread.
+
+        Args:
+            capacity: Maximum records buffered between flushes.
+            flush_interval_ms: How often buffered records are delivered.
         """
         logging.Handler.__init__(self)
         QObject.__init__(self)
         self._pending_restart_models = set() # Added to store models needing restart
-        
+        self._buffer = collections.deque(maxlen=max(1, capacity))
+        self.dropped_count = 0        # Records dropped since the handler was created
+        self._reported_dropped = 0    # ...of which already reported in the log
+
         # Set formatter
         formatter = logging.Formatter('%(levelname)s: %(message)s')
         self.setFormatter(formatter)
-    
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush_pending)
+        self._flush_timer.start()
+
     def emit(self, record):
         """
-        Emit a log record by appending it to the text edit widget.
-        
+        Buffer a log record for the next flush. Safe to call from any thread.
+
         Args:
             record: Log record to emit
         """
         try:
             msg = self.format(record)
-            
-            # Emit the log record as a signal
-            self.log_signal.emit(msg, record.levelno)
-            
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped_count += 1 # The append below pushes out the oldest record
+            self._buffer.append((msg, record.levelno))
+
         except Exception as e:
             # Fall back to stderr if something goes wrong
             print(f"Error in log handler: {e}", file=sys.stderr)
-            print(record.getMessage(), file=sys.stderr)
\ No newline at end of file
+            print(record.getMessage(), file=sys.stderr)
+
+    def flush_pending(self):
+        """Deliver all buffered records as one log_batch (called by the flush timer)."""
+        batch = []
+        dropped = self.dropped_count - self._reported_dropped
+        if dropped > 0:
+            self._reported_dropped += dropped
+            batch.append((f"{dropped} log record(s) dropped: messages arrived faster than the log panel could show them.",
+                          logging.WARNING))
+        try:
+            while True:
+                batch.append(self._buffer.popleft())
+        except IndexError:
+            pass # Drained
+        if batch:
+            self.log_batch.emit(batch)
+
+    def set_flush_interval(self, interval_ms: int):
+        self._flush_timer.setInterval(max(1, interval_ms))
+
+    def close(self):
+        try:
+            self._flush_timer.stop()
+        except RuntimeError:
+            pass # Qt objects already deleted at interpreter exit
+        logging.Handler.close(self)
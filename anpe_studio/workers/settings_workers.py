@@ -18,6 +18,8 @@ import traceback # <<< Added for detailed error logging
 
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 
+from anpe_studio.model_cache import discover_models, model_fingerprint, save_cached_models
+
 # Constants and Utilities from ANPE Core (Mirroring settings_dialog.py)
 CORE_PACKAGE_NAME = "anpe"
 try:
@@ -36,7 +38,9 @@ try:
         find_installed_spacy_models, find_installed_benepar_models
     )
     # Core ANPE is assumed available by workers needing it
+    ANPE_UTILS_AVAILABLE = True
 except ImportError as e:
+    ANPE_UTILS_AVAILABLE = False
     logging.error(f"Failed to import ANPE utilities for Settings Workers: {e}")
     # Define dummy maps and functions if core package is missing
     SPACY_MODEL_MAP = {"sm": "en_core_web_sm", "md": "en_core_web_md", "lg": "en_core_web_lg", "trf": "en_core_web_trf"}
@@ -448,8 +452,11 @@ class StatusCheckWorker(QObject):
         logging.debug("StatusCheckWorker: Starting model status check.")
         status_data = {'spacy_models': [], 'benepar_models': [], 'error': None}
         try:
-            status_data['spacy_models'] = find_installed_spacy_models()
-            status_data['benepar_models'] = find_installed_benepar_models()
+            fingerprint = model_fingerprint()
+            status_data['spacy_models'], status_data['benepar_models'] = discover_models(
+                find_installed_spacy_models, find_installed_benepar_models)
+            if ANPE_UTILS_AVAILABLE: # The next start can use this result
+                save_cached_models(fingerprint, status_data['spacy_models'], status_data['benepar_models'])
             logging.debug(f"StatusCheckWorker: Found spaCy: {status_data['spacy_models']}, Benepar: {status_data['benepar_models']}")
         except Exception as e:
             error_msg = f"Error during model status check: {e}"
@@ -0,0 +1,94 @@
+"""
+Rate limiting for the signals a BatchWorker sends to the GUI.
+"""
+
+import collections
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSlot
+
+from anpe_studio import tracing
+
+DEFAULT_SIGNAL_INTERVAL_MS = 100 # At most ten GUI updates per second per batch
+
+
+class BatchSignalCoalescer(QObject):
+    """
+    Collects a batch worker's status, progress and per-file result handles and
+    re-emits them through its BatchSignals at a fixed rate.
+
+    The worker thread only records values (plain attribute stores and deque
+    appends, so it never blocks on the GUI). A timer on the GUI thread
+    emits the latest status and progress and all results gathered since the
+    previous tick as one file_results list, so hundreds of tiny files cost
+    a handful of GUI updates instead of three signals each. Must be created
+    on the GUI thread, and must not be moved to the worker's thread.
+
+    An error and the finished signal are queued too, so they always arrive
+    after the results that preceded them.
+    """
+
+    def __init__(self, signals: QObject, interval_ms: int = DEFAULT_SIGNAL_INTERVAL_MS):
+        super().__init__()
+        self.signals = signals
+        self._results = collections.deque() # (file path, result id), oldest first
+        self._status: Optional[str] = None
+        self._progress: Optional[int] = None
+        self._error: Optional[str] = None
+        self._finished = False
+        self._emitted_status: Optional[str] = None
+        self._emitted_progress: Optional[int] = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, interval_ms))
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    # --- Worker side (any thread) ---
+
+    def post_status(self, message: str):
+        self._status = message # Only the latest one is shown
+
+    def post_progress(self, percentage: int):
+        self._progress = percentage
+
+    def post_result(self, file_path: str, result_id: int):
+        self._results.append((file_path, result_id))
+
+    def post_error(self, message: str):
+        self._error = message
+
+    def post_finished(self):
+        """Mark the batch as done; the next flush delivers what is left, then finished."""
+        self._finished = True
+
+    # --- GUI side ---
+
+    @pyqtSlot()
+    def flush(self):
+        """Emit everything recorded since the last flush (called by the timer)."""
+        finished = self._finished # Read first: everything posted before it is in the buffers below
+        results = []
+        try:
+            while True:
+                results.append(self._results.popleft())
+        except IndexError:
+            pass # Drained
+        if results:
+            with tracing.span("deliver results", "signals", files=len(results)): # Includes the GUI's handling
+                self.signals.file_results.emit(results)
+        # Compared with the last emitted value rather than reset, so a value stored mid-flush is not lost
+        progress = self._progress
+        if progress is not None and progress != self._emitted_progress:
+            self._emitted_progress = progress
+            self.signals.progress.emit(progress, "")
+        status = self._status
+        if status is not None and status != self._emitted_status and not finished:
+            self._emitted_status = status
+            self.signals.status_update.emit(status)
+        if finished:
+            self._timer.stop()
+            if self._error is not None:
+                self.signals.error.emit(self._error)
+            self.signals.finished.emit()
+            self.deleteLater()
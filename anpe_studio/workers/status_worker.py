@@ -5,13 +5,19 @@ class ModelStatusChecker(QObject):
     """
     Worker thread to check the status of required models (spaCy, Benepar)
     without blocking the main GUI thread.
+
+    With use_cache, the model lists of the last check are reported straight
+    away when the model install locations are unchanged (see
+    anpe_studio.model_cache); the status then has 'from_cache' set, and the
+    receiver should verify it with a checker that has use_cache=False.
     """
     status_checked = pyqtSignal(dict)  # Emits dict with model status on success
     error_occurred = pyqtSignal(str)   # Emits error message string on failure
     progress_update = pyqtSignal(str)  # Emits progress step name
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, use_cache: bool = True):
         super().__init__(parent)
+        self.use_cache = use_cache
         logging.debug("ModelStatusChecker worker initialized.")
 
     def run(self):
@@ -26,22 +32,25 @@ class ModelStatusChecker(QObject):
             'error': None
         }
         try:
-            # Import necessary functions within the run method
-            # This isolates potential ImportErrors if anpe is not fully installed
             self.progress_update.emit('check_models')
-            from anpe.utils.model_finder import find_installed_spacy_models, find_installed_benepar_models
-            logging.debug("ModelStatusChecker: ANPE utilities imported successfully.")
-
-            # --- Perform Checks ---
-            logging.debug("ModelStatusChecker: Checking spaCy models...")
-            self.progress_update.emit('spacy_model')
-            status['spacy_models'] = find_installed_spacy_models()
-            logging.debug(f"ModelStatusChecker: Found spaCy models: {status['spacy_models']}")
-
-            logging.debug("ModelStatusChecker: Checking Benepar models...")
-            self.progress_update.emit('benepar_model')
-            status['benepar_models'] = find_installed_benepar_models()
-            logging.debug(f"ModelStatusChecker: Found Benepar models: {status['benepar_models']}")
+            # Imported here, on the worker thread: this module is imported before the splash paints
+            from anpe_studio.model_cache import discover_models, load_cached_models, model_fingerprint, save_cached_models
+            fingerprint = model_fingerprint()
+            cached = load_cached_models(fingerprint) if self.use_cache else None
+            if cached is not None:
+                # Installed packages and NLTK models are unchanged since the last check
+                status['spacy_models'], status['benepar_models'] = cached
+                status['from_cache'] = True # The receiver verifies it in the background
+                logging.debug(f"ModelStatusChecker: Using cached model lists: {cached}")
+            else:
+                # Import anpe only now; this isolates potential ImportErrors if anpe is not fully installed
+                logging.debug("ModelStatusChecker: Checking spaCy and Benepar models...")
+                self.progress_update.emit('spacy_model')
+                status['spacy_models'], status['benepar_models'] = discover_models()
+                self.progress_update.emit('benepar_model')
+                logging.debug(f"ModelStatusChecker: Found spaCy models: {status['spacy_models']}, "
+                              f"Benepar models: {status['benepar_models']}")
+                save_cached_models(fingerprint, status['spacy_models'], status['benepar_models'])
 
             # Determine if core models are present
             has_spacy = len(status['spacy_models']) > 0
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measure the wakeups and CPU time the activity indicators cost.
+
+Shows PulsingActivityIndicator widgets (one per --indicators, as in the
+status bar, the splash and the Settings pages) in each state for --seconds,
+then hidden and with the window minimized, with the frame clock's
+measurement mode on. Reports the clock's wakeups and paints per second, the
+thread CPU time spent in ticks and paints, and the CPU time of the whole
+process over the same interval (which includes Qt's own event dispatch).
+
+--fixed-rate runs every visible state at the original 15 ms interval for
+comparison (hidden and minimized indicators still pause).
+
+Usage:
+    python benchmarks/bench_activity_indicator.py [--seconds 3] [--indicators 1] [--fixed-rate] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Allow running from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCENARIOS = ["idle", "checking", "warning", "error", "active", "loading", "hidden", "minimized"]
+SETTLE_SECONDS = 0.5 # Let state transitions finish before measuring
+
+
+def run_for(seconds: float):
+    from PyQt6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--seconds", type=float, default=3.0, help="Measuring time per scenario.")
+    parser.add_argument("--indicators", type=int, default=1, help="Indicators shown at once.")
+    parser.add_argument("--fixed-rate", action="store_true", help="Animate every state at 15 ms, as before the frame clock.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    from PyQt6.QtWidgets import QApplication, QWidget, QHBoxLayout
+    app = QApplication.instance() or QApplication(sys.argv)
+    from anpe_studio.widgets import activity_indicator
+
+    if args.fixed_rate:
+        activity_indicator.MOTION_FRAME_MS = 15
+        for state in activity_indicator.STEADY_FRAME_MS:
+            activity_indicator.STEADY_FRAME_MS[state] = 15
+
+    window = QWidget()
+    layout = QHBoxLayout(window)
+    indicators = [activity_indicator.PulsingActivityIndicator() for _ in range(max(1, args.indicators))]
+    for indicator in indicators:
+        layout.addWidget(indicator)
+    window.show()
+    clock = activity_indicator.frame_clock()
+    clock.set_measurement_enabled(True)
+
+    results = {}
+    for scenario in SCENARIOS:
+        window.showNormal()
+        for indicator in indicators:
+            indicator.setVisible(scenario != "hidden")
+            if scenario in ("hidden", "minimized"):
+                indicator.idle()
+            else:
+                getattr(indicator, {"active": "start", "warning": "warn"}.get(scenario, scenario))()
+        if scenario == "minimized":
+            window.showMinimized()
+        run_for(SETTLE_SECONDS)
+        clock.reset_stats()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        run_for(args.seconds)
+        wall = time.perf_counter() - wall_start
+        stats = clock.stats()
+        stats["process_cpu_percent"] = round((time.process_time() - cpu_start) / wall * 100.0, 2)
+        results[scenario] = stats
+
+    print(f"{len(indicators)} indicator(s), {args.seconds:.1f} s per scenario"
+          f"{', fixed 15 ms rate' if args.fixed_rate else ''} (platform: {app.platformName()})")
+    print(f"{'scenario':<12}{'interval':>9}{'wakeups/s':>11}{'paints/s':>10}{'CPU ms/s':>10}{'process CPU %':>15}")
+    for scenario, stats in results.items():
+        print(f"{scenario:<12}{stats['interval_ms']:>9}{stats['wakeups_per_s']:>11.1f}{stats['paints_per_s']:>10.1f}"
+              f"{stats['cpu_ms_per_s']:>10.2f}{stats['process_cpu_percent']:>15.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"indicators": len(indicators), "seconds": args.seconds, "fixed_rate": args.fixed_rate,
+                       "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
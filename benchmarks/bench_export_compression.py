@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming compressed export against uncompressed export.
+
+Generates a synthetic ANPE result (nested noun phrases with metadata), exports
+it in each format with every available compression setting, and reports write
+throughput (uncompressed MB/s) and output size relative to the uncompressed file.
+
+Usage:
+    python benchmarks/bench_export_compression.py [--nps 20000] [--repeat 3] [--formats json csv txt]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Allow running from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anpe_studio.export_utils import (COMPRESSION_LEVELS, COMPRESSION_NONE,
+                                      CompressedExporter, get_available_compressions)
+
+WORDS = ["the", "quick", "brown", "fox", "lazy", "dog", "large", "corpus", "noun",
+         "phrase", "analysis", "of", "structure", "green", "house", "model"]
+STRUCTURES = ["determiner", "adjectival_modifier", "compound", "prepositional_modifier",
+              "possessive", "coordinated", "appositive"]
+
+
+def make_result(num_nps: int, seed: int = 0) -> dict:
+    """Build a synthetic extraction result with nesting and metadata."""
+    rng = random.Random(seed)
+
+    def make_np(np_id: str, level: int) -> dict:
+        length = rng.randint(2, 8)
+        item = {
+            "id": np_id,
+            "noun_phrase": " ".join(rng.choice(WORDS) for _ in range(length)),
+            "level": level,
+            "metadata": {"length": length, "structures": rng.sample(STRUCTURES, rng.randint(1, 3))},
+            "children": [],
+        }
+        if level < 3:
+            for c in range(rng.randint(0, 2)):
+                item["children"].append(make_np(f"{np_id}.{c + 1}", level + 1))
+        return item
+
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "configuration": {"nested_requested": True, "metadata_requested": True,
+                          "accept_pronouns": True, "newline_breaks": True},
+        "results": [make_np(str(i + 1), 1) for i in range(num_nps)],
+    }
+
+
+def bench_one(data: dict, export_format: str, compression: str, level, repeat: int, out_dir: str):
+    """Return (best seconds, output bytes) for one export configuration."""
+    exporter = CompressedExporter(compression=compression, level=level)
+    best = float("inf")
+    size = 0
+    for i in range(repeat):
+        target = os.path.join(out_dir, f"bench_{compression}_{level}_{i}.{export_format}")
+        start = time.perf_counter()
+        written = exporter.export(data, format=export_format, output_filepath=target)
+        best = min(best, time.perf_counter() - start)
+        size = os.path.getsize(written)
+        os.remove(written)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nps", type=int, default=20000, help="Number of top-level noun phrases")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is reported)")
+    parser.add_argument("--formats", nargs="+", default=["json", "csv", "txt"], choices=["json", "csv", "txt"])
+    parser.add_argument("--dir", default=None, help="Directory to write to (e.g. a network share)")
+    args = parser.parse_args()
+
+    data = make_result(args.nps)
+    configs = [(COMPRESSION_NONE, None)]
+    for compression in get_available_compressions():
+        if compression in COMPRESSION_LEVELS:
+            min_level, max_level, default_level = COMPRESSION_LEVELS[compression]
+            for level in sorted({min_level, default_level, max_level}):
+                configs.append((compression, level))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as out_dir:
+        print(f"{'format':<6} {'compression':<12} {'level':>5} {'time (s)':>9} {'MB/s':>8} {'size (KB)':>10} {'ratio':>6}")
+        for export_format in args.formats:
+            baseline_size = None
+            for compression, level in configs:
+                seconds, size = bench_one(data, export_format, compression, level, args.repeat, out_dir)
+                if baseline_size is None:
+                    baseline_size = size
+                throughput = (baseline_size / (1024 * 1024)) / seconds if seconds > 0 else 0.0
+                print(f"{export_format:<6} {compression:<12} {str(level or '-'):>5} {seconds:>9.3f} "
+                      f"{throughput:>8.1f} {size / 1024:>10.1f} {size / baseline_size:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
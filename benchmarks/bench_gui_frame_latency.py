@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark GUI frame latency while a batch extraction runs.
+
+A 16 ms timer stands in for the GUI's repaint/input cadence; the delay
+between its ticks shows how long the event loop was blocked. The same batch
+is run with the extractor on a worker thread of this process and in an
+engine child process (anpe_studio.engine_process), and tick intervals are
+reported as percentiles together with the number of frames that overran
+the budget.
+
+By default a CPU-bound stand-in extractor is used (it holds the GIL in long
+native calls like spaCy/Benepar parsing does), so no models are needed.
+Pass --extractor anpe to use real ANPE models instead.
+
+Usage:
+    python benchmarks/bench_gui_frame_latency.py [--files 20] [--work-ms 200] [--extractor stand-in|anpe] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Allow running from the repository root without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FRAME_MS = 16
+WORK_MS_KEY = "bench_work_ms"
+GIL_CHUNK_ITEMS = 200_000 # Sorting this many floats holds the GIL for roughly 20-50 ms
+SAMPLE_TEXT = ("The quick brown fox jumped over the lazy dog near the old stone bridge. "
+               "A large corpus of noun phrases was analysed by the research team. ")
+
+
+class BusyExtractor:
+    """
+    Stand-in extractor that burns CPU for a fixed time per text, in
+    C-level steps that hold the GIL for several milliseconds each (as
+    spaCy's and Benepar's native code does) rather than Python bytecode,
+    which the interpreter would interrupt every few milliseconds.
+    """
+
+    def __init__(self, config=None):
+        self.work_seconds = (config or {}).get(WORK_MS_KEY, 200) / 1000.0
+        self._data = [random.random() for _ in range(GIL_CHUNK_ITEMS)]
+
+    def extract(self, text, metadata=False, include_nested=False):
+        deadline = time.perf_counter() + self.work_seconds
+        while time.perf_counter() < deadline:
+            sorted(self._data) # One uninterruptible C call
+        words = text.split()
+        return {"timestamp": "", "configuration": {"metadata_requested": metadata, "nested_requested": include_nested},
+                "results": [{"id": str(i + 1), "noun_phrase": " ".join(words[i:i + 3]), "level": 1,
+                             "metadata": {"length": 3, "structures": ["determiner"]}, "children": []}
+                            for i in range(0, len(words), 3)]}
+
+
+def busy_extractor_factory(run_config):
+    return BusyExtractor(run_config)
+
+
+def summarize(intervals_ms, wall_seconds):
+    """Percentiles of frame intervals and frames that overran twice the budget."""
+    if not intervals_ms:
+        return {"frames": 0}
+    ordered = sorted(intervals_ms)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+    return {
+        "frames": len(ordered),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(pct(95), 2),
+        "p99_ms": round(pct(99), 2),
+        "max_ms": round(ordered[-1], 2),
+        "late_frames": sum(1 for interval in ordered if interval > 2 * FRAME_MS),
+        "wall_s": round(wall_seconds, 2),
+    }
+
+
+def run_mode(mode, file_paths, config, factory, idle_seconds):
+    """Run one batch (or idle for idle_seconds) and return frame statistics."""
+    from PyQt6.QtCore import QCoreApplication, QThread, QTimer, Qt
+
+    app = QCoreApplication.instance()
+    intervals = []
+    last_tick = [time.perf_counter()]
+
+    def on_tick():
+        now = time.perf_counter()
+        intervals.append((now - last_tick[0]) * 1000.0)
+        last_tick[0] = now
+
+    frame_timer = QTimer()
+    frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+    frame_timer.setInterval(FRAME_MS)
+    frame_timer.timeout.connect(on_tick)
+
+    engine_pool = extractor_pool = None
+    if mode == "idle":
+        QTimer.singleShot(int(idle_seconds * 1000), app.quit)
+    else:
+        from anpe_studio.workers.batch_worker import BatchWorker
+        if mode == "engine-process":
+            from anpe_studio.engine_process import EngineProcessPool
+            engine_pool = EngineProcessPool(factory=factory, max_idle=1)
+            engine = engine_pool.acquire(config) # Warm up: start the process and load the extractor
+            engine.extract(config, SAMPLE_TEXT, False, False)
+            engine_pool.release(engine)
+        else:
+            from anpe_studio.extractor_pool import ExtractorPool
+            extractor_pool = ExtractorPool(factory=factory)
+            extractor_pool.extract(config, SAMPLE_TEXT, False, False) # Warm up
+        from anpe_studio.result_store import ResultStore
+        result_store = ResultStore() # The worker puts results here and emits their ids, as for the job queue
+        worker = BatchWorker(file_paths, config, "", include_metadata=True, include_nested=False,
+                             use_daemon=False, extractor_pool=extractor_pool, engine_pool=engine_pool,
+                             result_store=result_store)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        # Read each result as the GUI does, then release it
+        worker.signals.file_results.connect(
+            lambda handles: [len(result_store.pop(result_id).get("results", [])) for _, result_id in handles])
+        worker.signals.finished.connect(thread.quit)
+        thread.finished.connect(app.quit)
+        QTimer.singleShot(0, thread.start)
+
+    started = time.perf_counter()
+    last_tick[0] = started
+    frame_timer.start()
+    app.exec()
+    wall = time.perf_counter() - started
+    frame_timer.stop()
+    if mode != "idle":
+        thread.wait()
+    if engine_pool is not None:
+        engine_pool.shutdown()
+    return summarize(intervals, wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--files", type=int, default=20, help="Files in the batch.")
+    parser.add_argument("--paragraphs", type=int, default=40, help="Sample paragraphs per file.")
+    parser.add_argument("--work-ms", type=int, default=200, help="CPU time per file for the stand-in extractor.")
+    parser.add_argument("--extractor", choices=["stand-in", "anpe"], default="stand-in")
+    parser.add_argument("--modes", nargs="+", default=["idle", "in-process", "engine-process"],
+                        choices=["idle", "in-process", "engine-process"])
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QCoreApplication
+    app = QCoreApplication(sys.argv) # noqa: F841 (kept alive for the event loops below)
+
+    if args.extractor == "anpe":
+        from anpe_studio.extractor_pool import anpe_extractor_factory
+        factory, config = anpe_extractor_factory, {}
+    else:
+        factory, config = busy_extractor_factory, {WORK_MS_KEY: args.work_ms}
+
+    report = {"frame_budget_ms": FRAME_MS, "extractor": args.extractor, "files": args.files, "modes": {}}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp_dir, f"doc_{i:04d}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SAMPLE_TEXT * args.paragraphs)
+            file_paths.append(path)
+
+        idle_seconds = args.files * args.work_ms / 1000.0 if args.extractor == "stand-in" else 5.0
+        print(f"{'mode':<16}{'frames':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'late':>7}{'wall s':>9}")
+        for mode in args.modes:
+            stats = run_mode(mode, file_paths, config, factory, idle_seconds)
+            report["modes"][mode] = stats
+            if not stats["frames"]:
+                print(f"{mode:<16}{0:>8}")
+                continue
+            print(f"{mode:<16}{stats['frames']:>8}{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}"
+                  f"{stats['max_ms']:>9}{stats['late_frames']:>7}{stats['wall_s']:>9}")
+    print(f"('late' counts frames that took longer than {2 * FRAME_MS} ms)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Import-time report for the modules loaded before the splash screen paints.
+
+Runs `python -X importtime -c "import anpe_studio.app"` in fresh interpreters
+(best of --repeat runs per module), then reports the total import time, the
+slowest modules by cumulative and self time, and the time per top-level
+package. The modules that must stay off the startup path (anpe, spaCy,
+NLTK, Benepar, the main window and the settings/help dialogs) are checked
+as well: if any of them is imported, it is listed with the chain of imports
+that pulled it in and the script exits with status 1, so it can guard
+against regressions in CI or before a release.
+
+--json writes the report; --compare takes an earlier report and shows the
+modules whose cumulative time changed the most.
+
+Usage:
+    python benchmarks/bench_import_time.py [--module anpe_studio.app] [--repeat 5] [--top 15] [--json out.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded lazily on first use; importing one of these before the splash is a regression
+STARTUP_FORBIDDEN = ("anpe", "spacy", "nltk", "benepar", "torch",
+                     "anpe_studio.main_window", "anpe_studio.widgets.settings_dialog",
+                     "anpe_studio.widgets.help_dialog", "anpe_studio.workers.settings_workers")
+
+
+def run_importtime(module: str):
+    """Import module in a fresh interpreter; return [(name, depth, self_us, cumulative_us)] in output order."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None) # Measure with bytecode caches, as an installed app runs
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=env, cwd=REPO_ROOT)
+    if proc.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # Column header
+        name_field = fields[2][1:] # One separator space, then two spaces per nesting level
+        name = name_field.lstrip(" ")
+        depth = (len(name_field) - len(name)) // 2
+        entries.append((name, depth, int(fields[0]), int(fields[1])))
+    return entries
+
+
+def import_chain(entries, index):
+    """Names of the modules that imported entries[index], outermost first (children are printed before parents)."""
+    chain = [entries[index][0]]
+    depth = entries[index][1]
+    for name, parent_depth, _, _ in entries[index + 1:]:
+        if parent_depth < depth:
+            chain.append(name)
+            depth = parent_depth
+    return list(reversed(chain))
+
+
+def is_forbidden(name: str, forbidden) -> bool:
+    return any(name == prefix or name.startswith(prefix + ".") for prefix in forbidden)
+
+
+def build_report(module: str, runs, forbidden):
+    """Merge runs (best time per module) into a report dict."""
+    best = {}
+    for entries in runs:
+        for name, depth, self_us, cumulative_us in entries:
+            previous = best.get(name)
+            if previous is None or cumulative_us < previous["cumulative_us"]:
+                best[name] = {"self_us": self_us, "cumulative_us": cumulative_us, "depth": depth}
+    # Total: top-level imports of the last run, with each module at its best time
+    last = runs[-1]
+    total_us = sum(best[name]["cumulative_us"] for name, depth, _, _ in last if depth == 0)
+    by_package = defaultdict(int)
+    for name, stats in best.items():
+        by_package[name.split(".")[0]] += stats["self_us"]
+    violations = []
+    for index, (name, _, _, _) in enumerate(last):
+        if is_forbidden(name, forbidden):
+            chain = import_chain(last, index)
+            if not any(is_forbidden(parent, forbidden) for parent in chain[:-1]): # Submodules are implied
+                violations.append({"module": name, "chain": chain})
+    return {"module": module, "runs": len(runs), "total_ms": round(total_us / 1000.0, 1),
+            "module_count": len(best), "modules": best,
+            "packages_ms": {package: round(us / 1000.0, 1)
+                            for package, us in sorted(by_package.items(), key=lambda item: -item[1])},
+            "forbidden": list(forbidden), "violations": violations}
+
+
+def print_report(report, top: int):
+    print(f"import {report['module']}: {report['total_ms']} ms, {report['module_count']} modules "
+          f"(best of {report['runs']} runs)")
+    modules = report["modules"]
+    print(f"\n{'slowest (cumulative)':<56}{'cum ms':>9}{'self ms':>9}")
+    for name, stats in sorted(modules.items(), key=lambda item: -item[1]["cumulative_us"])[:top]:
+        print(f"{name:<56}{stats['cumulative_us'] / 1000.0:>9.1f}{stats['self_us'] / 1000.0:>9.1f}")
+    print(f"\n{'slowest (self)':<56}{'self ms':>9}")
+    for name, stats in sorted(modules.items(), key=lambda item: -item[1]["self_us"])[:top]:
+        print(f"{name:<56}{stats['self_us'] / 1000.0:>9.1f}")
+    print(f"\n{'package':<56}{'self ms':>9}")
+    for package, ms in list(report["packages_ms"].items())[:top]:
+        print(f"{package:<56}{ms:>9.1f}")
+
+
+def print_comparison(report, baseline, top: int):
+    old_modules = baseline.get("modules", {})
+    print(f"\nvs. {baseline.get('module')}: {baseline.get('total_ms')} ms -> {report['total_ms']} ms "
+          f"({report['total_ms'] - baseline.get('total_ms', 0):+.1f} ms)")
+    added = sorted(set(report["modules"]) - set(old_modules))
+    removed = sorted(set(old_modules) - set(report["modules"]))
+    deltas = [(name, (stats["cumulative_us"] - old_modules[name]["cumulative_us"]) / 1000.0)
+              for name, stats in report["modules"].items() if name in old_modules]
+    print(f"{'largest changes (cumulative)':<56}{'delta ms':>9}")
+    for name, delta in sorted(deltas, key=lambda item: -abs(item[1]))[:top]:
+        print(f"{name:<56}{delta:>+9.1f}")
+    if added:
+        print(f"newly imported ({len(added)}): {', '.join(added[:top])}{' ...' if len(added) > top else ''}")
+    if removed:
+        print(f"no longer imported ({len(removed)}): {', '.join(removed[:top])}{' ...' if len(removed) > top else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--module", default="anpe_studio.app",
+                        help="Module to import (default: the entry module, i.e. what loads before the splash).")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to run (best time per module).")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table.")
+    parser.add_argument("--allow", nargs="*", default=[], metavar="MODULE",
+                        help="Remove modules from the forbidden list (e.g. when checking anpe_studio.main_window itself).")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON.")
+    parser.add_argument("--compare", metavar="PATH", help="Earlier --json report to compare against.")
+    args = parser.parse_args()
+
+    run_importtime(args.module) # Warm-up: writes bytecode caches and fills the OS file cache
+    runs = [run_importtime(args.module) for _ in range(max(1, args.repeat))]
+    forbidden = [name for name in STARTUP_FORBIDDEN if name not in args.allow]
+    report = build_report(args.module, runs, forbidden)
+    print_report(report, args.top)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(report, json.load(f), args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if report["violations"]:
+        print(f"\n{len(report['violations'])} module(s) that should load lazily were imported:")
+        for violation in report["violations"]:
+            print(f"  {violation['module']}: {' -> '.join(violation['chain'])}")
+        sys.exit(1)
+    print("\nNo lazily loaded module was imported.")
+
+
+if __name__ == "__main__":
+    main()
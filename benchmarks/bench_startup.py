@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Benchmark ANPE Studio's cold start and check it against a stored baseline.
+
+Each run launches the real entry point (anpe_studio.app.main) in a fresh
+interpreter on the offscreen Qt platform and records, in milliseconds
+since the process was spawned:
+
+    app_imported        `import anpe_studio.app` finished
+    splash_painted      first paint event of the splash screen
+    model_check_done    ModelStatusChecker.run() returned
+    main_window_created MainWindow.__init__() returned
+    fade_in_done        the main window's fade-in animation finished
+
+(interpreter_ready marks the harness's first line, i.e. interpreter
+startup), plus the ModelStatusChecker run time, the main window's import and
+construction times (and, with a cached model status, the background
+verification time), and the process RSS at each point. A stub `anpe`
+package (written to a temporary directory and put first on the path) stands
+in for the real library, so no models are needed; --model-check-ms adds a
+delay to its model lookup. Each run starts without a model cache (as after
+installing or updating packages) unless --warm-model-cache is given, in
+which case the runs share one data directory and start from the cache the
+warm-up run wrote. Settings are read from an empty temporary
+directory on Linux (elsewhere Qt's native settings store cannot be
+redirected).
+
+The median of --runs runs is compared with --baseline (default:
+benchmarks/baselines/startup_offscreen.json, which is not in version
+control). If the baseline does not exist yet, the run (with --app-code
+repo) is recorded as the baseline instead. A metric regresses when it
+exceeds baseline * (1 + tolerance) + slack; tolerances come from the
+command line, then from the baseline file's "tolerances", then from the
+defaults below. The script exits with status 1 on a regression.
+Baselines are machine-specific: refresh one with --save-baseline on the
+machine that runs the comparison.
+
+--app-code measures the app code as an install lays it out, copied to a
+temporary directory: "source" (no bytecode, and none written, i.e. the first
+launch after an install that does not precompile), "compiled" (bytecode at
+every optimization level, as the installers now write it) or "zip" (the
+installers' optional zipimport package, with the resources beside it). The
+default, "repo", imports the working tree with whatever caches it has.
+Compare modes with --no-baseline; the baseline is recorded with "repo".
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--json out.json] [--baseline PATH | --no-baseline] [--save-baseline PATH]
+                                       [--app-code {repo,source,compiled,zip}]
+                                       [--tolerance 0.25] [--slack-ms 50] [--rss-tolerance 0.15] [--slack-mb 10]
+                                       [--metric-tolerance fade_in_done_ms=0.5 ...]
+"""
+
+import argparse
+import compileall
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baselines", "startup_offscreen.json")
+
+SPAWN_ENV_VAR = "ANPE_BENCH_SPAWN_NS"      # perf_counter_ns() just before the child was started
+MODEL_CHECK_ENV_VAR = "ANPE_BENCH_MODEL_CHECK_MS"
+SETTLE_MS = 200 # Event loop time after the fade-in before the run ends
+
+DEFAULT_TOLERANCE = 0.25     # Relative, for times
+DEFAULT_SLACK_MS = 50.0      # Absolute allowance on top, so short phases are not flagged for noise
+DEFAULT_RSS_TOLERANCE = 0.15
+DEFAULT_SLACK_MB = 10.0
+
+APP_CODE_MODES = ("repo", "source", "compiled", "zip")
+APP_ZIP_NAME = "anpe_studio.zip" # As the installers name it
+
+MILESTONES = ("interpreter_ready", "app_imported", "splash_painted", "model_check_done", "main_window_created", "fade_in_done")
+
+STUB_ANPE_INIT = '''"""Stand-in for the anpe package (startup benchmark only)."""
+__version__ = "0.0.0+bench"
+
+
+class ANPEExtractor:
+    def __init__(self, config=None):
+        self.config = config or {}
+
+    def extract(self, text, metadata=False, include_nested=False):
+        return {"timestamp": "", "configuration": {}, "results": []}
+'''
+
+STUB_MODEL_FINDER = f'''import os
+import time
+
+
+def _delay():
+    time.sleep(float(os.environ.get("{MODEL_CHECK_ENV_VAR}", "0")) / 1000.0)
+
+
+def find_installed_spacy_models():
+    _delay()
+    return ["en_core_web_md"]
+
+
+def find_installed_benepar_models():
+    return ["benepar_en3"]
+'''
+
+
+def write_stub_anpe(directory: str):
+    """Write a minimal anpe package (with dist-info, for importlib.metadata) into directory."""
+    os.makedirs(os.path.join(directory, "anpe", "utils"))
+    files = {
+        os.path.join("anpe", "__init__.py"): STUB_ANPE_INIT,
+        os.path.join("anpe", "utils", "__init__.py"): "",
+        os.path.join("anpe", "utils", "model_finder.py"): STUB_MODEL_FINDER,
+        os.path.join("anpe-0.0.0+bench.dist-info", "METADATA"): "Metadata-Version: 2.1\nName: anpe\nVersion: 0.0.0+bench\n",
+    }
+    os.makedirs(os.path.join(directory, "anpe-0.0.0+bench.dist-info"))
+    for relative_path, content in files.items():
+        with open(os.path.join(directory, relative_path), "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def prepare_app_code(mode: str, directory: str) -> list:
+    """
+    Lay out the app code in directory as an install with this --app-code mode
+    would, and return the entries to put first on PYTHONPATH.
+    """
+    if mode == "repo":
+        return [REPO_ROOT]
+    app_dir = os.path.join(directory, "anpe_studio")
+    shutil.copytree(os.path.join(REPO_ROOT, "anpe_studio"), app_dir, ignore=shutil.ignore_patterns("__pycache__"))
+    if mode == "compiled":
+        compileall.compile_dir(app_dir, quiet=1, workers=0, optimize=[0, 1, 2])
+    elif mode == "zip":
+        staging_dir = os.path.join(directory, "zip_staging")
+        shutil.copytree(app_dir, os.path.join(staging_dir, "anpe_studio"), ignore=shutil.ignore_patterns("resources"))
+        compileall.compile_dir(staging_dir, quiet=1, workers=0, legacy=True)
+        zip_path = os.path.join(directory, APP_ZIP_NAME)
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as archive:
+            for root, _, files in os.walk(staging_dir):
+                for name in sorted(files):
+                    if name.endswith((".py", ".pyc")):
+                        path = os.path.join(root, name)
+                        archive.write(path, os.path.relpath(path, staging_dir).replace(os.sep, "/"))
+        shutil.rmtree(staging_dir)
+        return [zip_path, directory] # As run.py orders them: modules from the zip, resources from the directory
+    return [directory]
+
+
+def rss_mb():
+    """Resident set size of this process in MB (peak RSS where the current value is unavailable)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024 # Bytes on macOS, KB elsewhere
+    except ImportError:
+        return None
+
+
+# --- Child: one instrumented start ---
+
+def run_child(result_path: str):
+    spawn_ns = int(os.environ[SPAWN_ENV_VAR])
+    record = {"marks": {}, "rss_mb": {}, "durations": {}}
+
+    def mark(name):
+        record["marks"][name] = (time.perf_counter_ns() - spawn_ns) / 1e6
+        record["rss_mb"][name] = rss_mb()
+
+    def write_result():
+        with open(result_path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+
+    mark("interpreter_ready")
+
+    import importlib.abc
+    import importlib.util
+
+    settings_dir = os.path.join(os.path.dirname(result_path), "settings") # Removed with the run's directory
+    from PyQt6.QtCore import QEvent, QObject, QSettings, QTimer
+    from PyQt6.QtWidgets import QApplication
+    for settings_format in (QSettings.Format.NativeFormat, QSettings.Format.IniFormat):
+        QSettings.setPath(settings_format, QSettings.Scope.UserScope, settings_dir)
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and "splash_painted" not in record["marks"]:
+                mark("splash_painted")
+            return False
+
+    paint_watcher = PaintWatcher()
+
+    def instrument_main_window(module, import_ms):
+        record["durations"]["main_window_import_ms"] = import_ms
+        window_class = module.MainWindow
+        original_init, original_fade_in = window_class.__init__, window_class.fade_in
+
+        def timed_init(self, *args, **kwargs):
+            start = time.perf_counter_ns()
+            original_init(self, *args, **kwargs)
+            record["durations"]["main_window_init_ms"] = (time.perf_counter_ns() - start) / 1e6
+            mark("main_window_created")
+
+        def watched_fade_in(self, *args, **kwargs):
+            original_fade_in(self, *args, **kwargs)
+
+            def on_faded_in():
+                mark("fade_in_done")
+                QTimer.singleShot(SETTLE_MS, QApplication.quit)
+
+            self._fade_animation.finished.connect(on_faded_in)
+
+        window_class.__init__, window_class.fade_in = timed_init, watched_fade_in
+
+    class MainWindowImportHook(importlib.abc.MetaPathFinder):
+        """Instruments anpe_studio.main_window when app.py imports it, without importing it early."""
+
+        def find_spec(self, fullname, path, target=None):
+            if fullname != "anpe_studio.main_window":
+                return None
+            sys.meta_path.remove(self)
+            spec = importlib.util.find_spec(fullname)
+            original_exec = spec.loader.exec_module
+
+            def exec_module(module):
+                del spec.loader.exec_module # zipimport shares one loader between modules: instrument this one only
+                start = time.perf_counter_ns()
+                original_exec(module)
+                instrument_main_window(module, (time.perf_counter_ns() - start) / 1e6)
+
+            spec.loader.exec_module = exec_module
+            return spec
+
+    sys.meta_path.insert(0, MainWindowImportHook())
+
+    import anpe_studio.app as app_module
+    mark("app_imported")
+
+    from anpe_studio.splash_screen import SplashScreen
+    from anpe_studio.workers.status_worker import ModelStatusChecker
+    original_splash_init, original_run = SplashScreen.__init__, ModelStatusChecker.run
+
+    def watched_splash_init(self, *args, **kwargs):
+        original_splash_init(self, *args, **kwargs)
+        self.installEventFilter(paint_watcher)
+
+    def timed_run(self):
+        start = time.perf_counter_ns()
+        original_run(self)
+        elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+        if "model_check_done" in record["marks"]: # The main window verifying a cached status
+            record["durations"]["model_verify_ms"] = elapsed_ms
+        else:
+            record["durations"]["model_check_ms"] = elapsed_ms
+            mark("model_check_done")
+
+    SplashScreen.__init__, ModelStatusChecker.run = watched_splash_init, timed_run
+
+    sys.argv = sys.argv[:1] # The harness's own arguments are not inputs to open
+    try:
+        app_module.main()
+    except SystemExit:
+        pass
+    write_result()
+
+
+# --- Parent: runs, summary, baseline ---
+
+def run_once(stub_dir: str, model_check_ms: int, timeout: float, data_dir: Optional[str] = None,
+             app_paths: Optional[list] = None, app_code: str = "repo"):
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [stub_dir, *(app_paths or [REPO_ROOT]), env.get("PYTHONPATH")]))
+    if app_code == "source":
+        env["PYTHONDONTWRITEBYTECODE"] = "1" # Every run compiles the app from source
+    elif app_code in ("compiled", "zip"):
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["ANPE_STUDIO_DAEMON"] = "0" # Never connect to a running extraction daemon
+    env[MODEL_CHECK_ENV_VAR] = str(model_check_ms)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env["ANPE_STUDIO_DATA_DIR"] = data_dir or tmp_dir # A shared data dir keeps the model cache between runs
+        result_path = os.path.join(tmp_dir, "startup.json")
+        env[SPAWN_ENV_VAR] = str(time.perf_counter_ns())
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", result_path],
+                              env=env, cwd=REPO_ROOT, capture_output=True, text=True, timeout=timeout)
+        if not os.path.exists(result_path):
+            sys.exit(f"Startup run failed (exit code {proc.returncode}):\n{proc.stderr[-3000:]}")
+        with open(result_path, encoding="utf-8") as f:
+            record = json.load(f)
+    missing = [name for name in MILESTONES if name not in record["marks"]]
+    if missing:
+        sys.exit(f"Startup run did not reach: {', '.join(missing)}\n{proc.stderr[-3000:]}")
+    metrics = {f"{name}_ms": record["marks"][name] for name in MILESTONES}
+    metrics.update(record["durations"])
+    metrics.update({f"rss_{name}_mb": value for name, value in record["rss_mb"].items()
+                    if name in MILESTONES and value is not None})
+    return metrics
+
+
+def summarize(runs):
+    summary = {}
+    for name in runs[0]:
+        values = [run[name] for run in runs if name in run]
+        summary[name] = {"median": round(statistics.median(values), 1), "min": round(min(values), 1),
+                         "max": round(max(values), 1)}
+    return summary
+
+
+def resolve_tolerances(args, baseline):
+    """Relative tolerance and absolute slack per metric: command line > baseline file > defaults."""
+    file_tolerances = baseline.get("tolerances", {})
+    overrides = dict(item.split("=", 1) for item in args.metric_tolerance)
+    resolved = {}
+    for name in baseline.get("metrics", {}):
+        is_rss = name.endswith("_mb")
+        relative = overrides.get(name, file_tolerances.get(name))
+        if relative is None:
+            given = args.rss_tolerance if is_rss else args.tolerance
+            relative = given if given is not None else file_tolerances.get(
+                "rss" if is_rss else "time", DEFAULT_RSS_TOLERANCE if is_rss else DEFAULT_TOLERANCE)
+        slack = args.slack_mb if is_rss else args.slack_ms
+        if slack is None:
+            slack = file_tolerances.get("slack_mb" if is_rss else "slack_ms", DEFAULT_SLACK_MB if is_rss else DEFAULT_SLACK_MS)
+        resolved[name] = (float(relative), float(slack))
+    return resolved
+
+
+def compare(summary, baseline, tolerances):
+    """Return a list of (metric, baseline, current, limit, regressed)."""
+    rows = []
+    for name, base_value in baseline.get("metrics", {}).items():
+        if name not in summary:
+            continue
+        relative, slack = tolerances[name]
+        limit = base_value * (1 + relative) + slack
+        current = summary[name]["median"]
+        rows.append((name, base_value, current, round(limit, 1), current > limit))
+    return rows
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        run_child(sys.argv[2])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to run (the median is compared).")
+    parser.add_argument("--model-check-ms", type=int, default=0, help="Delay added to the stub's model lookup.")
+    parser.add_argument("--warm-model-cache", action="store_true",
+                        help="Start from a valid model cache (discovery is then verified in the background).")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a run is abandoned.")
+    parser.add_argument("--app-code", choices=APP_CODE_MODES, default="repo",
+                        help="How the app code is laid out (see above; default: the working tree).")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument("--no-baseline", action="store_true", help="Only measure.")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write this run's medians as a new baseline.")
+    parser.add_argument("--tolerance", type=float, help=f"Allowed relative slowdown (default {DEFAULT_TOLERANCE}).")
+    parser.add_argument("--slack-ms", type=float, help=f"Absolute allowance per time metric (default {DEFAULT_SLACK_MS}).")
+    parser.add_argument("--rss-tolerance", type=float, help=f"Allowed relative RSS growth (default {DEFAULT_RSS_TOLERANCE}).")
+    parser.add_argument("--slack-mb", type=float, help=f"Absolute allowance per RSS metric (default {DEFAULT_SLACK_MB}).")
+    parser.add_argument("--metric-tolerance", action="append", default=[], metavar="METRIC=REL",
+                        help="Relative tolerance for one metric (repeatable).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as stub_dir, tempfile.TemporaryDirectory() as app_root:
+        write_stub_anpe(stub_dir)
+        data_dir = os.path.join(stub_dir, "data") if args.warm_model_cache else None
+        app_paths = prepare_app_code(args.app_code, app_root)
+        run_args = (stub_dir, args.model_check_ms, args.timeout, data_dir, app_paths, args.app_code)
+        run_once(*run_args) # Warm-up: bytecode caches (where written), OS file cache
+        runs = []
+        for i in range(max(1, args.runs)):
+            runs.append(run_once(*run_args))
+            print(f"run {i + 1}: fade-in done at {runs[-1]['fade_in_done_ms']:.0f} ms")
+    summary = summarize(runs)
+
+    print(f"\n{'metric':<32}{'median':>10}{'min':>10}{'max':>10}")
+    for name, stats in summary.items():
+        print(f"{name:<32}{stats['median']:>10}{stats['min']:>10}{stats['max']:>10}")
+
+    report = {"runs": len(runs), "model_check_ms": args.model_check_ms, "warm_model_cache": args.warm_model_cache,
+              "app_code": args.app_code, "platform": sys.platform,
+              "python": sys.version.split()[0], "summary": summary}
+
+    regressions = []
+    if not args.no_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(summary, baseline, resolve_tolerances(args, baseline))
+        print(f"\nvs. baseline {os.path.relpath(args.baseline)}")
+        print(f"{'metric':<32}{'baseline':>10}{'current':>10}{'limit':>10}")
+        for name, base_value, current, limit, regressed in rows:
+            print(f"{name:<32}{base_value:>10}{current:>10}{limit:>10}{'  REGRESSED' if regressed else ''}")
+        regressions = [row[0] for row in rows if row[4]]
+        report["baseline"] = args.baseline
+        report["regressions"] = regressions
+    elif not args.no_baseline:
+        if args.app_code == "repo" and not args.save_baseline:
+            # First run on this machine: record the baseline later runs are compared with
+            print(f"\nNo baseline at {os.path.relpath(args.baseline)}; recording this run as this machine's baseline.")
+            args.save_baseline = args.baseline
+        else:
+            print(f"\nNo baseline at {args.baseline}; record one with --save-baseline.")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        baseline = {"description": "Median offscreen startup metrics (benchmarks/bench_startup.py).",
+                    "platform": sys.platform, "python": report["python"], "runs": len(runs),
+                    "model_check_ms": args.model_check_ms,
+                    "tolerances": {"time": args.tolerance if args.tolerance is not None else DEFAULT_TOLERANCE,
+                                   "slack_ms": args.slack_ms if args.slack_ms is not None else DEFAULT_SLACK_MS,
+                                   "rss": args.rss_tolerance if args.rss_tolerance is not None else DEFAULT_RSS_TOLERANCE,
+                                   "slack_mb": args.slack_mb if args.slack_mb is not None else DEFAULT_SLACK_MB},
+                    "metrics": {name: stats["median"] for name, stats in summary.items()}}
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
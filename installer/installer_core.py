@@ -37,6 +37,11 @@ DOCS_DIR_NAME = "docs"
 # Constants for executable names
 LAUNCHER_EXE_NAME = "anpe.exe"
 UNINSTALLER_EXE_NAME = "uninstall.exe"
+# Bytecode compiled at install time, so the first launch does not compile from source
+APP_BYTECODE_OPTIMIZATION_LEVELS = (0, 1, 2) # App code: plain, -O and -OO
+# Optional zip of the app code for zipimport (anpe_studio/run.py puts it first on sys.path)
+APP_ZIP_NAME = "anpe_studio.zip"
+APP_ZIP_ENV_VAR = "ANPE_INSTALLER_APP_ZIP" # Set to 1 to build the zip
 
 # --- Logging Setup (basic if run standalone) ---
 if __name__ == "__main__":
@@ -375,6 +380,84 @@ def copy_app_code(target_install_path: str):
         logger.error(f"Unexpected error copying GUI source: {e}", exc_info=True)
         print_failure(f"An unexpected error occurred while copying application source code: {e}")
 
+def app_zip_requested() -> bool:
+    """Whether the app code should also be packaged as a zip (APP_ZIP_ENV_VAR or --zip-app)."""
+    return os.environ.get(APP_ZIP_ENV_VAR, "") not in ("", "0")
+
+def run_compileall(python_exe: str, paths: list, optimization_levels=(0,), legacy_layout: bool = False) -> bool:
+    """
+    Compile the .py files under paths with the target interpreter (bytecode is
+    version specific, so never with the installer's own Python). Returns False
+    if compileall reported errors; some packages ship files that do not compile
+    (templates, Python 2 leftovers), so callers log this rather than fail.
+    """
+    command = [python_exe, "-m", "compileall", "-q", "-j", "0"]
+    for level in optimization_levels:
+        command += ["-o", str(level)]
+    if legacy_layout:
+        command.append("-b") # module.pyc next to module.py, the layout zipimport reads
+    command += [str(path) for path in paths]
+    logger.info(f"Executing compileall command: {' '.join(command)}")
+    try:
+        creationflags = subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+        result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8', errors='replace', creationflags=creationflags)
+    except OSError as e:
+        logger.warning(f"Could not run compileall: {e}")
+        return False
+    if result.returncode != 0:
+        logger.warning(f"compileall reported errors (exit code {result.returncode}):\n{result.stdout[-4000:]}\n{result.stderr[-4000:]}")
+        return False
+    return True
+
+def build_app_zip(python_exe: str, app_code_path: Path, zip_path: Path):
+    """Package the app code's modules (.py with their .pyc) as a zip for zipimport; resources stay on disk."""
+    with tempfile.TemporaryDirectory() as staging_dir:
+        staged_app = Path(staging_dir) / APP_CODE_DIR_NAME
+        shutil.copytree(app_code_path, staged_app,
+                        ignore=lambda dir, files: [f for f in files if f == '__pycache__' or f == 'resources'])
+        run_compileall(python_exe, [staged_app], legacy_layout=True)
+        temp_zip_path = zip_path.with_name(zip_path.name + ".tmp")
+        # Stored, not deflated: zipimport then reads the bytecode without decompressing it
+        with zipfile.ZipFile(temp_zip_path, "w", zipfile.ZIP_STORED) as archive:
+            for file_path in sorted(staged_app.rglob("*")):
+                if file_path.suffix in (".py", ".pyc"):
+                    archive.write(file_path, file_path.relative_to(staging_dir).as_posix())
+        os.replace(temp_zip_path, zip_path)
+
+def compile_app_bytecode(python_exe: str, target_install_path: str, include_dependencies: bool, zip_app: bool = False):
+    """
+    Precompile the installed app code (and, after a fresh package install, site-packages)
+    so the first launch loads bytecode, and build or remove the optional app zip.
+    Failures are logged: the app still runs from source, only its first start is slower.
+    """
+    print_step("Compiling application bytecode...")
+    install_path = Path(target_install_path)
+    app_code_path = install_path / APP_CODE_DIR_NAME
+    if not run_compileall(python_exe, [app_code_path], APP_BYTECODE_OPTIMIZATION_LEVELS):
+        logger.warning("Some application modules could not be precompiled; they will be compiled on first use.")
+    if include_dependencies:
+        # pip already compiles what it installs; this fills gaps (e.g. packages installed without bytecode)
+        site_packages = install_path / PYTHON_DIR_NAME / "Lib" / "site-packages"
+        if site_packages.is_dir() and not run_compileall(python_exe, [site_packages]):
+            logger.warning("Some installed packages could not be precompiled (usually harmless).")
+
+    zip_path = install_path / APP_ZIP_NAME
+    try:
+        if zip_app:
+            print_step("Packaging application code for zipimport...")
+            build_app_zip(python_exe, app_code_path, zip_path)
+            logger.info(f"Built {zip_path}")
+        elif zip_path.exists():
+            zip_path.unlink() # A zip from an earlier install would shadow the new code
+            logger.info(f"Removed outdated {zip_path}")
+    except Exception as e:
+        logger.warning(f"Could not update the application zip, running from the source directory: {e}", exc_info=True)
+        try:
+            zip_path.unlink()
+        except OSError:
+            pass
+    print_step("Application bytecode compiled.")
+
 def copy_bundled_executables(target_install_path: str):
     """Copies the bundled anpe.exe and uninstall.exe to the target dir."""
     executables_to_copy = {
@@ -487,8 +570,10 @@ def main(install_path: str):
         # 6. Install packages from requirements file
         install_required_packages(python_exe, str(install_path_abs))
 
-    # 7. Copy application code (anpe_studio source)
+    # 7. Copy application code (anpe_studio source) and precompile it
     copy_app_code(str(install_path_abs))
+    compile_app_bytecode(python_exe, str(install_path_abs), include_dependencies=not was_upgrade,
+                         zip_app=app_zip_requested())
 
     # 8. Copy bundled executables (anpe.exe, uninstall.exe)
     copy_bundled_executables(str(install_path_abs))
@@ -503,9 +588,12 @@ def main(install_path: str):
 
 # --- Standalone Execution Guard ---
 if __name__ == "__main__":
+    if "--zip-app" in sys.argv[1:]:
+        sys.argv.remove("--zip-app")
+        os.environ[APP_ZIP_ENV_VAR] = "1"
     if len(sys.argv) != 2 or not sys.argv[1]:
-        logging.error("Usage: python installer_core.py <target_install_path>")
-        print_failure("Usage: python installer_core.py <target_install_path>")
+        logging.error("Usage: python installer_core.py [--zip-app] <target_install_path>")
+        print_failure("Usage: python installer_core.py [--zip-app] <target_install_path>")
 
     target_install_path_arg = sys.argv[1]
     try:
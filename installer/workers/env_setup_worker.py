@@ -68,7 +68,8 @@ class EnvironmentSetupWorker(QObject):
                 unpack_python, find_python_executable, enable_site_packages,
                 bootstrap_pip, run_pip_install, copy_app_code, 
                 copy_bundled_executables, copy_icon_file, install_required_packages,
-                is_existing_installation_valid  # Added for validation
+                is_existing_installation_valid,  # Added for validation
+                compile_app_bytecode, app_zip_requested
             )
             from pathlib import Path
 
@@ -188,6 +189,12 @@ class EnvironmentSetupWorker(QObject):
             copy_app_code(self._install_path) # Use the function from installer_core
             self.log_update.emit("Application code copied.")
 
+            # 4.1.1 Precompile it (and the packages just installed) so the first launch skips compilation
+            self.status_update.emit("Compiling application bytecode...")
+            compile_app_bytecode(python_exe, self._install_path, include_dependencies=True,
+                                 zip_app=app_zip_requested())
+            self.log_update.emit("Application bytecode compiled.")
+
             # 4.2 Copy bundled executables (anpe.exe, uninstall.exe)
             self.status_update.emit("Copying executables...")
             copy_bundled_executables(self._install_path) # Use the function from installer_core
@@ -22,6 +22,15 @@ PBS_ARCHIVE_X86_64 = _PBS_ARCHIVE_TEMPLATE.format(arch="x86_64")
 
 GET_PIP_URL = "https://bootstrap.pypa.io/get-pip.py"
 # SETUP_FLAG_FILE = ".setup_complete" # Handled by main_macos.py
+# Bytecode compiled at setup time. The app bundle is signed and read-only, so its
+# modules could never cache bytecode next to the source; everything is compiled
+# into this tree instead, which main_macos.py passes as PYTHONPYCACHEPREFIX.
+PYCACHE_DIR_NAME = "pycache"
+APP_CODE_DIR_NAME = "anpe_studio"
+APP_BYTECODE_OPTIMIZATION_LEVELS = (0, 1, 2) # App code: plain, -O and -OO
+# Optional zip of the app code for zipimport (main_macos.py passes it as ANPE_STUDIO_APP_ZIP)
+APP_ZIP_NAME = "anpe_studio.zip"
+APP_ZIP_ENV_VAR = "ANPE_INSTALLER_APP_ZIP" # Set to 1 to build the zip
 
 # --- Logging Setup ---
 # Assume logger is configured by the main application/caller (e.g., setup_macos.py)
@@ -418,6 +427,113 @@ def bootstrap_pip_macos(python_exe_path: str):
         error_message = f"An unexpected error occurred during pip bootstrap process: {e}"
         print_failure(error_message)
 
+def find_app_code_dir_macos() -> Optional[Path]:
+    """The anpe_studio directory the app runs: inside the bundle's pythonX.Y lib directory, or the source tree."""
+    if getattr(sys, 'frozen', False):
+        resources_lib_dir = Path(sys.executable).parent.parent / "Resources" / "lib"
+        if resources_lib_dir.is_dir():
+            for item in resources_lib_dir.iterdir():
+                if item.is_dir() and item.name.startswith("python") and (item / APP_CODE_DIR_NAME).is_dir():
+                    return item / APP_CODE_DIR_NAME
+        return None
+    app_code_dir = Path(__file__).resolve().parent.parent / APP_CODE_DIR_NAME
+    return app_code_dir if app_code_dir.is_dir() else None
+
+def app_zip_requested_macos() -> bool:
+    """Whether the app code should also be packaged as a zip (APP_ZIP_ENV_VAR)."""
+    return os.environ.get(APP_ZIP_ENV_VAR, "") not in ("", "0")
+
+def _standalone_library_dir_macos(python_exe: str) -> Optional[Path]:
+    """The standalone Python's lib/pythonX.Y directory (the executable is plain 'python3', so it is looked up)."""
+    lib_dir = Path(python_exe).parent.parent / "lib"
+    for candidate in sorted(lib_dir.glob("python3.*")):
+        if (candidate / "os.py").is_file():
+            return candidate
+    return None
+
+def _run_compileall_macos(python_exe: str, paths: list, pycache_prefix: Optional[Path],
+                          optimization_levels=(0,), legacy_layout: bool = False) -> bool:
+    """
+    Compile the .py files under paths with the standalone interpreter, into
+    pycache_prefix if given. Returns False if compileall reported errors (some
+    packages ship files that do not compile), which callers only log.
+    """
+    env = os.environ.copy()
+    env.pop("PYTHONHOME", None)
+    env.pop("PYTHONPYCACHEPREFIX", None)
+    library_dir = _standalone_library_dir_macos(python_exe)
+    if library_dir is not None:
+        env["PYTHONPATH"] = str(library_dir) # As for the pip commands and the app itself
+    if pycache_prefix is not None:
+        env["PYTHONPYCACHEPREFIX"] = str(pycache_prefix)
+    command = [python_exe, "-m", "compileall", "-q", "-j", "0"]
+    for level in optimization_levels:
+        command += ["-o", str(level)]
+    if legacy_layout:
+        command.append("-b") # module.pyc next to module.py, the layout zipimport reads
+    command += [str(path) for path in paths]
+    logger.info(f"Executing compileall command: {' '.join(command)}")
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8', errors='replace', env=env)
+    except OSError as e:
+        logger.warning(f"Could not run compileall: {e}")
+        return False
+    if result.returncode != 0:
+        logger.warning(f"compileall reported errors (exit code {result.returncode}):\n{result.stdout[-4000:]}\n{result.stderr[-4000:]}")
+        return False
+    return True
+
+def _build_app_zip_macos(python_exe: str, app_code_dir: Path, zip_path: Path):
+    """Package the app code's modules (.py with their .pyc) as a zip for zipimport; resources stay in the bundle."""
+    import zipfile
+    with tempfile.TemporaryDirectory() as staging_dir:
+        staged_app = Path(staging_dir) / APP_CODE_DIR_NAME
+        shutil.copytree(app_code_dir, staged_app,
+                        ignore=lambda dir, files: [f for f in files if f == '__pycache__' or f == 'resources'])
+        _run_compileall_macos(python_exe, [staged_app], None, legacy_layout=True)
+        temp_zip_path = zip_path.with_name(zip_path.name + ".tmp")
+        # Stored, not deflated: zipimport then reads the bytecode without decompressing it
+        with zipfile.ZipFile(temp_zip_path, "w", zipfile.ZIP_STORED) as archive:
+            for file_path in sorted(staged_app.rglob("*")):
+                if file_path.suffix in (".py", ".pyc"):
+                    archive.write(file_path, file_path.relative_to(staging_dir).as_posix())
+        os.replace(temp_zip_path, zip_path)
+
+def compile_bytecode_macos(python_exe: str, install_path: str, app_code_dir: Optional[Path], zip_app: bool = False):
+    """
+    Precompile the standalone Python's library (standard library and installed
+    packages) and the app code into the install's pycache tree, and build or
+    remove the optional app zip. Failures are logged: the app still runs, and
+    Python fills the pycache tree on first use instead.
+    """
+    print_step("Compiling bytecode...")
+    pycache_prefix = Path(install_path) / PYCACHE_DIR_NAME
+    pycache_prefix.mkdir(parents=True, exist_ok=True)
+    library_dir = _standalone_library_dir_macos(python_exe)
+    if library_dir is not None and not _run_compileall_macos(python_exe, [library_dir], pycache_prefix):
+        logger.warning("Some library modules could not be precompiled (usually harmless).")
+    if app_code_dir is None:
+        logger.warning("Application code directory not found; it will be compiled on first launch.")
+    elif not _run_compileall_macos(python_exe, [app_code_dir], pycache_prefix, APP_BYTECODE_OPTIMIZATION_LEVELS):
+        logger.warning("Some application modules could not be precompiled; they will be compiled on first use.")
+
+    zip_path = Path(install_path) / APP_ZIP_NAME
+    try:
+        if zip_app and app_code_dir is not None:
+            print_step("Packaging application code for zipimport...")
+            _build_app_zip_macos(python_exe, app_code_dir, zip_path)
+            logger.info(f"Built {zip_path}")
+        elif zip_path.exists():
+            zip_path.unlink() # A zip from an earlier setup would shadow the app's code
+            logger.info(f"Removed outdated {zip_path}")
+    except Exception as e:
+        logger.warning(f"Could not update the application zip, running from the app bundle: {e}", exc_info=True)
+        try:
+            zip_path.unlink()
+        except OSError:
+            pass
+    print_step("Bytecode compiled.")
+
 # --- Main Function (Example/Testing Only) ---
 def main_macos(install_path: str):
     """
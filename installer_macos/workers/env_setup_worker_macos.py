@@ -16,7 +16,10 @@ from installer_macos.installer_core_macos import (
     unpack_standalone_python_macos, # New unpack function
     find_standalone_python_executable_macos, # New helper
     bootstrap_pip_macos,
-    _get_bundled_resource_path_macos # Import the correct resource finder
+    _get_bundled_resource_path_macos, # Import the correct resource finder
+    compile_bytecode_macos,
+    find_app_code_dir_macos,
+    app_zip_requested_macos
 )
 
 # Get logger instance
@@ -242,8 +245,15 @@ class EnvironmentSetupWorkerMacOS(QObject):
             if not reqs_success:
                  raise RuntimeError(f"Failed to install requirements from {reqs_filename}. Error: {reqs_stderr}")
 
-            # If we reach here, all install steps succeeded
             self.log_update.emit("Installed dependencies successfully.")
+
+            # 3.4 Precompile the library and the app code, so the first launch skips compilation
+            self.status_update.emit("Compiling bytecode...")
+            compile_bytecode_macos(python_exe, self._install_path, find_app_code_dir_macos(),
+                                   zip_app=app_zip_requested_macos())
+            self.log_update.emit("Bytecode compiled.")
+
+            # If we reach here, all install steps succeeded
             self.task_status_update.emit(self._current_task, TaskStatus.COMPLETED, f"Installed {self._tasks[self._current_task]}")
             self._completed_tasks.add(self._current_task)
             self.status_update.emit("Environment setup complete.")
@@ -2,6 +2,7 @@ import sys
 import os
 import subprocess
 import time
+import tempfile
 import logging
 import ctypes
 from pathlib import Path
@@ -12,7 +13,14 @@ APP_RUN_SCRIPT = "anpe_studio/run.py" # Relative to install root
 PYTHON_DIR_NAME = "python" # Directory containing pythonw.exe
 PYTHON_EXECUTABLE = "pythonw.exe" # Windowed executable
 LAUNCHER_LOG_FILE = "launcher_debug.log"
-STARTUP_TIMEOUT_SECONDS = 7 # How long to wait for initial stability
+STARTUP_TIMES_FILE = "launcher_startup_times.log" # One line per launch, kept for startup monitoring
+STARTUP_TIMES_MAX_LINES = 500
+READY_TIMEOUT_SECONDS = 300 # Give up waiting (the app keeps running); a first model check can take minutes
+POLL_INTERVAL_SECONDS = 0.05
+
+# Startup handshake, as in anpe_studio/startup_handshake.py (the launcher is built without the app's code)
+READY_FILE_ENV_VAR = "ANPE_STUDIO_READY_FILE"
+STARTUP_STAGES = ("splash_shown", "main_window_ready") # In order; the last one means ready
 
 def get_install_dir() -> Path | None:
     """Determine the installation directory.
@@ -43,6 +51,56 @@ def show_error_message(title: str, message: str):
     """Display a Windows message box."""
     ctypes.windll.user32.MessageBoxW(0, message, title, 0x10 | 0x0) # MB_ICONERROR | MB_OK
 
+def read_startup_stages(ready_file: Path) -> dict:
+    """Stage name -> time.time() at which the app reached it, as written to the ready file so far."""
+    stages = {}
+    try:
+        content = ready_file.read_text(encoding="utf-8")
+    except OSError:
+        return stages
+    for line in content.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[0] in STARTUP_STAGES:
+            try:
+                stages[parts[0]] = float(parts[1])
+            except ValueError:
+                pass # A line being written; read again on the next poll
+    return stages
+
+def wait_for_ready(process: subprocess.Popen, ready_file: Path, launch_time: float) -> tuple[str, dict]:
+    """
+    Wait until the app reports its last startup stage ("ready"), exits
+    ("exited") or READY_TIMEOUT_SECONDS pass ("timeout"). Returns the
+    result and the stages reported.
+    """
+    stages = {}
+    while time.time() - launch_time < READY_TIMEOUT_SECONDS:
+        try:
+            process.wait(timeout=POLL_INTERVAL_SECONDS)
+        except subprocess.TimeoutExpired:
+            pass
+        for stage, stage_time in read_startup_stages(ready_file).items():
+            if stage not in stages:
+                logging.info(f"Application reported '{stage}'.")
+                stages[stage] = stage_time
+        if STARTUP_STAGES[-1] in stages:
+            return "ready", stages
+        if process.returncode is not None:
+            return "exited", stages
+    return "timeout", stages
+
+def record_startup_times(install_dir: Path, result: str, stage_ms: dict):
+    """Append this launch's time to each stage (ms since the process was spawned) to the startup times file."""
+    times_path = install_dir / STARTUP_TIMES_FILE
+    stage_fields = " ".join(f"{stage}_ms={stage_ms[stage] if stage in stage_ms else '-'}" for stage in STARTUP_STAGES)
+    line = f"{time.strftime('%Y-%m-%dT%H:%M:%S')} result={result} {stage_fields}\n"
+    try:
+        lines = times_path.read_text(encoding="utf-8").splitlines(keepends=True) if times_path.exists() else []
+        lines = lines[-(STARTUP_TIMES_MAX_LINES - 1):] + [line]
+        times_path.write_text("".join(lines), encoding="utf-8")
+    except OSError as e:
+        logging.warning(f"Could not record startup times in {times_path}: {e}")
+
 def main():
     install_dir = get_install_dir()
     if not install_dir:
@@ -73,46 +131,64 @@ def main():
 
     # --- Launch the application ---
     process = None
+    ready_file = None
     try:
-        command = [str(python_exe_path), str(app_script_path)]
+        command = [str(python_exe_path), str(app_script_path)] + sys.argv[1:] # Files to open (e.g. from file associations)
         logging.info(f"Launching command: {' '.join(command)}")
+        # The app reports its startup stages in this file (see anpe_studio/startup_handshake.py)
+        ready_fd, ready_name = tempfile.mkstemp(prefix="anpe_studio_ready_", suffix=".txt")
+        os.close(ready_fd)
+        ready_file = Path(ready_name)
+        env = os.environ.copy()
+        env[READY_FILE_ENV_VAR] = str(ready_file)
+        # Capture stderr in a temporary file (not a pipe nobody reads once the launcher exits) to show early crashes;
+        # Windows deletes it when the app closes its handle
+        stderr_file = tempfile.TemporaryFile()
+        launch_time = time.time()
         # Use CREATE_NO_WINDOW flag to prevent console flash with pythonw.exe
-        # Capture stderr to check for early crashes
         process = subprocess.Popen(
             command,
             cwd=install_dir, # Run the script from the install directory
-            stderr=subprocess.PIPE,
-            stdout=subprocess.PIPE, # Capture stdout too, just in case
-            text=True,
-            encoding='utf-8',
-            errors='replace',
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL, # The app's progress prints are not needed here
+            stderr=stderr_file,
             creationflags=subprocess.CREATE_NO_WINDOW 
         )
-        logging.info(f"Application process started (PID: {process.pid}). Monitoring for {STARTUP_TIMEOUT_SECONDS} seconds...")
+        logging.info(f"Application process started (PID: {process.pid}). Waiting for it to report ready...")
+
+        # --- Wait for the app's startup stages, or an early exit ---
+        result, stages = wait_for_ready(process, ready_file, launch_time)
+        stage_ms = {stage: round((stages[stage] - launch_time) * 1000) for stage in STARTUP_STAGES if stage in stages}
+        for stage, ms in stage_ms.items():
+            logging.info(f"Startup stage '{stage}' reached after {ms} ms.")
 
-        # --- Monitor for quick failure ---
-        start_time = time.time()
-        while time.time() - start_time < STARTUP_TIMEOUT_SECONDS:
-            return_code = process.poll()
-            if return_code is not None:
+        if result == "exited":
+            return_code = process.returncode
+            if return_code == 0:
+                # A running instance took over this launch (single-instance mode)
+                logging.info("Application handed the launch to a running instance.")
+                result = "handed_off"
+            else:
                 # Process terminated early
-                stderr_output = process.stderr.read()
-                stdout_output = process.stdout.read() # Read stdout as well
+                stderr_file.seek(0)
+                stderr_output = stderr_file.read().decode("utf-8", errors="replace")
                 error_details = f"The application terminated unexpectedly shortly after launch (exit code: {return_code}).\n\n"
                 if stderr_output:
-                    error_details += f"Error Output:\n{stderr_output[:1000]}" # Limit length
-                if stdout_output:
-                     error_details += f"\nStandard Output:\n{stdout_output[:1000]}" # Limit length
-                
+                    error_details += f"Error Output:\n{stderr_output[-1000:]}" # Limit length; the traceback is at the end
                 logging.error(f"Application process terminated early. Exit code: {return_code}")
                 logging.error(f"Stderr: {stderr_output}")
-                logging.error(f"Stdout: {stdout_output}") # Log stdout too
+                record_startup_times(install_dir, f"exit_code_{return_code}", stage_ms)
                 show_error_message(f"{APP_NAME} Startup Error", error_details)
                 sys.exit(return_code) # Exit launcher with the same code
-            time.sleep(0.5) # Check every half second
-
-        # --- Application seems stable, assume successful launch ---
-        logging.info(f"Application running for {STARTUP_TIMEOUT_SECONDS} seconds. Assuming successful startup.")
+        elif result == "timeout":
+            # Still running (e.g. a very slow first model check): leave it be, but keep the launcher log
+            logging.warning(f"Application did not report ready within {READY_TIMEOUT_SECONDS} seconds; "
+                            f"stages reached: {', '.join(stage_ms) or 'none'}.")
+            record_startup_times(install_dir, result, stage_ms)
+            sys.exit(0)
+        stderr_file.close() # The app has its own handle
+        record_startup_times(install_dir, result, stage_ms)
         
         # Close log file handle before attempting deletion
         logging.shutdown() 
@@ -139,6 +215,11 @@ def main():
         show_error_message(f"{APP_NAME} Launch Error", error_msg)
         sys.exit(1)
     finally:
+        if ready_file is not None:
+            try:
+                ready_file.unlink() # The app opens it only while writing a stage
+            except OSError:
+                pass
         # Ensure resources are cleaned up if something went very wrong
         if process and process.poll() is None:
              # If we exit due to an exception but the process is still running? Unlikely but possible.
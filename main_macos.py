@@ -69,6 +69,8 @@ APP_NAME = "ANPE Studio"
 # Standard macOS Application Support path
 MACOS_APP_SUPPORT_DIR = Path.home() / "Library" / "Application Support" / APP_NAME
 SETUP_FLAG_FILENAME = ".setup_complete"
+PYCACHE_DIR_NAME = "pycache" # Bytecode compiled by setup (see installer_core_macos.compile_bytecode_macos)
+APP_ZIP_NAME = "anpe_studio.zip" # Optional app code zip built by setup
 
 # --- Logging Setup ---
 try:
@@ -267,6 +269,18 @@ if __name__ == "__main__":
          logger.error(f"Could not find standalone Python lib directory at {standalone_python_lib_dir} for execve. Unsetting PYTHONPATH.")
          target_env.pop("PYTHONPATH", None)
 
+    # Bytecode precompiled at setup: the bundle itself cannot hold __pycache__ directories
+    pycache_dir = base_install_path / PYCACHE_DIR_NAME
+    if pycache_dir.is_dir():
+        logger.info(f"Setting PYTHONPYCACHEPREFIX for target process to: {pycache_dir}")
+        target_env["PYTHONPYCACHEPREFIX"] = str(pycache_dir)
+    app_zip = base_install_path / APP_ZIP_NAME
+    if app_zip.is_file():
+        logger.info(f"Application code zip found: {app_zip}")
+        target_env["ANPE_STUDIO_APP_ZIP"] = str(app_zip) # run.py checks it is not older than the bundle's code
+    else:
+        target_env.pop("ANPE_STUDIO_APP_ZIP", None)
+
     logger.info(f"Executing main application via os.execve: {target_python_exe} {main_app_script}")
     try:
         # Prepare arguments for execve: executable path, list of args (starting with executable name), environment